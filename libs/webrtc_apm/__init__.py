@@ -9,7 +9,9 @@ import sys
 import os
 from pathlib import Path
 from enum import IntEnum
-from typing import Optional
+from typing import Optional, Union
+
+import numpy as np
 
 # 平台特定的库加载
 def _get_library_path() -> str:
@@ -252,6 +254,27 @@ _lib.WebRTC_APM_ProcessStream.restype = ctypes.c_int
 _lib.WebRTC_APM_SetStreamDelayMs.argtypes = [ctypes.c_void_p, ctypes.c_int]
 _lib.WebRTC_APM_SetStreamDelayMs.restype = None
 
+_ShortPointer = ctypes.POINTER(ctypes.c_short)
+# 音频缓冲区：ctypes数组、c_short指针或 int16 C连续的 NumPy 数组
+AudioBuffer = Union[ctypes.Array, "ctypes._Pointer", np.ndarray]
+
+
+def as_short_pointer(buffer: np.ndarray):
+    """获取 int16 NumPy 数组的 c_short 指针（零拷贝）。
+
+    对于复用的预分配缓冲区，应只调用一次并缓存返回的指针，
+    调用方需保证数组在指针使用期间存活。
+    """
+    if buffer.dtype != np.int16 or not buffer.flags.c_contiguous:
+        raise ValueError("buffer must be a C-contiguous int16 array")
+    return buffer.ctypes.data_as(_ShortPointer)
+
+
+def _to_pointer(buffer: AudioBuffer):
+    if isinstance(buffer, np.ndarray):
+        return as_short_pointer(buffer)
+    return buffer
+
 class WebRTCAudioProcessing:
     """WebRTC 音频处理的高级 Python 封装器。"""
     
@@ -296,12 +319,12 @@ class WebRTCAudioProcessing:
         """
         return _lib.WebRTC_APM_ApplyConfig(self._handle, ctypes.byref(config))
     
-    def process_reverse_stream(self, src: ctypes.Array, src_config: int, 
-                             dest_config: int, dest: ctypes.Array) -> int:
+    def process_reverse_stream(self, src: AudioBuffer, src_config: int, 
+                             dest_config: int, dest: AudioBuffer) -> int:
         """处理反向流（渲染/播放音频）。
         
         Args:
-            src: 源音频缓冲区
+            src: 源音频缓冲区（ctypes数组、指针或 int16 NumPy 数组，不拷贝）
             src_config: 源流配置句柄
             dest_config: 目标流配置句柄
             dest: 目标音频缓冲区
@@ -310,15 +333,15 @@ class WebRTCAudioProcessing:
             状态码（0表示成功）
         """
         return _lib.WebRTC_APM_ProcessReverseStream(
-            self._handle, src, src_config, dest_config, dest
+            self._handle, _to_pointer(src), src_config, dest_config, _to_pointer(dest)
         )
     
-    def process_stream(self, src: ctypes.Array, src_config: int,
-                      dest_config: int, dest: ctypes.Array) -> int:
+    def process_stream(self, src: AudioBuffer, src_config: int,
+                      dest_config: int, dest: AudioBuffer) -> int:
         """处理采集流（麦克风音频）。
         
         Args:
-            src: 源音频缓冲区
+            src: 源音频缓冲区（ctypes数组、指针或 int16 NumPy 数组，不拷贝）
             src_config: 源流配置句柄
             dest_config: 目标流配置句柄
             dest: 目标音频缓冲区
@@ -327,7 +350,7 @@ class WebRTCAudioProcessing:
             状态码（0表示成功）
         """
         return _lib.WebRTC_APM_ProcessStream(
-            self._handle, src, src_config, dest_config, dest
+            self._handle, _to_pointer(src), src_config, dest_config, _to_pointer(dest)
         )
     
     def set_stream_delay_ms(self, delay_ms: int) -> None:
@@ -419,6 +442,7 @@ def create_default_config() -> Config:
 __all__ = [
     'WebRTCAudioProcessing',
     'Config',
+    'as_short_pointer',
     'create_default_config',
     'DownmixMethod',
     'NoiseSuppressionLevel', 
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+软件回声消除离线评估.
+
+不依赖声卡，用播放参考文件和麦克风文件（或合成回声）驱动 ReferenceAEC，
+输出处理后的音频、回声延迟估计结果和回声抑制量(ERLE)。
+
+用法:
+    # 合成回声：远端信号延迟 120ms、衰减后叠加近端语音
+    python scripts/aec_offline_eval.py --synthetic --delay-ms 120 --save-dir /tmp/aec
+
+    # 真实录音：far.wav 为播放的音频（任意采样率），mic.wav 为同时录制的16kHz麦克风音频
+    python scripts/aec_offline_eval.py --far far.wav --mic mic.wav --out out.wav
+"""
+
+import argparse
+import sys
+import wave
+from pathlib import Path
+
+import numpy as np
+
+# 添加项目根目录到Python路径 - 必须在导入src模块之前
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+SAMPLE_RATE = 16000
+FRAME_SIZE = 160
+
+
+def read_wav(path):
+    with wave.open(str(path), "rb") as wf:
+        if wf.getsampwidth() != 2:
+            raise ValueError(f"{path}: 仅支持16位PCM")
+        data = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+        channels = wf.getnchannels()
+        if channels > 1:
+            data = data.reshape(-1, channels)[:, 0].copy()
+        return data, wf.getframerate()
+
+
+def write_wav(path, data, sample_rate):
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sample_rate)
+        wf.writeframes(data.astype(np.int16).tobytes())
+
+
+def synthesize(duration, delay_ms, echo_gain, render_rate, seed=0):
+    """
+    合成远端/麦克风信号：前半段只有回声，后半段叠加近端信号（双讲）.
+    """
+    rng = np.random.default_rng(seed)
+    n = int(duration * SAMPLE_RATE)
+    t = np.arange(n) / SAMPLE_RATE
+
+    # 类语音的远端信号：带包络的噪声 + 谐波
+    envelope = (np.sin(2 * np.pi * 2.5 * t) > -0.2).astype(np.float64)
+    far = rng.standard_normal(n) * 2500 + 2000 * np.sin(2 * np.pi * 220 * t)
+    far *= envelope
+
+    delay = int(delay_ms * SAMPLE_RATE / 1000)
+    echo = np.zeros(n)
+    echo[delay:] = far[: n - delay] * echo_gain
+    # 简单的房间混响
+    echo[delay + 80 :] += far[: n - delay - 80] * echo_gain * 0.3
+
+    near = np.zeros(n)
+    half = n // 2
+    near[half:] = 3000 * np.sin(2 * np.pi * 330 * t[half:]) * envelope[half:]
+
+    mic = np.clip(echo + near + rng.standard_normal(n) * 50, -32768, 32767)
+    far = np.clip(far, -32768, 32767)
+
+    if render_rate != SAMPLE_RATE:
+        import soxr
+
+        far_render = soxr.resample(far.astype(np.int16), SAMPLE_RATE, render_rate)
+    else:
+        far_render = far.astype(np.int16)
+    return far_render.astype(np.int16), mic.astype(np.int16), half
+
+
+def create_apm():
+    from libs.webrtc_apm import WebRTCAudioProcessing, create_default_config
+
+    apm = WebRTCAudioProcessing()
+    config = create_default_config()
+    config.echo.enabled = True
+    config.echo.mobile_mode = False
+    config.echo.enforce_high_pass_filtering = True
+    config.noise_suppress.enabled = True
+    config.noise_suppress.noise_level = 2
+    config.high_pass.enabled = True
+    config.high_pass.apply_in_full_band = True
+    result = apm.apply_config(config)
+    if result != 0:
+        raise RuntimeError(f"WebRTC APM配置失败，错误码: {result}")
+    capture_config = apm.create_stream_config(SAMPLE_RATE, 1)
+    render_config = apm.create_stream_config(SAMPLE_RATE, 1)
+    return apm, capture_config, render_config
+
+
+def erle_db(mic, out):
+    mic_power = np.mean(mic.astype(np.float64) ** 2) + 1e-9
+    out_power = np.mean(out.astype(np.float64) ** 2) + 1e-9
+    return 10 * np.log10(mic_power / out_power)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="软件回声消除离线评估")
+    parser.add_argument("--far", help="播放参考音频(16位wav)")
+    parser.add_argument("--mic", help="麦克风录音(16位wav, 16kHz)")
+    parser.add_argument("--out", help="处理结果输出路径")
+    parser.add_argument("--synthetic", action="store_true", help="使用合成回声")
+    parser.add_argument("--duration", type=float, default=10.0, help="合成时长(秒)")
+    parser.add_argument("--delay-ms", type=float, default=120.0, help="合成回声延迟")
+    parser.add_argument("--echo-gain", type=float, default=0.5, help="合成回声增益")
+    parser.add_argument(
+        "--render-rate", type=int, default=24000, help="合成参考信号采样率"
+    )
+    parser.add_argument(
+        "--initial-delay-ms", type=int, default=50, help="初始stream delay"
+    )
+    parser.add_argument("--save-dir", help="保存合成的远端/麦克风/输出音频")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        far, mic, echo_only = synthesize(
+            args.duration, args.delay_ms, args.echo_gain, args.render_rate
+        )
+        render_rate = args.render_rate
+    elif args.far and args.mic:
+        far, render_rate = read_wav(args.far)
+        mic, mic_rate = read_wav(args.mic)
+        if mic_rate != SAMPLE_RATE:
+            parser.error(f"麦克风音频必须为16kHz，当前: {mic_rate}")
+        echo_only = len(mic)
+    else:
+        parser.error("需要 --synthetic 或同时指定 --far 与 --mic")
+
+    try:
+        apm, capture_config, render_config = create_apm()
+    except OSError as e:
+        print(f"无法加载WebRTC APM库: {e}")
+        return 1
+
+    from src.audio_codecs.reference_aec import ReferenceAEC
+
+    aec = ReferenceAEC(
+        apm,
+        capture_config,
+        render_config,
+        render_sample_rate=render_rate,
+        sample_rate=SAMPLE_RATE,
+        frame_size=FRAME_SIZE,
+        initial_delay_ms=args.initial_delay_ms,
+    )
+
+    # 按实时节奏交替送入：每10ms先送播放PCM，再处理一帧录音
+    render_chunk = render_rate // 100
+    frames = len(mic) // FRAME_SIZE
+    output = np.zeros(frames * FRAME_SIZE, dtype=np.int16)
+    for i in range(frames):
+        aec.push_render(far[i * render_chunk : (i + 1) * render_chunk])
+        start = i * FRAME_SIZE
+        output[start : start + FRAME_SIZE] = aec.process_frame(
+            mic[start : start + FRAME_SIZE]
+        )
+
+    # 跳过前2秒的收敛期再统计
+    settle = min(2 * SAMPLE_RATE, echo_only // 2)
+    echo_end = min(echo_only, len(output))
+    print(f"帧数: {frames}, 参考采样率: {render_rate}Hz")
+    if args.synthetic:
+        print(f"真实回声延迟: {args.delay_ms:.0f}ms")
+    stats = aec.get_stats()
+    print(
+        f"估计stream delay: {stats['stream_delay_ms']}ms "
+        f"(置信度 {stats['delay_confidence']})"
+    )
+    print(f"回声段ERLE: {erle_db(mic[settle:echo_end], output[settle:echo_end]):.1f} dB")
+    print(f"平均处理耗时: {stats['avg_process_us']} µs/帧")
+
+    if args.out:
+        write_wav(args.out, output, SAMPLE_RATE)
+    if args.save_dir:
+        save_dir = Path(args.save_dir)
+        save_dir.mkdir(parents=True, exist_ok=True)
+        write_wav(save_dir / "far.wav", far, render_rate)
+        write_wav(save_dir / "mic.wav", mic, SAMPLE_RATE)
+        write_wav(save_dir / "out.wav", output, SAMPLE_RATE)
+        print(f"音频已保存到: {save_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+音频缓冲区微基准测试.
+
+对比音频回调中两种重采样缓冲实现的单帧开销:
+1. deque: 逐采样 extend/popleft 后重新组装帧（旧实现）
+2. AudioRingBuffer: 预分配NumPy环形缓冲区，切片批量读写
+
+用法:
+    python scripts/audio_buffer_benchmark.py [--frames 20000] [--frame-ms 20]
+"""
+
+import argparse
+import sys
+import time
+from collections import deque
+from pathlib import Path
+
+import numpy as np
+
+# 添加项目根目录到Python路径 - 必须在导入src模块之前
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.audio_codecs.ring_buffer import AudioRingBuffer  # noqa: E402
+
+
+def bench_deque(chunks, frame_size):
+    buffer = deque()
+    start = time.perf_counter()
+    for chunk in chunks:
+        buffer.extend(chunk.astype(np.int16))
+        if len(buffer) >= frame_size:
+            frame_data = []
+            for _ in range(frame_size):
+                frame_data.append(buffer.popleft())
+            np.array(frame_data, dtype=np.int16)
+    return time.perf_counter() - start
+
+
+def bench_ring(chunks, frame_size):
+    buffer = AudioRingBuffer(frame_size * 16)
+    out = np.empty(frame_size, dtype=np.int16)
+    start = time.perf_counter()
+    for chunk in chunks:
+        buffer.write(chunk)
+        buffer.read_into(out)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="音频缓冲区微基准测试")
+    parser.add_argument("--frames", type=int, default=20000, help="回调次数")
+    parser.add_argument("--frame-ms", type=int, default=20, help="帧长(毫秒)")
+    parser.add_argument("--rate", type=int, default=16000, help="采样率")
+    args = parser.parse_args()
+
+    frame_size = args.rate * args.frame_ms // 1000
+    rng = np.random.default_rng(0)
+    # 模拟重采样器输出的抖动：每次回调产生的采样数在帧长附近波动
+    sizes = rng.integers(frame_size - 8, frame_size + 9, size=args.frames)
+    chunks = [
+        rng.integers(-32768, 32767, size=int(n), dtype=np.int16) for n in sizes
+    ]
+
+    print(f"帧长: {args.frame_ms}ms ({frame_size} 采样), 回调次数: {args.frames}")
+    results = {
+        "deque": bench_deque(chunks, frame_size),
+        "AudioRingBuffer": bench_ring(chunks, frame_size),
+    }
+    baseline = results["deque"]
+    for name, elapsed in results.items():
+        per_frame_us = elapsed / args.frames * 1e6
+        print(
+            f"{name:>16}: {per_frame_us:8.2f} us/帧  "
+            f"(加速 {baseline / elapsed:5.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
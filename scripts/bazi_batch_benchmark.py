@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+八字批量分析基准测试.
+
+对比三种方式处理同一批时间的耗时，并核对批量结果与逐个计算一致：
+- single: 逐个调用单项工具的计算（build_bazi / get_chinese_calendar），输入顺序
+- batch:  批量接口在当前进程内计算（workers=1）
+- pool:   批量接口使用进程池（含进程启动开销，条目数不足 PROCESS_POOL_MIN_ITEMS 时
+          仍在当前进程内计算）
+
+用法:
+    python scripts/bazi_batch_benchmark.py [--mode bazi] [--items 600] [--workers 2]
+"""
+
+import argparse
+import random
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+# 添加项目根目录到Python路径 - 必须在导入src模块之前
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.mcp.tools.bazi.batch_tools import run_batch  # noqa: E402
+from src.mcp.tools.bazi.bazi_calculator import get_bazi_calculator  # noqa: E402
+from src.mcp.tools.bazi.engine import get_bazi_engine  # noqa: E402
+from src.mcp.tools.bazi.lunar_cache import get_lunar_cache  # noqa: E402
+
+
+def make_inputs(mode: str, items: int, seed: int):
+    if mode == "calendar":
+        # 择日：从某天起连续若干天
+        start = date(2025, 1, 1)
+        return [f"{start + timedelta(days=i)} 12:00:00" for i in range(items)]
+    # 多人对比：出生时间分散在不同年份
+    rng = random.Random(seed)
+    return [
+        f"{rng.randint(1930, 2020)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} "
+        f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:00"
+        for _ in range(items)
+    ]
+
+
+def run_single(mode: str, inputs):
+    calculator = get_bazi_calculator()
+    engine = get_bazi_engine()
+    for solar_datetime in inputs:
+        if mode == "calendar":
+            engine.get_chinese_calendar(engine.parse_solar_time(solar_datetime))
+        else:
+            calculator.build_bazi(solar_datetime=solar_datetime, gender=1)
+
+
+def timed(func):
+    # 每种方式都从空缓存开始
+    get_lunar_cache().clear()
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="八字批量分析基准测试")
+    parser.add_argument("--mode", choices=["bazi", "calendar"], default="bazi")
+    parser.add_argument("--items", type=int, default=600, help="条目数")
+    parser.add_argument("--workers", type=int, default=2, help="进程池进程数")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    args = parser.parse_args()
+
+    inputs = make_inputs(args.mode, args.items, args.seed)
+
+    # 预热导入和数据表
+    run_single(args.mode, inputs[:3])
+
+    _, single = timed(lambda: run_single(args.mode, inputs))
+    batch, in_process = timed(lambda: run_batch(args.mode, inputs, 1, 1))
+    pooled, pool = timed(lambda: run_batch(args.mode, inputs, 1, args.workers))
+
+    for name, elapsed in (("single", single), ("batch", in_process), ("pool", pool)):
+        print(
+            f"{name:<7} {elapsed * 1000:9.1f} ms  "
+            f"{elapsed / len(inputs) * 1000:6.3f} ms/项  加速 {single / elapsed:5.2f}x"
+        )
+    print(f"进程池实际进程数: {pooled['workers']}")
+
+    if batch["rows"] != pooled["rows"] or batch["errors"] or pooled["errors"]:
+        print("批量结果不一致")
+        return 1
+    print(f"批量结果一致: {batch['succeeded']} 行")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
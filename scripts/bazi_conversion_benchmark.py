@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+八字转换缓存基准测试.
+
+对比关闭/开启公历农历转换缓存时，一次完整请求（build_bazi + 婚姻分析）的耗时：
+- distinct: 每次请求不同出生时间（首次请求，只省去请求内部的重复转换）
+- repeat:   同一批出生时间重复请求（多轮对话、重复查询）
+- couple:   两人合婚，两个出生年份交替转换
+
+用法:
+    python scripts/bazi_conversion_benchmark.py [--requests 200] [--seed 0]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# 添加项目根目录到Python路径 - 必须在导入src模块之前
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.mcp.tools.bazi.bazi_calculator import get_bazi_calculator  # noqa: E402
+from src.mcp.tools.bazi.lunar_cache import (  # noqa: E402
+    LUNAR_CACHE_SIZE,
+    get_lunar_cache,
+)
+from src.mcp.tools.bazi.marriage_analyzer import get_marriage_analyzer  # noqa: E402
+
+
+def random_datetimes(count: int, seed: int):
+    rng = random.Random(seed)
+    return [
+        f"{rng.randint(1930, 2020)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} "
+        f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:00"
+        for _ in range(count)
+    ]
+
+
+def analyze(calculator, analyzer, solar_datetime: str, gender: int):
+    bazi = calculator.build_bazi(solar_datetime=solar_datetime, gender=gender)
+    analyzer.analyze_marriage_timing(
+        {
+            "year": bazi.year_pillar,
+            "month": bazi.month_pillar,
+            "day": bazi.day_pillar,
+            "hour": bazi.hour_pillar,
+        },
+        gender,
+    )
+
+
+def run_workload(name: str, datetimes, maxsize: int):
+    calculator = get_bazi_calculator()
+    analyzer = get_marriage_analyzer()
+    cache = get_lunar_cache()
+    cache.maxsize = maxsize
+    cache.clear()
+
+    start = time.perf_counter()
+    for i, solar_datetime in enumerate(datetimes):
+        analyze(calculator, analyzer, solar_datetime, i % 2)
+    elapsed = time.perf_counter() - start
+
+    stats = cache.get_stats()
+    per_request = elapsed / len(datetimes) * 1000
+    print(
+        f"{name:<10} 缓存{'开' if maxsize else '关'}: {per_request:6.2f} ms/请求, "
+        f"命中率 {stats['hit_rate']:.1%} (命中 {stats['hits']}, 未命中 {stats['misses']})"
+    )
+    return per_request
+
+
+def main():
+    parser = argparse.ArgumentParser(description="八字转换缓存基准测试")
+    parser.add_argument("--requests", type=int, default=200, help="每组请求数")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    args = parser.parse_args()
+
+    distinct = random_datetimes(args.requests, args.seed)
+    workloads = {
+        "distinct": distinct,
+        "repeat": random_datetimes(20, args.seed) * max(1, args.requests // 20),
+        # 合婚：男女双方交替分析
+        "couple": [
+            dt for pair in zip(distinct[::2], distinct[1::2]) for dt in pair * 2
+        ],
+    }
+
+    # 预热导入和数据表
+    run_workload("warmup", distinct[:5], 0)
+    print()
+
+    for name, datetimes in workloads.items():
+        off = run_workload(name, datetimes, 0)
+        on = run_workload(name, datetimes, LUNAR_CACHE_SIZE)
+        print(f"{'':<10} 加速 {off / on:.2f}x\n")
+
+
+if __name__ == "__main__":
+    main()
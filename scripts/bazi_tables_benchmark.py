@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+八字整数查表基准测试.
+
+1. 用原先基于字典/列表扫描的实现作为参照，穷举核对十神、长生、地支关系、
+   地支组合（12^4种四柱地支）、旬空的查表结果
+2. 对比参照实现与查表实现的耗时
+3. 测量一次完整分析（build_bazi + 婚姻分析）的耗时
+
+用法:
+    python scripts/bazi_tables_benchmark.py [--rounds 5] [--requests 500]
+"""
+
+import argparse
+import itertools
+import sys
+import time
+from pathlib import Path
+
+# 添加项目根目录到Python路径 - 必须在导入src模块之前
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.mcp.tools.bazi import professional_data as pd  # noqa: E402
+from src.mcp.tools.bazi.bazi_calculator import get_bazi_calculator  # noqa: E402
+from src.mcp.tools.bazi.engine import get_bazi_engine  # noqa: E402
+from src.mcp.tools.bazi.marriage_analyzer import get_marriage_analyzer  # noqa: E402
+
+# ==================== 参照实现（查表之前的写法） ====================
+
+
+def ref_ten_gods(day_master, other_stem):
+    return pd.TEN_GODS_MAP.get((day_master, other_stem), "未知")
+
+
+def ref_changsheng(gan, zhi):
+    return pd.CHANGSHENG_TWELVE.get(gan, {}).get(zhi, "未知")
+
+
+def ref_zhi_relation(zhi1, zhi2, relation_type):
+    if zhi1 not in pd.ZHI_RELATIONS:
+        return False
+    relation = pd.ZHI_RELATIONS[zhi1].get(relation_type)
+    if relation is None:
+        return False
+    if isinstance(relation, tuple):
+        return zhi2 in relation
+    return zhi2 == relation
+
+
+def ref_zhi_combinations(zhi_list):
+    result = {key: [] for key in ("sanhe", "liuhe", "sanhui", "chong", "xing", "hai")}
+    for combo, element in pd.ZHI_SAN_HE.items():
+        if all(zhi in zhi_list for zhi in combo):
+            result["sanhe"].append(f"{combo}合{element}")
+    for i, zhi1 in enumerate(zhi_list):
+        for zhi2 in zhi_list[i + 1 :]:
+            combo = "".join(sorted([zhi1, zhi2]))
+            if combo in pd.ZHI_LIU_HE:
+                result["liuhe"].append(f"{zhi1}{zhi2}合{pd.ZHI_LIU_HE[combo]}")
+    for combo, element in pd.ZHI_SAN_HUI.items():
+        if all(zhi in zhi_list for zhi in combo):
+            result["sanhui"].append(f"{combo}会{element}")
+    for i, zhi1 in enumerate(zhi_list):
+        for zhi2 in zhi_list[i + 1 :]:
+            if ref_zhi_relation(zhi1, zhi2, "冲"):
+                result["chong"].append(f"{zhi1}冲{zhi2}")
+            if ref_zhi_relation(zhi1, zhi2, "刑"):
+                result["xing"].append(f"{zhi1}刑{zhi2}")
+            if ref_zhi_relation(zhi1, zhi2, "害"):
+                result["hai"].append(f"{zhi1}害{zhi2}")
+    return result
+
+
+def ref_xun_kong_wang(gan, zhi):
+    jiazi_number = (pd.GAN.index(gan) * 6 + pd.ZHI.index(zhi) * 5) % 60 or 60
+    xun_index = (jiazi_number - 1) // 10
+    xun_starts = ["甲子", "甲戌", "甲申", "甲午", "甲辰", "甲寅"]
+    kong_wang = [
+        ["戌", "亥"],
+        ["申", "酉"],
+        ["午", "未"],
+        ["辰", "巳"],
+        ["寅", "卯"],
+        ["子", "丑"],
+    ]
+    return xun_starts[xun_index], kong_wang[xun_index]
+
+
+# ==================== 核对 ====================
+
+
+def verify() -> int:
+    engine = get_bazi_engine()
+    errors = 0
+    gans = pd.GAN + ["", "X"]
+    zhis = pd.ZHI + ["", "X"]
+
+    for a, b in itertools.product(gans, gans):
+        if ref_ten_gods(a, b) != pd.get_ten_gods_relation(a, b):
+            errors += 1
+            print(f"十神不一致: {a}{b}")
+
+    for gan, zhi in itertools.product(gans, zhis):
+        if ref_changsheng(gan, zhi) != pd.get_changsheng_state(gan, zhi):
+            errors += 1
+            print(f"长生不一致: {gan}{zhi}")
+
+    for gan, zhi in itertools.product(pd.GAN, pd.ZHI):
+        xun, kong_wang = ref_xun_kong_wang(gan, zhi)
+        actual = (engine._get_ten(gan, zhi), engine._get_kong_wang(gan, zhi))
+        if actual != (xun, kong_wang):
+            errors += 1
+            print(f"旬空不一致: {gan}{zhi}")
+
+    for relation_type in pd.ZHI_RELATIONS["子"]:
+        for a, b in itertools.product(pd.ZHI, pd.ZHI):
+            if ref_zhi_relation(a, b, relation_type) != pd.get_zhi_relation(
+                a, b, relation_type
+            ):
+                errors += 1
+                print(f"地支关系不一致: {a}{relation_type}{b}")
+
+    combos = list(itertools.product(pd.ZHI, repeat=4))
+    combos += [("子", "", "午", "卯"), ("", "", "", ""), ("申", "子", "辰")]
+    for combo in combos:
+        zhi_list = list(combo)
+        if ref_zhi_combinations(zhi_list) != pd.analyze_zhi_combinations(zhi_list):
+            errors += 1
+            print(f"地支组合不一致: {zhi_list}")
+
+    print(f"核对完成: 地支组合 {len(combos)} 种, 不一致 {errors} 处")
+    return errors
+
+
+# ==================== 计时 ====================
+
+
+def bench(name, ref_func, table_func, inputs, rounds):
+    def run(func):
+        best = float("inf")
+        for _ in range(rounds):
+            start = time.perf_counter()
+            for args in inputs:
+                func(*args)
+            best = min(best, time.perf_counter() - start)
+        return best / len(inputs) * 1e9
+
+    ref_ns = run(ref_func)
+    table_ns = run(table_func)
+    print(
+        f"{name:<12} 参照 {ref_ns:8.1f} ns  查表 {table_ns:8.1f} ns  "
+        f"加速 {ref_ns / table_ns:5.2f}x"
+    )
+
+
+def bench_request(requests: int):
+    calculator = get_bazi_calculator()
+    analyzer = get_marriage_analyzer()
+    datetimes = [
+        f"{1950 + i % 60}-{1 + i % 12:02d}-{1 + i % 28:02d} 10:30:00" for i in range(60)
+    ]
+
+    def run_once(solar_datetime, gender):
+        bazi = calculator.build_bazi(solar_datetime=solar_datetime, gender=gender)
+        analyzer.analyze_marriage_timing(
+            {
+                "year": bazi.year_pillar,
+                "month": bazi.month_pillar,
+                "day": bazi.day_pillar,
+                "hour": bazi.hour_pillar,
+            },
+            gender,
+        )
+
+    # 预热转换缓存，只测分析本身
+    for solar_datetime in datetimes:
+        run_once(solar_datetime, 1)
+
+    start = time.perf_counter()
+    for i in range(requests):
+        run_once(datetimes[i % len(datetimes)], i % 2)
+    elapsed = (time.perf_counter() - start) / requests * 1000
+    print(f"完整分析（build_bazi + 婚姻分析，转换已缓存）: {elapsed:.3f} ms/请求")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="八字整数查表基准测试")
+    parser.add_argument("--rounds", type=int, default=5, help="微基准重复轮数")
+    parser.add_argument("--requests", type=int, default=500, help="完整分析请求数")
+    args = parser.parse_args()
+
+    errors = verify()
+    print()
+
+    gan_pairs = list(itertools.product(pd.GAN, pd.GAN))
+    gan_zhi = list(itertools.product(pd.GAN, pd.ZHI))
+    zhi_pairs = [(a, b, "冲") for a, b in itertools.product(pd.ZHI, pd.ZHI)]
+    zhi_lists = [(list(c),) for c in itertools.product(pd.ZHI, repeat=4)][::7]
+    engine = get_bazi_engine()
+
+    bench("十神", ref_ten_gods, pd.get_ten_gods_relation, gan_pairs, args.rounds)
+    bench("长生", ref_changsheng, pd.get_changsheng_state, gan_zhi, args.rounds)
+    bench("地支关系", ref_zhi_relation, pd.get_zhi_relation, zhi_pairs, args.rounds)
+    bench(
+        "地支组合",
+        ref_zhi_combinations,
+        pd.analyze_zhi_combinations,
+        zhi_lists,
+        args.rounds,
+    )
+    bench(
+        "旬空",
+        ref_xun_kong_wang,
+        lambda g, z: (engine._get_ten(g, z), engine._get_kong_wang(g, z)),
+        gan_zhi,
+        args.rounds,
+    )
+    print()
+
+    bench_request(args.requests)
+    return 0 if errors == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
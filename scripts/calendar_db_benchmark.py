@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+日程数据库基准测试.
+
+在临时目录生成大量合成事件，对比两种存储方式下常用操作的延迟：
+- legacy: 每次操作新建连接、回滚日志模式、事件表无索引（优化前的行为）
+- pooled: 线程长连接 + WAL + 索引（CalendarDatabase 当前实现）
+
+测量的操作：按天/按分类查询、冲突检查、提醒扫描、按ID查询、统计、添加并删除事件.
+同时核对两种方式的查询结果一致.
+
+用法:
+    python scripts/calendar_db_benchmark.py [--events 10000 100000] [--repeat 50]
+"""
+
+import argparse
+import logging
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# 添加项目根目录到Python路径 - 必须在导入src模块之前
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.mcp.tools.calendar.database import (  # noqa: E402
+    EVENT_INDEXES,
+    CalendarDatabase,
+)
+
+CATEGORIES = ["默认", "工作", "个人", "会议", "提醒", "学习", "运动", "家庭"]
+
+# 提醒服务每次扫描使用的查询
+REMINDER_QUERY = """
+    SELECT * FROM events
+    WHERE reminder_sent = 0
+    AND reminder_time IS NOT NULL
+    AND reminder_time <= ?
+    AND start_time > ?
+    ORDER BY reminder_time
+"""
+
+
+class LegacyCalendarDatabase(CalendarDatabase):
+    """
+    优化前的连接方式：每次操作打开并关闭一个新连接.
+    """
+
+    def _ensure_database(self):
+        pass
+
+    @contextmanager
+    def _get_connection(self):
+        conn = sqlite3.connect(self.db_file)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+
+def generate_events(count: int, now: datetime, seed: int):
+    """
+    生成分布在过去两年到未来一年的事件，过去的事件已发送提醒.
+    """
+    rng = random.Random(seed)
+    span_minutes = 3 * 365 * 24 * 60
+    first = now - timedelta(days=2 * 365)
+    created = now.isoformat()
+    rows = []
+    for i in range(count):
+        start = first + timedelta(minutes=rng.randrange(span_minutes))
+        start = start.replace(second=0, microsecond=0)
+        end = start + timedelta(minutes=rng.choice((30, 60, 90, 120)))
+        reminder_minutes = rng.choice((5, 15, 30, 60))
+        rows.append(
+            (
+                f"evt-{i:06d}",
+                f"事件{i}",
+                start.isoformat(),
+                end.isoformat(),
+                "",
+                rng.choice(CATEGORIES),
+                reminder_minutes,
+                (start - timedelta(minutes=reminder_minutes)).isoformat(),
+                1 if start < now else 0,
+                created,
+                created,
+            )
+        )
+    return rows
+
+
+def build_databases(workdir: Path, count: int, now: datetime, seed: int):
+    pooled_file = workdir / f"pooled_{count}.db"
+    legacy_file = workdir / f"legacy_{count}.db"
+
+    pooled = CalendarDatabase(str(pooled_file))
+    with pooled._get_connection() as conn:
+        conn.executemany(
+            "INSERT INTO events VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            generate_events(count, now, seed),
+        )
+        conn.commit()
+        conn.execute("ANALYZE events")
+        conn.commit()
+    pooled.close()
+
+    # 复制出无索引、回滚日志模式的对照库
+    shutil.copyfile(pooled_file, legacy_file)
+    conn = sqlite3.connect(legacy_file)
+    for name in EVENT_INDEXES:
+        conn.execute(f"DROP INDEX IF EXISTS {name}")
+    conn.execute("PRAGMA journal_mode = DELETE")
+    conn.commit()
+    conn.close()
+
+    return (
+        LegacyCalendarDatabase(str(legacy_file)),
+        CalendarDatabase(str(pooled_file)),
+    )
+
+
+def make_operations(now: datetime, rng: random.Random, repeat: int):
+    """
+    每种操作生成 repeat 组参数，两种数据库使用相同参数.
+    """
+
+    def random_day():
+        return (now + timedelta(days=rng.randint(-700, 360))).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+
+    days = [random_day() for _ in range(repeat)]
+    months = [random_day().replace(day=1) for _ in range(repeat)]
+    categories = [rng.choice(CATEGORIES) for _ in range(repeat)]
+    slots = [(day + timedelta(hours=rng.randint(8, 20))).isoformat() for day in days]
+    ids = [f"evt-{rng.randrange(1000):06d}" for _ in range(repeat)]
+    reminder_now = [
+        now + timedelta(minutes=rng.randint(0, 60)) for _ in range(repeat)
+    ]
+
+    def by_day(db, i):
+        start = days[i]
+        return db.get_events(start.isoformat(), (start + timedelta(days=1)).isoformat())
+
+    def by_category_month(db, i):
+        start = months[i]
+        return db.get_events(
+            start.isoformat(), (start + timedelta(days=31)).isoformat(), categories[i]
+        )
+
+    def conflict(db, i):
+        start = datetime.fromisoformat(slots[i])
+        event = {
+            "id": "bench-new",
+            "start_time": start.isoformat(),
+            "end_time": (start + timedelta(hours=1)).isoformat(),
+        }
+        with db._get_connection() as conn:
+            return db._has_conflict(conn, event)
+
+    def reminder_scan(db, i):
+        current = reminder_now[i]
+        with db._get_connection() as conn:
+            cursor = conn.execute(
+                REMINDER_QUERY,
+                (current.isoformat(), (current - timedelta(hours=1)).isoformat()),
+            )
+            return [dict(row) for row in cursor.fetchall()]
+
+    def by_id(db, i):
+        return db.get_event_by_id(ids[i])
+
+    def stats(db, i):
+        return db.get_statistics()
+
+    def add_delete(db, i):
+        start = datetime.fromisoformat(slots[i]) + timedelta(days=3650)
+        created = now.isoformat()
+        event = {
+            "id": f"bench-{i}",
+            "title": "基准测试",
+            "start_time": start.isoformat(),
+            "end_time": (start + timedelta(minutes=30)).isoformat(),
+            "description": "",
+            "category": "默认",
+            "reminder_minutes": 15,
+            "reminder_time": (start - timedelta(minutes=15)).isoformat(),
+            "created_at": created,
+            "updated_at": created,
+        }
+        return db.add_event(event), db.delete_event(event["id"])
+
+    return {
+        "按天查询": by_day,
+        "分类+月查询": by_category_month,
+        "冲突检查": conflict,
+        "提醒扫描": reminder_scan,
+        "按ID查询": by_id,
+        "统计": stats,
+        "添加+删除": add_delete,
+    }
+
+
+def measure(db, operation, repeat: int):
+    latencies = []
+    results = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        results.append(operation(db, i))
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    return statistics.median(latencies), p95, results
+
+
+def run(count: int, repeat: int, seed: int) -> int:
+    now = datetime.now().replace(microsecond=0)
+    errors = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        legacy, pooled = build_databases(Path(tmp), count, now, seed)
+        print(f"\n{count} 个事件（生成耗时 {time.perf_counter() - start:.1f}s）")
+        print(
+            f"{'操作':<10} {'legacy 中位/p95 ms':>20} "
+            f"{'pooled 中位/p95 ms':>20} {'加速':>8}"
+        )
+
+        operations = make_operations(now, random.Random(seed), repeat)
+        for name, operation in operations.items():
+            legacy_median, legacy_p95, legacy_results = measure(
+                legacy, operation, repeat
+            )
+            pooled_median, pooled_p95, pooled_results = measure(
+                pooled, operation, repeat
+            )
+            if legacy_results != pooled_results:
+                errors += 1
+                print(f"{name}: 结果不一致")
+            print(
+                f"{name:<10} {legacy_median:9.3f} / {legacy_p95:8.3f} "
+                f"{pooled_median:9.3f} / {pooled_p95:8.3f} "
+                f"{legacy_median / pooled_median:7.1f}x"
+            )
+        pooled.close()
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="日程数据库基准测试")
+    parser.add_argument(
+        "--events", type=int, nargs="+", default=[10000, 100000], help="事件数量"
+    )
+    parser.add_argument("--repeat", type=int, default=50, help="每种操作重复次数")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    args = parser.parse_args()
+
+    # 冲突检查会逐条记录警告日志，基准测试时关闭
+    logging.disable(logging.WARNING)
+
+    errors = sum(run(count, args.repeat, args.seed) for count in args.events)
+    print("\n结果核对通过" if errors == 0 else f"\n结果核对失败: {errors} 项")
+    return 0 if errors == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+MCP工具调用响应路径基准测试.
+
+对比大结果（如12306余票、搜索结果）从工具返回到交给协议层发送的耗时:
+1. legacy: McpTool.call 中 json.dumps -> _handle_tool_call 中 json.loads
+   -> _reply_result 中 json.dumps 两次（计算长度、构建响应）-> 协议层 json.loads 再 json.dumps，
+   以及INFO日志中格式化完整结果
+2. single-pass: 结果只序列化一次，JSON-RPC响应和协议外层消息均以字符串拼接嵌入
+
+用法:
+    python scripts/mcp_reply_benchmark.py [--sizes 10,100,1000] [--iterations 50]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+# 添加项目根目录到Python路径 - 必须在导入src模块之前
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.mcp.mcp_server import McpServer, McpTool, PropertyList  # noqa: E402
+from src.protocols.protocol import Protocol  # noqa: E402
+from src.utils.json_utils import JSON_BACKEND  # noqa: E402
+
+
+def make_result(size_kb: int) -> str:
+    """
+    生成类似余票查询的JSON结果文本.
+    """
+    trains = []
+    text = ""
+    i = 0
+    while len(text.encode("utf-8")) < size_kb * 1024:
+        trains.extend(
+            {
+                "train_no": f"G{1000 + i + j}",
+                "from_station": "北京南",
+                "to_station": "上海虹桥",
+                "start_time": "08:00",
+                "arrive_time": "12:28",
+                "duration": "04:28",
+                "seats": {"商务座": "有", "一等座": "12", "二等座": "有", "无座": "--"},
+                "note": "复兴号 智能动车组",
+            }
+            for j in range(50)
+        )
+        i += 50
+        text = json.dumps({"success": True, "trains": trains}, ensure_ascii=False)
+    return text
+
+
+async def bench_legacy(result_text: str, iterations: int) -> float:
+    session_id = "bench-session"
+    sent = []
+    start = time.perf_counter()
+    for request_id in range(iterations):
+        result = json.dumps(
+            {"content": [{"type": "text", "text": result_text}], "isError": False}
+        )
+        f"[MCP] 工具 bench 执行成功，结果: {result}"  # INFO日志格式化
+        result_data = json.loads(result)
+        payload = {"jsonrpc": "2.0", "id": request_id, "result": result_data}
+        len(json.dumps(result_data))
+        payload_text = json.dumps(payload)
+        message = {
+            "session_id": session_id,
+            "type": "mcp",
+            "payload": json.loads(payload_text),
+        }
+        sent.append(json.dumps(message))
+        sent.clear()
+    return time.perf_counter() - start
+
+
+async def bench_single_pass(result_text: str, iterations: int) -> float:
+    protocol = Protocol()
+    protocol.session_id = "bench-session"
+    sent = []
+
+    async def send(payload):
+        sent.append(protocol._build_mcp_message(payload))
+        sent.clear()
+
+    async def callback(args):
+        return result_text
+
+    server = McpServer()
+    server.set_send_callback(send)
+    tool = McpTool("bench", "", PropertyList(), callback)
+
+    start = time.perf_counter()
+    for request_id in range(iterations):
+        result = await tool.call({})
+        await server._reply_raw_result(request_id, result)
+    return time.perf_counter() - start
+
+
+def verify(result_text: str):
+    """
+    校验两种路径最终发送的消息语义一致.
+    """
+    captured = []
+    protocol = Protocol()
+    protocol.session_id = "bench-session"
+
+    async def send(payload):
+        captured.append(protocol._build_mcp_message(payload))
+
+    async def run():
+        server = McpServer()
+        server.set_send_callback(send)
+
+        async def callback(args):
+            return result_text
+
+        tool = McpTool("bench", "", PropertyList(), callback)
+        await server._reply_raw_result(7, await tool.call({}))
+
+    asyncio.run(run())
+    expected = {
+        "session_id": "bench-session",
+        "type": "mcp",
+        "payload": {
+            "jsonrpc": "2.0",
+            "id": 7,
+            "result": {
+                "content": [{"type": "text", "text": result_text}],
+                "isError": False,
+            },
+        },
+    }
+    if json.loads(captured[0]) != expected:
+        raise SystemExit("single-pass 输出与原实现不一致")
+    return len(captured[0].encode("utf-8"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MCP工具调用响应路径基准测试")
+    parser.add_argument(
+        "--sizes", default="10,100,1000", help="结果大小(KB)，逗号分隔"
+    )
+    parser.add_argument("--iterations", type=int, default=50, help="每种大小的调用次数")
+    args = parser.parse_args()
+
+    print(f"JSON后端: {JSON_BACKEND}, 每种大小调用 {args.iterations} 次")
+    for size_kb in (int(s) for s in args.sizes.split(",")):
+        result_text = make_result(size_kb)
+        sent_bytes = verify(result_text)
+        legacy = asyncio.run(bench_legacy(result_text, args.iterations))
+        single = asyncio.run(bench_single_pass(result_text, args.iterations))
+        legacy_ms = legacy / args.iterations * 1000
+        single_ms = single / args.iterations * 1000
+        print(
+            f"{size_kb:>6}KB  legacy: {legacy_ms:8.2f} ms/次  "
+            f"single-pass: {single_ms:8.2f} ms/次  "
+            f"(加速 {legacy_ms / single_ms:4.1f}x, 发送 {sent_bytes / 1024:.0f}KB)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+UDP音频包加解密吞吐量基准测试.
+
+对比MQTT/UDP音频通道两种加解密实现的吞吐量(包/秒):
+1. legacy: 每包 bytes.fromhex 解码密钥、字符串拼接nonce、新建Cipher并拼接包
+2. UdpPacketCodec: 会话级复用密钥与nonce模板，update_into 写入复用缓冲区
+
+用法:
+    python scripts/udp_packet_codec_benchmark.py [--packets 50000] [--size 120]
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
+# 添加项目根目录到Python路径 - 必须在导入src模块之前
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.protocols.udp_packet_codec import UdpPacketCodec  # noqa: E402
+
+
+def legacy_encode(aes_key, aes_nonce, audio_data, sequence):
+    new_nonce = (
+        aes_nonce[:4]
+        + format(len(audio_data), "04x")
+        + aes_nonce[8:24]
+        + format(sequence, "08x")
+    )
+    cipher = Cipher(
+        algorithms.AES(bytes.fromhex(aes_key)),
+        modes.CTR(bytes.fromhex(new_nonce)),
+        backend=default_backend(),
+    )
+    encryptor = cipher.encryptor()
+    encrypted = encryptor.update(bytes(audio_data)) + encryptor.finalize()
+    return bytes.fromhex(new_nonce) + encrypted
+
+
+def legacy_decode(aes_key, packet):
+    cipher = Cipher(
+        algorithms.AES(bytes.fromhex(aes_key)),
+        modes.CTR(packet[:16]),
+        backend=default_backend(),
+    )
+    decryptor = cipher.decryptor()
+    return decryptor.update(packet[16:]) + decryptor.finalize()
+
+
+def report(name, count, elapsed, baseline=None):
+    rate = count / elapsed
+    speedup = f"  (加速 {rate / baseline:4.1f}x)" if baseline else ""
+    print(f"{name:>24}: {rate:12,.0f} 包/秒{speedup}")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description="UDP音频包加解密吞吐量基准测试")
+    parser.add_argument("--packets", type=int, default=50000, help="包数量")
+    parser.add_argument("--size", type=int, default=120, help="Opus包大小(字节)")
+    args = parser.parse_args()
+
+    aes_key = os.urandom(16).hex()
+    aes_nonce = "0100" + "0000" + os.urandom(8).hex() + "00000000"
+    payloads = [os.urandom(args.size) for _ in range(64)]
+    codec = UdpPacketCodec(aes_key, aes_nonce)
+
+    # 正确性校验：新旧实现生成的包逐字节一致，且可互相解密
+    for seq, payload in enumerate(payloads, 1):
+        packet = legacy_encode(aes_key, aes_nonce, payload, seq)
+        assert bytes(codec.encode(payload, seq)) == packet
+        assert codec.decode(packet) == payload
+        assert UdpPacketCodec.sequence_of(packet) == seq
+
+    print(f"包数量: {args.packets}, 负载大小: {args.size} 字节")
+
+    start = time.perf_counter()
+    for i in range(args.packets):
+        legacy_encode(aes_key, aes_nonce, payloads[i & 63], i)
+    enc_base = report("legacy encode", args.packets, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for i in range(args.packets):
+        codec.encode(payloads[i & 63], i)
+    report("UdpPacketCodec encode", args.packets, time.perf_counter() - start, enc_base)
+
+    packets = [legacy_encode(aes_key, aes_nonce, p, i) for i, p in enumerate(payloads)]
+
+    start = time.perf_counter()
+    for i in range(args.packets):
+        legacy_decode(aes_key, packets[i & 63])
+    dec_base = report("legacy decode", args.packets, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for i in range(args.packets):
+        codec.decode(packets[i & 63])
+    report("UdpPacketCodec decode", args.packets, time.perf_counter() - start, dec_base)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+八字反查索引校验.
+
+1. 用 lunar_python 逐点核对索引使用的干支推算：年柱（年初/年中/年末采样点）、
+   月柱（每月1/8/15/22/28日采样点）、日柱、时柱
+2. 随机生成八字，对比索引查找与逐年逐日遍历（下面的 brute_force_solar_times，
+   即索引之前 BaziCalculator 的实现）的结果
+
+用法:
+    python scripts/verify_bazi_solar_index.py [--samples 5] [--day-step 11] [--skip-tables]
+"""
+
+import argparse
+import calendar
+import random
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+# 添加项目根目录到Python路径 - 必须在导入src模块之前
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from lunar_python import Solar  # noqa: E402
+
+from src.mcp.tools.bazi.bazi_calculator import BaziCalculator  # noqa: E402
+from src.mcp.tools.bazi.solar_index import (  # noqa: E402
+    END_YEAR,
+    START_YEAR,
+    day_pillar,
+    get_sexagenary_index,
+    hour_pillar,
+    month_pillar,
+    pillar_index,
+    year_pillar,
+)
+
+
+def eight_char(year, month, day, hour=0, minute=0, second=0):
+    solar = Solar.fromYmdHms(year, month, day, hour, minute, second)
+    return solar.getLunar().getEightChar()
+
+
+# ==================== 参照实现（索引之前的逐年逐日遍历） ====================
+
+
+def match_year_pillar(year, gan, zhi):
+    """
+    年柱以立春为界，年初、年中、年末任一采样点匹配即可.
+    """
+    for args in ((year, 1, 1, 0, 0, 0), (year, 6, 1), (year, 12, 31, 23, 59, 59)):
+        ec = eight_char(*args)
+        if ec.getYearGan() == gan and ec.getYearZhi() == zhi:
+            return True
+    return False
+
+
+def match_month_pillar(year, month, gan, zhi):
+    """
+    月柱以节气为界，每月五个采样点任一匹配即可.
+    """
+    max_day = calendar.monthrange(year, month)[1]
+    for day in (1, 8, 15, 22, 28):
+        ec = eight_char(year, month, min(day, max_day), 12)
+        if ec.getMonthGan() == gan and ec.getMonthZhi() == zhi:
+            return True
+    return False
+
+
+def brute_force_solar_times(bazi, limit=20):
+    """
+    逐年逐日遍历 1900-2099 年，每个时辰取偶数整点，最多返回 limit 个结果.
+    """
+    pillars = bazi.split(" ")
+    if len(pillars) != 4 or any(len(pillar) != 2 for pillar in pillars):
+        raise ValueError("八字格式错误")
+    year_gan, year_zhi = pillars[0]
+    month_gan, month_zhi = pillars[1]
+    day_gan, day_zhi = pillars[2]
+    hour_gan, hour_zhi = pillars[3]
+
+    result = []
+    for year in range(1900, 2100):
+        if not match_year_pillar(year, year_gan, year_zhi):
+            continue
+        for month in range(1, 13):
+            if not match_month_pillar(year, month, month_gan, month_zhi):
+                continue
+            for day in range(1, calendar.monthrange(year, month)[1] + 1):
+                ec = eight_char(year, month, day)
+                if ec.getDayGan() != day_gan or ec.getDayZhi() != day_zhi:
+                    continue
+                for hour in range(0, 24, 2):
+                    ec = eight_char(year, month, day, hour)
+                    if ec.getTimeGan() == hour_gan and ec.getTimeZhi() == hour_zhi:
+                        result.append(f"{year}-{month:02d}-{day:02d} {hour:02d}:00:00")
+                        if len(result) >= limit:
+                            return result
+    return result
+
+
+def check_tables(day_step: int) -> int:
+    errors = 0
+
+    # 年柱：与遍历实现相同的三个采样点
+    for year in range(START_YEAR, END_YEAR):
+        actual = set()
+        for args in ((year, 1, 1, 0, 0, 0), (year, 6, 1), (year, 12, 31, 23, 59, 59)):
+            ec = eight_char(*args)
+            actual.add(pillar_index(ec.getYearGan(), ec.getYearZhi()))
+        expected = {year_pillar(year - 1), year_pillar(year)}
+        if actual != expected:
+            errors += 1
+            print(f"年柱不一致: {year} {actual} != {expected}")
+    print(f"年柱核对完成: {END_YEAR - START_YEAR} 年")
+
+    # 月柱：每月五个采样点
+    for year in range(START_YEAR, END_YEAR):
+        for month in range(1, 13):
+            max_day = calendar.monthrange(year, month)[1]
+            actual = set()
+            for day in (1, 8, 15, 22, 28):
+                ec = eight_char(year, month, min(day, max_day), 12)
+                actual.add(pillar_index(ec.getMonthGan(), ec.getMonthZhi()))
+            current = month_pillar(year, month)
+            expected = {(current - 1) % 60, current}
+            if actual != expected:
+                errors += 1
+                print(f"月柱不一致: {year}-{month:02d} {actual} != {expected}")
+    print(f"月柱核对完成: {(END_YEAR - START_YEAR) * 12} 个月")
+
+    # 日柱与时柱：步长与60互质时覆盖全部日柱
+    checked = 0
+    day = date(START_YEAR, 1, 1)
+    end = date(END_YEAR - 1, 12, 31)
+    while day <= end:
+        ec = eight_char(day.year, day.month, day.day)
+        expected_day = day_pillar(day)
+        if pillar_index(ec.getDayGan(), ec.getDayZhi()) != expected_day:
+            errors += 1
+            print(f"日柱不一致: {day}")
+        for hour in range(0, 24, 2):
+            ec = eight_char(day.year, day.month, day.day, hour)
+            if pillar_index(ec.getTimeGan(), ec.getTimeZhi()) != hour_pillar(
+                expected_day, hour
+            ):
+                errors += 1
+                print(f"时柱不一致: {day} {hour:02d}:00")
+        checked += 1
+        day += timedelta(days=day_step)
+    print(f"日柱/时柱核对完成: {checked} 天")
+    return errors
+
+
+def random_bazi(rng: random.Random) -> str:
+    start = date(START_YEAR, 1, 1).toordinal()
+    end = date(END_YEAR - 1, 12, 31).toordinal()
+    day = date.fromordinal(rng.randint(start, end))
+    ec = eight_char(day.year, day.month, day.day, rng.randrange(0, 24, 2))
+    return " ".join(
+        [ec.getYearGan() + ec.getYearZhi(), ec.getMonthGan() + ec.getMonthZhi()]
+        + [ec.getDayGan() + ec.getDayZhi(), ec.getTimeGan() + ec.getTimeZhi()]
+    )
+
+
+def check_lookups(samples: int, seed: int) -> int:
+    rng = random.Random(seed)
+    calculator = BaziCalculator()
+    get_sexagenary_index()
+
+    # 随机真实八字，外加无解的组合（月柱与年柱不配、阴阳不配）
+    cases = [random_bazi(rng) for _ in range(samples)]
+    cases += ["甲子 甲子 甲子 甲子", "甲子 丙寅 甲丑 甲子"]
+
+    errors = 0
+    for bazi in cases:
+        start = time.perf_counter()
+        expected = brute_force_solar_times(bazi)
+        brute_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        actual = calculator.get_solar_times(bazi)
+        index_ms = (time.perf_counter() - start) * 1000
+
+        status = "一致" if actual == expected else "不一致"
+        print(
+            f"{bazi}: {len(actual)} 个结果, 遍历 {brute_ms:8.1f}ms, "
+            f"索引 {index_ms:6.3f}ms, {status}"
+        )
+        if actual != expected:
+            errors += 1
+            print(f"  遍历: {expected}\n  索引: {actual}")
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="八字反查索引校验")
+    parser.add_argument("--samples", type=int, default=5, help="随机八字数量")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    parser.add_argument(
+        "--day-step", type=int, default=11, help="日柱/时柱核对的日期步长"
+    )
+    parser.add_argument("--skip-tables", action="store_true", help="跳过干支推算核对")
+    args = parser.parse_args()
+
+    errors = 0
+    if not args.skip_tables:
+        errors += check_tables(args.day_step)
+    errors += check_lookups(args.samples, args.seed)
+
+    print("校验通过" if errors == 0 else f"校验失败: {errors} 处不一致")
+    return 0 if errors == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
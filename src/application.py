@@ -11,6 +11,7 @@ from typing import Set
 from src.constants.constants import AbortReason, DeviceState, ListeningMode
 from src.display import gui_display
 from src.mcp.mcp_server import McpServer
+from src.protocols.audio_sender import AudioSender
 from src.protocols.mqtt_protocol import MqttProtocol
 from src.protocols.websocket_protocol import WebsocketProtocol
 from src.utils.common_utils import handle_verification_code
@@ -140,27 +141,29 @@ class Application:
         self._state_lock = None
         self._abort_lock = None
 
-        # 音频与发送并发限制（避免任务风暴）
+        # 音频发送：每个音频通道一个常驻发送协程，按序发送
         try:
-            audio_write_cc = int(
-                self.config.get_config("APP.AUDIO_WRITE_CONCURRENCY", 4)
+            send_queue_size = int(
+                self.config.get_config("APP.AUDIO_SEND_QUEUE_MAXSIZE", 64)
             )
         except Exception:
-            audio_write_cc = 4
+            send_queue_size = 64
         try:
-            send_audio_cc = int(self.config.get_config("APP.SEND_AUDIO_CONCURRENCY", 4))
+            send_coalesce_ms = int(
+                self.config.get_config("APP.AUDIO_SEND_COALESCE_MS", 0)
+            )
         except Exception:
-            send_audio_cc = 4
-        # 保存配置值，在_initialize_async_objects中创建Semaphore
-        self._audio_write_cc = audio_write_cc
-        self._send_audio_cc = send_audio_cc
-        self._audio_write_semaphore = None
-        self._send_audio_semaphore = None
+            send_coalesce_ms = 0
+        self._audio_sender = AudioSender(
+            self._send_audio_frame,
+            max_queue_size=send_queue_size,
+            coalesce_ms=send_coalesce_ms,
+        )
 
         # 最近一次接收到服务端音频的时间（用于应对TTS起止近邻竞态）
         self._last_incoming_audio_at: float = 0.0
 
-        # 音频静默检测（事件驱动取代固定sleep）
+        # 音频静默检测（由解码协程的收包时间戳驱动）
         try:
             tail_silence_ms = int(
                 self.config.get_config("APP.TTS_TAIL_SILENCE_MS", 150)
@@ -177,8 +180,6 @@ class Application:
         self._incoming_audio_tail_timeout_sec: float = max(
             0.1, tail_wait_timeout_ms / 1000.0
         )
-        self._incoming_audio_idle_event = None
-        self._incoming_audio_idle_handle = None
 
         logger.debug("Application实例初始化完成")
 
@@ -213,14 +214,6 @@ class Application:
         # 初始化中止事件
         self.aborted_event = asyncio.Event()
         self.aborted_event.clear()
-        
-        # 初始化信号量
-        self._audio_write_semaphore = asyncio.Semaphore(self._audio_write_cc)
-        self._send_audio_semaphore = asyncio.Semaphore(self._send_audio_cc)
-        
-        # 初始化音频静默事件（默认置为已静默，避免无谓等待）
-        self._incoming_audio_idle_event = asyncio.Event()
-        self._incoming_audio_idle_event.set()
 
     async def _run_application_core(self, protocol: str, mode: str):
         """
@@ -349,73 +342,39 @@ class Application:
                 and self.protocol.is_audio_channel_opened()
             ):
 
-                # 线程安全地调度到主事件循环
-                if self._main_loop and not self._main_loop.is_closed():
-                    self._main_loop.call_soon_threadsafe(
-                        self._schedule_audio_send, encoded_data
-                    )
+                # 线程安全地提交到发送队列，由常驻发送协程按序发送
+                self._audio_sender.submit_threadsafe(encoded_data)
 
         except Exception as e:
             logger.error(f"处理编码音频数据回调失败: {e}")
 
-    def _schedule_audio_send(self, encoded_data: bytes):
+    async def _send_audio_frame(self, encoded_data: bytes):
         """
-        在主事件循环中调度音频发送任务.
+        发送单帧音频（由音频发送协程调用）.
         """
-        try:
-            if not self.running or not self.protocol:
-                return
-            # 再次检查状态（可能在调度期间状态已改变）
-            # 核心逻辑：LISTENING状态或SPEAKING+REALTIME模式下发送音频
-            should_send = self._should_send_microphone_audio()
-
-            if (
-                should_send
-                and self.protocol
-                and self.protocol.is_audio_channel_opened()
-            ):
-                # 使用call_soon_threadsafe避免qasync任务重入
-                if self._main_loop and not self._main_loop.is_closed():
-                    self._main_loop.call_soon_threadsafe(
-                        self._schedule_audio_send_task, encoded_data
-                    )
-
-        except Exception as e:
-            logger.error(f"调度音频发送失败: {e}")
+        if not self.running or not self.protocol:
+            return
+        # 再次检查状态（可能在排队期间状态已改变）
+        # 核心逻辑：LISTENING状态或SPEAKING+REALTIME模式下发送音频
+        if (
+            self._should_send_microphone_audio()
+            and self.protocol.is_audio_channel_opened()
+        ):
+            await self.protocol.send_audio(encoded_data)
 
-    def _schedule_audio_send_task(self, encoded_data: bytes):
+    def _get_audio_decode_stats(self) -> dict:
         """
-        在主事件循环中创建音频发送任务.
+        获取播放解码统计（PLC/FEC补偿帧数等），供协议层连接信息汇报.
         """
-        try:
-            if not self.running or not self.protocol:
-                return
-            
-            # 并发限制，避免任务风暴
-            async def _send():
-                async with self._send_audio_semaphore:
-                    await self.protocol.send_audio(encoded_data)
-
-            self._create_background_task(_send(), "发送音频数据")
-        except Exception as e:
-            logger.error(f"创建音频发送任务失败: {e}", exc_info=True)
+        if not self.audio_codec:
+            return {}
+        return self.audio_codec.get_decode_stats()
 
-    def _schedule_audio_write_task(self, data: bytes):
+    def get_audio_sender_stats(self) -> dict:
         """
-        在主事件循环中创建音频写入任务.
+        获取音频发送统计（积压、丢帧、失败等）.
         """
-        try:
-            if not self.running or not self.audio_codec:
-                return
-            
-            # 音频数据处理需要实时性，限制并发，避免任务风暴
-            async def _write():
-                async with self._audio_write_semaphore:
-                    await self.audio_codec.write_audio(data)
-
-            self._create_background_task(_write(), "写入音频数据")
-        except Exception as e:
-            logger.error(f"创建音频写入任务失败: {e}", exc_info=True)
+        return self._audio_sender.get_stats()
 
     def _should_send_microphone_audio(self) -> bool:
         """
@@ -532,6 +491,7 @@ class Application:
         self.protocol.on_incoming_json(self._on_incoming_json)
         self.protocol.on_audio_channel_opened(self._on_audio_channel_opened)
         self.protocol.on_audio_channel_closed(self._on_audio_channel_closed)
+        self.protocol.set_audio_stats_provider(self._get_audio_decode_stats)
 
     async def _start_core_tasks(self):
         """
@@ -963,43 +923,18 @@ class Application:
                 # 记录最近一次收到服务端音频的时间
                 self._last_incoming_audio_at = time.monotonic()
 
-                # 标记“非静默”，并重置定时器：在静默期后置位事件
-                try:
-                    if self._incoming_audio_idle_event:
-                        self._incoming_audio_idle_event.clear()
-                    # 取消旧的静默计时器
-                    if self._incoming_audio_idle_handle:
-                        self._incoming_audio_idle_handle.cancel()
-                        self._incoming_audio_idle_handle = None
-                    # 安排新的静默计时任务（tail_silence_ms 后置位）
-
-                    def _mark_idle():
-                        if self._incoming_audio_idle_event:
-                            self._incoming_audio_idle_event.set()
-
-                    if self._main_loop and not self._main_loop.is_closed():
-                        self._incoming_audio_idle_handle = self._main_loop.call_later(
-                            self._incoming_audio_silence_sec,
-                            _mark_idle,
-                        )
-                except Exception:
-                    pass
-
                 # 若当前处于IDLE，说明出现了“停止后紧接着开始”的起止竞态，先切到SPEAKING
                 if self.device_state == DeviceState.IDLE:
                     self.schedule_command_nowait(
                         lambda: self._set_device_state_impl(DeviceState.SPEAKING)
                     )
 
-                # 使用call_soon_threadsafe避免qasync任务重入
-                if self._main_loop and not self._main_loop.is_closed():
-                    self._main_loop.call_soon_threadsafe(
-                        self._schedule_audio_write_task, data
-                    )
+                # 协议层在事件循环中回调，直接交给常驻解码协程按序解码播放
+                self.audio_codec.enqueue_audio(data)
             except RuntimeError as e:
-                logger.error(f"无法创建音频写入任务: {e}")
+                logger.error(f"无法提交音频数据: {e}")
             except Exception as e:
-                logger.error(f"创建音频写入任务失败: {e}", exc_info=True)
+                logger.error(f"提交音频数据失败: {e}", exc_info=True)
 
     def _on_incoming_json(self, json_data):
         """
@@ -1096,18 +1031,14 @@ class Application:
             else:
                 logger.debug("TTS音频播放完成")
 
-        # 仅在非打断情况下，等待“静默事件”
-        if not self.aborted_event.is_set():
+        # 仅在非打断情况下，等待服务端音频进入静默
+        if not self.aborted_event.is_set() and self.audio_codec:
             try:
-                if self._incoming_audio_idle_event:
-                    # 最长等待一个超时时间，避免异常情况下卡住
-                    try:
-                        await asyncio.wait_for(
-                            self._incoming_audio_idle_event.wait(),
-                            timeout=self._incoming_audio_tail_timeout_sec,
-                        )
-                    except asyncio.TimeoutError:
-                        pass
+                # 最长等待一个超时时间，避免异常情况下卡住
+                await self.audio_codec.wait_for_incoming_idle(
+                    self._incoming_audio_silence_sec,
+                    self._incoming_audio_tail_timeout_sec,
+                )
             except Exception:
                 pass
 
@@ -1149,6 +1080,9 @@ class Application:
         """
         logger.info("音频通道已打开")
         try:
+            # 启动本音频通道的发送协程
+            self._audio_sender.start()
+
             if self.audio_codec:
                 await self.audio_codec.start_streams()
 
@@ -1167,6 +1101,7 @@ class Application:
         音频通道关闭回调.
         """
         logger.info("音频通道已关闭")
+        await self._audio_sender.stop()
         await self._set_device_state(DeviceState.IDLE)
         self.keep_listening = False
 
@@ -1362,7 +1297,13 @@ class Application:
 
                 self._main_tasks.clear()
 
-            # 4. 取消后台任务（短期任务池）
+            # 4. 停止音频发送协程
+            try:
+                await self._audio_sender.stop()
+            except Exception as e:
+                logger.warning(f"停止音频发送协程时出错: {e}")
+
+            # 取消后台任务（短期任务池）
             try:
                 if self._bg_tasks:
                     for t in list(self._bg_tasks):
@@ -1393,6 +1334,26 @@ class Application:
             # 7. 关闭MCP服务器
             await self._safe_close_resource(self.mcp_server, "MCP服务器")
 
+            # 关闭共享HTTP连接池
+            from src.utils.http_client import get_http_client
+
+            await self._safe_close_resource(get_http_client(), "HTTP客户端")
+
+            # 停止日程提醒服务并关闭日程数据库的长连接（完成WAL检查点）
+            from src.mcp.tools.calendar import (
+                close_calendar_database,
+                get_reminder_service,
+            )
+
+            await self._safe_close_resource(
+                get_reminder_service(), "日程提醒服务", "stop"
+            )
+            try:
+                close_calendar_database()
+                logger.info("日程数据库已关闭")
+            except Exception as e:
+                logger.error(f"关闭日程数据库失败: {e}")
+
             # 8. 清理队列
             try:
                 for q in [
@@ -1407,17 +1368,7 @@ class Application:
             except Exception as e:
                 logger.error(f"清空队列失败: {e}")
 
-            # 9. 取消尾静默定时器并置静默事件，避免等待
-            try:
-                if self._incoming_audio_idle_handle:
-                    self._incoming_audio_idle_handle.cancel()
-                    self._incoming_audio_idle_handle = None
-                if self._incoming_audio_idle_event:
-                    self._incoming_audio_idle_event.set()
-            except Exception:
-                pass
-
-            # 10. 最后停止UI显示
+            # 9. 最后停止UI显示
             await self._safe_close_resource(self.display, "显示界面")
 
             logger.info("应用程序关闭完成")
@@ -1,13 +1,21 @@
-import ctypes
+import asyncio
 import platform
-from collections import deque
 from typing import Any, Dict, Optional
 
 import numpy as np
 import sounddevice as sd
+import soxr
 
-from libs.webrtc_apm import WebRTCAudioProcessing, create_default_config
+from libs.webrtc_apm import (
+    WebRTCAudioProcessing,
+    as_short_pointer,
+    create_default_config,
+)
+from src.audio_codecs.drift_compensator import DriftCompensator
+from src.audio_codecs.reference_aec import ReferenceAEC
+from src.audio_codecs.ring_buffer import AudioRingBuffer
 from src.constants.constants import AudioConfig
+from src.utils.config_manager import ConfigManager
 from src.utils.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -25,6 +33,14 @@ class AECProcessor:
         self._is_macos = self._platform == 'darwin'
         self._is_linux = self._platform == 'linux'
         self._is_windows = self._platform == 'windows'
+
+        # AEC模式：auto 按平台选择（macOS: WebRTC + BlackHole，其余: 系统级），
+        # internal 使用 WebRTC APM + 本机播放PCM作为参考信号（任意平台，无需回环设备）
+        config = ConfigManager.get_instance()
+        self._mode = str(config.get_config("AEC_OPTIONS.MODE", "auto")).lower()
+        self._use_internal_reference = self._mode == "internal"
+        self._initial_delay_ms = config.get_config("AEC_OPTIONS.STREAM_DELAY_MS", 0)
+        self._reference_aec: Optional[ReferenceAEC] = None
         
         # WebRTC APM 实例（仅 macOS 使用）
         self.apm = None
@@ -36,10 +52,28 @@ class AECProcessor:
         self.reference_stream = None
         self.reference_device_id = None
         self.reference_sample_rate = None
+        self._reference_resampler = None  # 参考信号流式重采样器（跨回调保持状态）
         
-        # 缓冲区
-        self._reference_buffer = deque()
+        # 缓冲区：参考信号回调线程写入，录音回调线程读取
         self._aec_frame_size = AudioConfig.INPUT_FRAME_SIZE  # 16kHz, 10ms = 160 samples
+        self._reference_buffer = AudioRingBuffer(self._aec_frame_size * 32)
+        self._max_reference_samples = self._aec_frame_size * 10  # 保持约100ms的数据
+        # 参考信号与麦克风时钟漂移补偿：逐采样增删，保持回声延迟稳定
+        self._reference_reader = DriftCompensator(
+            self._reference_buffer,
+            tolerance=self._aec_frame_size // 5,  # 2ms
+            max_level=self._max_reference_samples,
+        )
+
+        # APM输入输出缓冲区：预分配并复用，指针只获取一次，每帧无逐样本拷贝
+        self._capture_in = np.zeros(self._aec_frame_size, dtype=np.int16)
+        self._capture_out = np.zeros(self._aec_frame_size, dtype=np.int16)
+        self._render_in = np.zeros(self._aec_frame_size, dtype=np.int16)
+        self._render_out = np.zeros(self._aec_frame_size, dtype=np.int16)
+        self._capture_in_ptr = as_short_pointer(self._capture_in)
+        self._capture_out_ptr = as_short_pointer(self._capture_out)
+        self._render_in_ptr = as_short_pointer(self._render_in)
+        self._render_out_ptr = as_short_pointer(self._render_out)
         
         # 状态标志
         self._is_initialized = False
@@ -48,7 +82,13 @@ class AECProcessor:
     async def initialize(self):
         """初始化AEC处理器"""
         try:
-            if self._is_windows or self._is_linux:
+            if self._use_internal_reference:
+                # 软件AEC：参考信号由 AudioCodec 的播放回调提供
+                await self._initialize_apm()
+                self._is_initialized = True
+                logger.info("AEC处理器初始化完成（本机播放参考信号模式）")
+                return
+            elif self._is_windows or self._is_linux:
                 # Windows 和 Linux 平台使用系统级AEC，无需额外处理
                 logger.info(f"{self._platform.capitalize()} 平台使用系统级回声消除，AEC处理器已启用")
                 self._is_initialized = True
@@ -130,6 +170,17 @@ class AECProcessor:
             # 创建参考信号输入流
             frame_duration_sec = AudioConfig.FRAME_DURATION / 1000  # 10ms
             reference_frame_size = int(self.reference_sample_rate * frame_duration_sec)
+
+            # 重采样到16kHz：流式重采样器在回调之间保持滤波器状态
+            if self.reference_sample_rate != AudioConfig.INPUT_SAMPLE_RATE:
+                self._reference_resampler = soxr.ResampleStream(
+                    self.reference_sample_rate,
+                    AudioConfig.INPUT_SAMPLE_RATE,
+                    AudioConfig.CHANNELS,
+                    dtype="int16",
+                    quality="QQ",
+                )
+            self._reference_reader.reset()
             
             self.reference_stream = sd.InputStream(
                 device=self.reference_device_id,
@@ -189,33 +240,70 @@ class AECProcessor:
             return
         
         try:
-            audio_data = indata.copy().flatten()
-            
+            audio_data = indata.reshape(-1)
+
             # 重采样到16kHz（如果需要）
-            if self.reference_sample_rate != AudioConfig.INPUT_SAMPLE_RATE:
-                # 简单的降采样处理（实际应用中应使用更好的重采样器）
-                ratio = AudioConfig.INPUT_SAMPLE_RATE / self.reference_sample_rate
-                target_length = int(len(audio_data) * ratio)
-                audio_data = np.interp(
-                    np.linspace(0, len(audio_data) - 1, target_length),
-                    np.arange(len(audio_data)),
-                    audio_data
-                ).astype(np.int16)
-            
-            # 添加到参考缓冲区
-            self._reference_buffer.extend(audio_data)
-            
-            # 保持缓冲区大小合理
-            max_buffer_size = self._aec_frame_size * 10  # 保持约100ms的数据
-            while len(self._reference_buffer) > max_buffer_size:
-                self._reference_buffer.popleft()
-                
+            if self._reference_resampler is not None:
+                audio_data = self._reference_resampler.resample_chunk(
+                    audio_data, last=False
+                )
+            
+            # 添加到参考缓冲区（水位与漂移由消费端补偿）
+            self._reference_buffer.write(audio_data)
+
         except Exception as e:
             logger.error(f"参考信号回调错误: {e}")
     
     def _reference_finished_callback(self):
         """参考信号流结束回调"""
         logger.info("参考信号流已结束")
+
+    @property
+    def uses_internal_reference(self) -> bool:
+        """是否使用本机播放PCM作为参考信号（AudioCodec 需提供播放PCM并接收处理结果）"""
+        return self._use_internal_reference and self.apm is not None
+
+    def start_internal_reference(self, render_sample_rate: int, sink, stream_latency_ms: int):
+        """
+        启动本机参考信号模式的工作线程
+
+        Args:
+            render_sample_rate: 播放PCM的采样率
+            sink: 处理后录音帧的去向（在工作线程中调用）
+            stream_latency_ms: 输入输出流延迟之和，作为未配置时的初始stream delay
+        """
+        if not self.uses_internal_reference:
+            return
+
+        delay_ms = self._initial_delay_ms or stream_latency_ms
+        self._reference_aec = ReferenceAEC(
+            self.apm,
+            self.capture_config,
+            self.render_config,
+            render_sample_rate=render_sample_rate,
+            sample_rate=AudioConfig.INPUT_SAMPLE_RATE,
+            frame_size=self._aec_frame_size,
+            initial_delay_ms=delay_ms,
+        )
+        self._reference_aec.set_output(sink)
+        self._reference_aec.start()
+
+    def push_render(self, pcm: np.ndarray):
+        """播放回调线程调用：提供实际送往扬声器的PCM"""
+        if self._reference_aec is not None:
+            self._reference_aec.push_render(pcm)
+
+    def submit_capture(self, frame: np.ndarray, process: bool = True) -> bool:
+        """
+        录音回调线程调用：投递录音帧到软件AEC工作线程
+
+        Returns:
+            是否已投递（False 时调用方应直接使用原始帧）
+        """
+        if self._reference_aec is None or not self._reference_aec.is_running():
+            return False
+        self._reference_aec.submit_capture(frame, process)
+        return True
     
     def process_audio(self, capture_audio: np.ndarray) -> np.ndarray:
         """
@@ -230,6 +318,10 @@ class AECProcessor:
         if not self._is_initialized:
             return capture_audio
         
+        # 本机参考信号模式由工作线程处理（submit_capture），不在此同步处理
+        if self._use_internal_reference:
+            return capture_audio
+
         # Windows 和 Linux 平台直接返回原始音频（系统级处理）
         if self._is_windows or self._is_linux:
             return capture_audio
@@ -244,19 +336,13 @@ class AECProcessor:
                 logger.warning(f"音频帧大小不匹配: {len(capture_audio)}, 期望: {self._aec_frame_size}")
                 return capture_audio
             
-            # 获取参考信号
-            reference_audio = self._get_reference_frame()
-            
-            # 创建ctypes缓冲区
-            capture_buffer = (ctypes.c_short * self._aec_frame_size)(*capture_audio)
-            reference_buffer = (ctypes.c_short * self._aec_frame_size)(*reference_audio)
-            
-            processed_capture = (ctypes.c_short * self._aec_frame_size)()
-            processed_reference = (ctypes.c_short * self._aec_frame_size)()
-            
+            # 获取参考信号（直接写入复用的render缓冲区）
+            self._fill_reference_frame(self._render_in)
+            np.copyto(self._capture_in, capture_audio, casting="unsafe")
+
             # 首先处理参考信号（render stream）
             render_result = self.apm.process_reverse_stream(
-                reference_buffer, self.render_config, self.render_config, processed_reference
+                self._render_in_ptr, self.render_config, self.render_config, self._render_out_ptr
             )
             
             if render_result != 0:
@@ -264,36 +350,31 @@ class AECProcessor:
             
             # 然后处理采集信号（capture stream）
             capture_result = self.apm.process_stream(
-                capture_buffer, self.capture_config, self.capture_config, processed_capture
+                self._capture_in_ptr, self.capture_config, self.capture_config, self._capture_out_ptr
             )
             
             if capture_result != 0:
                 logger.warning(f"采集信号处理失败，错误码: {capture_result}")
                 return capture_audio
             
-            # 转换回numpy数组
-            result = np.array(processed_capture, dtype=np.int16)
-            return result
+            # 输出缓冲区会被下一帧覆盖，返回一份整块拷贝供下游持有
+            return self._capture_out.copy()
             
         except Exception as e:
             logger.error(f"AEC处理失败: {e}")
             return capture_audio
     
-    def _get_reference_frame(self) -> np.ndarray:
-        """获取一帧参考信号"""
-        # 如果没有参考信号或缓冲区不足，返回静音
-        if len(self._reference_buffer) < self._aec_frame_size:
-            return np.zeros(self._aec_frame_size, dtype=np.int16)
-        
-        # 从缓冲区提取一帧
-        frame_data = []
-        for _ in range(self._aec_frame_size):
-            frame_data.append(self._reference_buffer.popleft())
-        
-        return np.array(frame_data, dtype=np.int16)
+    def _fill_reference_frame(self, out: np.ndarray):
+        """将一帧参考信号写入 out"""
+        # 如果没有参考信号或缓冲区不足，填充静音
+        if not self._reference_reader.read_into(out):
+            out.fill(0)
     
     def is_reference_available(self) -> bool:
         """检查参考信号是否可用"""
+        if self._use_internal_reference:
+            return self._reference_aec is not None and self._reference_aec.is_running()
+
         if self._is_windows or self._is_linux:
             # Windows 和 Linux 使用系统级AEC，总是可用
             return self._is_initialized
@@ -311,7 +392,14 @@ class AECProcessor:
             'reference_available': self.is_reference_available(),
         }
         
-        if self._is_windows:
+        if self._use_internal_reference:
+            status.update({
+                'aec_type': 'webrtc_internal_reference',
+                'description': 'WebRTC APM + 本机播放参考信号',
+                'webrtc_apm_active': self.apm is not None,
+                **(self._reference_aec.get_stats() if self._reference_aec else {}),
+            })
+        elif self._is_windows:
             status.update({
                 'aec_type': 'system_level',
                 'description': 'Windows 系统底层回声消除'
@@ -327,6 +415,7 @@ class AECProcessor:
                 'description': 'WebRTC + BlackHole 参考信号',
                 'reference_device_id': self.reference_device_id,
                 'reference_buffer_size': len(self._reference_buffer),
+                'reference_drift': self._reference_reader.get_stats(),
                 'webrtc_apm_active': self.apm is not None
             })
         else:
@@ -346,8 +435,13 @@ class AECProcessor:
         logger.info("开始关闭AEC处理器...")
         
         try:
-            # 仅在 macOS 平台清理 WebRTC 相关资源
-            if self._is_macos:
+            # 先停止软件AEC工作线程，再释放APM
+            if self._reference_aec:
+                await asyncio.to_thread(self._reference_aec.stop)
+                self._reference_aec = None
+
+            # 清理 WebRTC 相关资源（macOS 或本机参考信号模式）
+            if self._is_macos or self._use_internal_reference:
                 # 停止参考信号流
                 if self.reference_stream:
                     try:
@@ -357,6 +451,7 @@ class AECProcessor:
                         logger.warning(f"关闭参考信号流失败: {e}")
                     finally:
                         self.reference_stream = None
+                        self._reference_resampler = None
                 
                 # 清理WebRTC APM
                 if self.apm:
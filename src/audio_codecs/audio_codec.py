@@ -1,7 +1,6 @@
 import asyncio
 import gc
 import time
-from collections import deque
 from typing import Optional
 
 import numpy as np
@@ -10,6 +9,9 @@ import sounddevice as sd
 import soxr
 
 from src.audio_codecs.aec_processor import AECProcessor
+from src.audio_codecs.capture_hub import CaptureHub
+from src.audio_codecs.playback_buffer import PlaybackBuffer
+from src.audio_codecs.ring_buffer import AudioRingBuffer
 from src.constants.constants import AudioConfig
 from src.utils.config_manager import ConfigManager
 from src.utils.logging_config import get_logger
@@ -42,9 +44,12 @@ class AudioCodec:
         self.input_resampler = None  # 设备采样率 -> 16kHz
         self.output_resampler = None  # 24kHz -> 设备采样率(播放用)
 
-        # 重采样缓冲区
-        self._resample_input_buffer = deque()
-        self._resample_output_buffer = deque()
+        # 重采样缓冲区（无锁环形缓冲区，在创建重采样器时按采样率分配）
+        self._resample_input_buffer: Optional[AudioRingBuffer] = None
+        self._resample_output_buffer: Optional[AudioRingBuffer] = None
+        # 清空请求：重采样缓冲区只由各自的回调线程读写，由回调线程在下次回调时执行清空
+        self._clear_input_requested = False
+        self._clear_output_requested = False
 
         self._device_input_frame_size = None
         self._is_closing = False
@@ -53,22 +58,49 @@ class AudioCodec:
         self.input_stream = None  # 录音流
         self.output_stream = None  # 播放流
 
-        # 队列：唤醒词检测和播放缓冲
-        self._wakeword_buffer = asyncio.Queue(maxsize=100)
-        self._output_buffer = asyncio.Queue(maxsize=500)
-
-        # 实时编码回调（直接发送，不走队列）
+        # 录音帧分发：编码、唤醒词、VAD等共享同一路16kHz录音帧
+        self.capture_hub = CaptureHub()
+        # 播放缓冲：事件循环写入、声卡驱动线程读取的跨线程抖动缓冲区
+        self._output_buffer = PlaybackBuffer(
+            max_frames=500,
+            target_depth=self.config.get_config(
+                "AUDIO_OPTIONS.PLAYBACK_TARGET_DEPTH", 3
+            ),
+        )
+
+        # 播放解码：常驻解码协程按序消费Opus包
+        self._decode_queue = asyncio.Queue(maxsize=500)
+        self._decode_task: Optional[asyncio.Task] = None
+        self._last_packet_at: float = 0.0  # 最近一次收到播放数据包的时间
+        # 解码协程处理完队列中所有包时置位，提交新包时清除
+        self._decode_idle = asyncio.Event()
+        self._decode_idle.set()
+
+        # 丢包补偿：空数据包表示丢失，等下一个包到达后用FEC/PLC补出缺失的帧
+        self._pending_lost_frames = 0
+        self._max_concealed_frames = 10  # 单个空洞最多补偿的帧数，更长的空洞直接跳过
+        self._plc_frames = 0
+        self._fec_frames = 0
+        self._decode_errors = 0
+
+        # 实时编码回调（直接发送，不走队列），编码器作为第一个录音帧订阅者
         self._encoded_audio_callback = None
+        self.capture_hub.subscribe(self._encode_captured_frame, name="opus_encoder")
 
         # AEC处理器
         self.aec_processor = AECProcessor()
         self._aec_enabled = False
+        # 本机播放参考信号模式：播放回调提供参考PCM，录音帧由AEC工作线程处理后分发
+        self._internal_reference_aec = False
 
     async def initialize(self):
         """
         初始化音频设备.
         """
         try:
+            # 播放缓冲区需要从驱动线程通知事件循环
+            self._output_buffer.bind_loop(asyncio.get_running_loop())
+
             # 显示并选择音频设备
             await self._select_audio_devices()
 
@@ -102,10 +134,16 @@ class AudioCodec:
                 AudioConfig.OUTPUT_SAMPLE_RATE, AudioConfig.CHANNELS
             )
 
+            # 启动播放解码协程
+            self._decode_task = asyncio.create_task(
+                self._decode_worker(), name="播放解码"
+            )
+
             # 初始化AEC处理器
             try:
                 await self.aec_processor.initialize()
                 self._aec_enabled = True
+                self._start_internal_reference_aec()
                 logger.info("AEC处理器启用")
             except Exception as e:
                 logger.warning(f"AEC处理器初始化失败，将使用原始音频: {e}")
@@ -130,6 +168,10 @@ class AudioCodec:
                 dtype="int16",
                 quality="QQ",
             )
+            # 缓冲1秒的16kHz数据，足够吸收重采样器的输出抖动
+            self._resample_input_buffer = AudioRingBuffer(
+                AudioConfig.INPUT_SAMPLE_RATE * AudioConfig.CHANNELS
+            )
             logger.info(f"输入重采样: {self.device_input_sample_rate}Hz -> 16kHz")
 
         # 输出重采样器：24kHz -> 设备采样率
@@ -141,6 +183,9 @@ class AudioCodec:
                 dtype="int16",
                 quality="QQ",
             )
+            self._resample_output_buffer = AudioRingBuffer(
+                self.device_output_sample_rate * AudioConfig.CHANNELS
+            )
             logger.info(
                 f"输出重采样: {AudioConfig.OUTPUT_SAMPLE_RATE}Hz -> {self.device_output_sample_rate}Hz"
             )
@@ -220,13 +265,20 @@ class AudioCodec:
             return
 
         try:
-            audio_data = indata.copy().flatten()
-
-            # 重采样到16kHz（如果设备不是16kHz）
             if self.input_resampler is not None:
-                audio_data = self._process_input_resampling(audio_data)
+                # 重采样到16kHz：直接以驱动缓冲区视图作为输入，输出为新数组
+                audio_data = self._process_input_resampling(indata.reshape(-1))
                 if audio_data is None:
                     return
+            else:
+                # 驱动会复用 indata，复制一次后由所有订阅者共享
+                audio_data = indata.reshape(-1).copy()
+
+            # 软件AEC（本机播放参考信号）：交给AEC工作线程处理后再分发
+            if self._internal_reference_aec and self.aec_processor.submit_capture(
+                audio_data, self._aec_enabled
+            ):
+                return
 
             # 应用AEC处理（仅 macOS 需要）
             if (self._aec_enabled and 
@@ -237,65 +289,47 @@ class AudioCodec:
                 except Exception as e:
                     logger.warning(f"AEC处理失败，使用原始音频: {e}")
 
-            # 实时编码并发送（不走队列，减少延迟）
-            if (
-                self._encoded_audio_callback
-                and len(audio_data) == AudioConfig.INPUT_FRAME_SIZE
-            ):
-                try:
-                    pcm_data = audio_data.astype(np.int16).tobytes()
-                    encoded_data = self.opus_encoder.encode(
-                        pcm_data, AudioConfig.INPUT_FRAME_SIZE
-                    )
-
-                    if encoded_data:
-                        self._encoded_audio_callback(encoded_data)
-
-                except Exception as e:
-                    logger.warning(f"实时录音编码失败: {e}")
-
-            # 同时提供给唤醒词检测（走队列）
-            self._put_audio_data_safe(self._wakeword_buffer, audio_data.copy())
+            # 分发给编码器、唤醒词检测、VAD等订阅者
+            self.capture_hub.publish(audio_data)
 
         except Exception as e:
             logger.error(f"输入回调错误: {e}")
 
+    def _encode_captured_frame(self, audio_data: np.ndarray):
+        """
+        录音帧订阅者：实时编码并发送（不走队列，减少延迟）.
+        """
+        callback = self._encoded_audio_callback
+        if not callback or len(audio_data) != AudioConfig.INPUT_FRAME_SIZE:
+            return
+
+        encoded_data = self.opus_encoder.encode(
+            audio_data.astype(np.int16, copy=False).tobytes(),
+            AudioConfig.INPUT_FRAME_SIZE,
+        )
+        if encoded_data:
+            callback(encoded_data)
+
     def _process_input_resampling(self, audio_data):
         """
         输入重采样到16kHz.
         """
         try:
+            if self._clear_input_requested:
+                self._clear_input_requested = False
+                self._resample_input_buffer.clear()
+
             resampled_data = self.input_resampler.resample_chunk(audio_data, last=False)
             if len(resampled_data) > 0:
-                self._resample_input_buffer.extend(resampled_data.astype(np.int16))
+                self._resample_input_buffer.write(resampled_data)
 
-            expected_frame_size = AudioConfig.INPUT_FRAME_SIZE
-            if len(self._resample_input_buffer) < expected_frame_size:
-                return None
-
-            frame_data = []
-            for _ in range(expected_frame_size):
-                frame_data.append(self._resample_input_buffer.popleft())
-
-            return np.array(frame_data, dtype=np.int16)
+            # 数据不足一帧时返回 None
+            return self._resample_input_buffer.read(AudioConfig.INPUT_FRAME_SIZE)
 
         except Exception as e:
             logger.error(f"输入重采样失败: {e}")
             return None
 
-    def _put_audio_data_safe(self, queue, audio_data):
-        """
-        安全入队，队列满时丢弃最旧数据.
-        """
-        try:
-            queue.put_nowait(audio_data)
-        except asyncio.QueueFull:
-            try:
-                queue.get_nowait()
-                queue.put_nowait(audio_data)
-            except asyncio.QueueEmpty:
-                queue.put_nowait(audio_data)
-
     def _output_callback(self, outdata: np.ndarray, frames: int, time_info, status):
         """
         播放回调，硬件驱动调用 从播放队列取数据输出到扬声器.
@@ -316,59 +350,54 @@ class AudioCodec:
             logger.error(f"输出回调错误: {e}")
             outdata.fill(0)
 
+        if self._internal_reference_aec:
+            # 实际送往扬声器的PCM（含静音）即为回声参考信号
+            self.aec_processor.push_render(outdata.reshape(-1))
+
     def _output_callback_direct(self, outdata: np.ndarray, frames: int):
         """
         直接播放24kHz数据（设备支持24kHz时）
         """
-        try:
-            # 从播放队列获取音频数据
-            audio_data = self._output_buffer.get_nowait()
-
-            if len(audio_data) >= frames:
-                output_frames = audio_data[:frames]
-                outdata[:] = output_frames.reshape(-1, AudioConfig.CHANNELS)
-            else:
-                outdata[: len(audio_data)] = audio_data.reshape(
-                    -1, AudioConfig.CHANNELS
-                )
-                outdata[len(audio_data) :] = 0
-
-        except asyncio.QueueEmpty:
+        # 从播放缓冲区获取音频数据
+        audio_data = self._output_buffer.get()
+        if audio_data is None:
             # 无数据时输出静音
             outdata.fill(0)
+            return
+
+        if len(audio_data) >= frames:
+            output_frames = audio_data[:frames]
+            outdata[:] = output_frames.reshape(-1, AudioConfig.CHANNELS)
+        else:
+            outdata[: len(audio_data)] = audio_data.reshape(-1, AudioConfig.CHANNELS)
+            outdata[len(audio_data) :] = 0
 
     def _output_callback_with_resample(self, outdata: np.ndarray, frames: int):
         """
         重采样播放（24kHz -> 设备采样率）
         """
         try:
-            # 持续处理24kHz数据进行重采样
-            while len(self._resample_output_buffer) < frames:
-                try:
-                    audio_data = self._output_buffer.get_nowait()
+            required = frames * AudioConfig.CHANNELS
 
-                    # 24kHz -> 设备采样率重采样
-                    resampled_data = self.output_resampler.resample_chunk(
-                        audio_data, last=False
-                    )
-                    if len(resampled_data) > 0:
-                        self._resample_output_buffer.extend(
-                            resampled_data.astype(np.int16)
-                        )
+            if self._clear_output_requested:
+                self._clear_output_requested = False
+                self._resample_output_buffer.clear()
 
-                except asyncio.QueueEmpty:
+            # 持续处理24kHz数据进行重采样
+            while self._resample_output_buffer.available() < required:
+                audio_data = self._output_buffer.get()
+                if audio_data is None:
                     break
 
-            # 从重采样缓冲区取数据
-            if len(self._resample_output_buffer) >= frames:
-                frame_data = []
-                for _ in range(frames):
-                    frame_data.append(self._resample_output_buffer.popleft())
+                # 24kHz -> 设备采样率重采样
+                resampled_data = self.output_resampler.resample_chunk(
+                    audio_data, last=False
+                )
+                if len(resampled_data) > 0:
+                    self._resample_output_buffer.write(resampled_data)
 
-                output_array = np.array(frame_data, dtype=np.int16)
-                outdata[:] = output_array.reshape(-1, AudioConfig.CHANNELS)
-            else:
-                # 数据不足时输出静音
+            # 从重采样缓冲区直接拷贝到输出缓冲区，数据不足时输出静音
+            if not self._resample_output_buffer.read_into(outdata.reshape(-1)):
                 outdata.fill(0)
 
         except Exception as e:
@@ -456,28 +485,25 @@ class AudioCodec:
             else:
                 raise
 
-    async def get_raw_audio_for_detection(self) -> Optional[bytes]:
-        """
-        获取唤醒词音频数据.
-        """
-        try:
-            if self._wakeword_buffer.empty():
-                return None
+    def add_audio_listener(self, listener, name: Optional[str] = None):
+        """添加录音帧监听者（订阅 capture_hub）.
 
-            audio_data = self._wakeword_buffer.get_nowait()
+        监听者在录音回调线程中被调用，参数为16kHz单声道int16帧的只读视图，
+        必须快速返回，耗时处理应投递到自己的线程.
+        """
+        self.capture_hub.subscribe(listener, name)
 
-            if hasattr(audio_data, "tobytes"):
-                return audio_data.tobytes()
-            elif hasattr(audio_data, "astype"):
-                return audio_data.astype("int16").tobytes()
-            else:
-                return audio_data
+    def remove_audio_listener(self, listener):
+        """
+        移除录音帧监听者.
+        """
+        self.capture_hub.unsubscribe(listener)
 
-        except asyncio.QueueEmpty:
-            return None
-        except Exception as e:
-            logger.error(f"获取唤醒词音频数据失败: {e}")
-            return None
+    def get_capture_stats(self) -> dict:
+        """
+        获取录音帧分发统计信息.
+        """
+        return self.capture_hub.get_stats()
 
     def set_encoded_audio_callback(self, callback):
         """
@@ -490,6 +516,30 @@ class AudioCodec:
         else:
             logger.info("禁用编码回调")
 
+    def _start_internal_reference_aec(self):
+        """
+        启动本机播放参考信号的软件AEC（AEC_OPTIONS.MODE = internal）.
+        """
+        if not self.aec_processor.uses_internal_reference:
+            return
+
+        # 输入输出流延迟之和作为初始回声延迟，运行中由互相关估计修正
+        latency_sec = 0.0
+        for stream in (self.input_stream, self.output_stream):
+            if stream is not None:
+                latency_sec += float(stream.latency)
+
+        self.aec_processor.start_internal_reference(
+            render_sample_rate=(
+                self.device_output_sample_rate
+                if self.output_resampler is not None
+                else AudioConfig.OUTPUT_SAMPLE_RATE
+            ),
+            sink=self.capture_hub.publish,
+            stream_latency_ms=int(latency_sec * 1000),
+        )
+        self._internal_reference_aec = True
+
     def is_aec_enabled(self) -> bool:
         """
         检查AEC是否启用.
@@ -533,10 +583,128 @@ class AudioCodec:
         logger.info(f"AEC状态: {'启用' if self._aec_enabled else '禁用'}")
         return self._aec_enabled
 
+    def enqueue_audio(self, opus_data: bytes):
+        """
+        提交一个待播放的Opus包（事件循环中调用），由解码协程按序解码.
+        """
+        self._last_packet_at = time.monotonic()
+        self._decode_idle.clear()
+        try:
+            self._decode_queue.put_nowait(opus_data)
+        except asyncio.QueueFull:
+            # 队列满时丢弃最旧的包
+            try:
+                self._decode_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+            self._decode_queue.put_nowait(opus_data)
+
+    async def _decode_worker(self):
+        """
+        播放解码协程：保证解码顺序与接收顺序一致.
+        """
+        while True:
+            opus_data = await self._decode_queue.get()
+            try:
+                self._handle_incoming_packet(opus_data)
+            finally:
+                if self._decode_queue.empty():
+                    self._decode_idle.set()
+
+    def _handle_incoming_packet(self, opus_data: bytes):
+        """
+        解码一个收到的包，空包作为丢包标记.
+        """
+        if self.opus_decoder is None:
+            return
+        if not opus_data:
+            # 丢包标记，等下一个包到达后再补偿（以便使用其中的FEC数据）
+            self._pending_lost_frames += 1
+            return
+        if self._pending_lost_frames:
+            self._conceal_lost_frames(opus_data)
+        self._decode_packet(opus_data)
+
+    def _conceal_lost_frames(self, next_packet: bytes):
+        """
+        补偿丢失的帧：最后一帧用下一个包携带的FEC数据恢复，其余帧使用PLC.
+        """
+        lost = min(self._pending_lost_frames, self._max_concealed_frames)
+        self._pending_lost_frames = 0
+
+        for _ in range(lost - 1):
+            if self._decode_concealed(b"", decode_fec=False):
+                self._plc_frames += 1
+
+        if self._decode_concealed(next_packet, decode_fec=True):
+            self._fec_frames += 1
+        elif self._decode_concealed(b"", decode_fec=False):
+            self._plc_frames += 1
+
+    def _decode_concealed(self, opus_data: bytes, decode_fec: bool) -> bool:
+        """
+        解码补偿帧（空数据触发PLC），成功时放入播放缓冲区.
+        """
+        try:
+            pcm_data = self.opus_decoder.decode(
+                opus_data, AudioConfig.OUTPUT_FRAME_SIZE, decode_fec=decode_fec
+            )
+        except opuslib.OpusError:
+            return False
+        audio_array = np.frombuffer(pcm_data, dtype=np.int16)
+        if len(audio_array) != AudioConfig.OUTPUT_FRAME_SIZE * AudioConfig.CHANNELS:
+            return False
+        self._output_buffer.put(audio_array)
+        return True
+
+    def get_decode_stats(self) -> dict:
+        """
+        获取播放解码统计（丢包补偿等）.
+        """
+        return {
+            "plc_frames": self._plc_frames,
+            "fec_frames": self._fec_frames,
+            "decode_errors": self._decode_errors,
+            "decode_backlog": self._decode_queue.qsize(),
+        }
+
+    async def wait_for_incoming_idle(
+        self, silence_sec: float, timeout: float
+    ) -> bool:
+        """等待播放数据流进入静默：已收到的包全部解码完且最近 silence_sec 秒内没有新包.
+
+        Returns:
+            是否在超时前进入静默
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            # 由解码协程在处理完队列后通知，而不是按入队时间推测
+            try:
+                await asyncio.wait_for(
+                    self._decode_idle.wait(), max(deadline - time.monotonic(), 0)
+                )
+            except asyncio.TimeoutError:
+                return False
+
+            # 静默窗口内到达的新包会清除事件，窗口结束后重新确认
+            now = time.monotonic()
+            quiet_remaining = self._last_packet_at + silence_sec - now
+            if quiet_remaining <= 0 and self._decode_idle.is_set():
+                return True
+            if now >= deadline:
+                return False
+            await asyncio.sleep(min(max(quiet_remaining, 0), deadline - now))
+
     async def write_audio(self, opus_data: bytes):
         """
         解码音频并播放 网络接收的Opus数据 -> 解码24kHz -> 播放队列.
         """
+        self._decode_packet(opus_data)
+
+    def _decode_packet(self, opus_data: bytes):
+        """
+        解码单个Opus包并放入播放缓冲区.
+        """
         try:
             # Opus解码为24kHz PCM数据
             pcm_data = self.opus_decoder.decode(
@@ -552,11 +720,15 @@ class AudioCodec:
                 )
                 return
 
-            # 放入播放队列
-            self._put_audio_data_safe(self._output_buffer, audio_array)
+            # 放入播放缓冲区
+            self._output_buffer.put(audio_array)
 
         except opuslib.OpusError as e:
-            logger.warning(f"Opus解码失败，丢弃此帧: {e}")
+            # 损坏的帧用PLC补偿，避免出现空洞
+            self._decode_errors += 1
+            if self._decode_concealed(b"", decode_fec=False):
+                self._plc_frames += 1
+            logger.warning(f"Opus解码失败，使用丢包补偿: {e}")
         except Exception as e:
             logger.warning(f"音频写入失败，丢弃此帧: {e}")
 
@@ -564,43 +736,44 @@ class AudioCodec:
         """
         等待播放完成.
         """
-        start = time.time()
-
-        while not self._output_buffer.empty() and time.time() - start < timeout:
-            await asyncio.sleep(0.05)
+        # 数据流结束，不足目标深度的剩余帧也立即播放
+        self._output_buffer.flush()
+        drained = await self._output_buffer.wait_drained(timeout)
 
+        # 等待声卡缓冲中的尾音播放完
         await asyncio.sleep(0.3)
 
-        if not self._output_buffer.empty():
-            output_remaining = self._output_buffer.qsize()
+        if not drained:
+            output_remaining = self._output_buffer.occupancy()
             logger.warning(f"音频播放超时，剩余队列 - 输出: {output_remaining} 帧")
 
+    def get_playback_stats(self) -> dict:
+        """
+        获取播放缓冲区统计信息.
+        """
+        return self._output_buffer.get_stats()
+
     async def clear_audio_queue(self):
         """
         清空音频队列.
         """
         cleared_count = 0
 
-        queues_to_clear = [
-            self._wakeword_buffer,
-            self._output_buffer,
-        ]
-
-        for queue in queues_to_clear:
-            while not queue.empty():
-                try:
-                    queue.get_nowait()
-                    cleared_count += 1
-                except asyncio.QueueEmpty:
-                    break
+        while not self._decode_queue.empty():
+            try:
+                self._decode_queue.get_nowait()
+                cleared_count += 1
+            except asyncio.QueueEmpty:
+                break
+        self._pending_lost_frames = 0
+        self._decode_idle.set()
 
-        if self._resample_input_buffer:
-            cleared_count += len(self._resample_input_buffer)
-            self._resample_input_buffer.clear()
+        cleared_count += self._output_buffer.clear()
 
-        if self._resample_output_buffer:
-            cleared_count += len(self._resample_output_buffer)
-            self._resample_output_buffer.clear()
+        # 重采样缓冲区不能在事件循环线程清空（会与回调线程的读指针更新竞争），
+        # 交给回调线程在下次回调开始时清空
+        self._clear_input_requested = self._resample_input_buffer is not None
+        self._clear_output_requested = self._resample_output_buffer is not None
 
         if cleared_count > 0:
             logger.info(f"清空音频队列，丢弃 {cleared_count} 帧音频数据")
@@ -671,6 +844,14 @@ class AudioCodec:
         logger.info("开始关闭音频编解码器...")
 
         try:
+            if self._decode_task and not self._decode_task.done():
+                self._decode_task.cancel()
+                try:
+                    await self._decode_task
+                except asyncio.CancelledError:
+                    pass
+            self._decode_task = None
+
             await self.clear_audio_queue()
 
             if self.input_stream:
@@ -696,10 +877,11 @@ class AudioCodec:
             self.input_resampler = None
             self.output_resampler = None
 
-            self._resample_input_buffer.clear()
-            self._resample_output_buffer.clear()
+            self._resample_input_buffer = None
+            self._resample_output_buffer = None
 
             # 关闭AEC处理器
+            self._internal_reference_aec = False
             if self.aec_processor:
                 try:
                     await self.aec_processor.close()
@@ -0,0 +1,103 @@
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+CaptureListener = Callable[[np.ndarray], None]
+
+
+class _Subscription:
+    __slots__ = ("name", "callback", "calls", "errors", "busy_seconds")
+
+    def __init__(self, name: str, callback: CaptureListener):
+        self.name = name
+        self.callback = callback
+        self.calls = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+
+
+class CaptureHub:
+    """
+    录音帧分发中心
+    AudioCodec 唯一的录音流产出16kHz单声道int16帧后，在录音回调线程中分发给所有订阅者
+    （Opus编码、唤醒词、VAD、录音器等）。每帧只持有一份数据，订阅者拿到的是同一数组的
+    只读视图（零拷贝）；帧数组不会被复用，订阅者可以把它投递到自己的线程继续使用。
+
+    订阅者在录音回调线程中执行，必须快速返回，耗时处理应投递到自己的线程。
+    """
+
+    def __init__(self):
+        # 复制后替换（copy-on-write），录音回调线程遍历期间无需加锁
+        self._subscriptions: List[_Subscription] = []
+        self.frames = 0
+
+    def subscribe(self, callback: CaptureListener, name: Optional[str] = None):
+        """订阅录音帧.
+
+        Args:
+            callback: 以只读的16kHz int16帧调用
+            name: 统计信息中显示的名称，默认取回调的限定名
+        """
+        if any(sub.callback == callback for sub in self._subscriptions):
+            return
+        name = name or getattr(callback, "__qualname__", repr(callback))
+        self._subscriptions = self._subscriptions + [_Subscription(name, callback)]
+        logger.debug(f"录音帧订阅者已添加: {name}")
+
+    def unsubscribe(self, callback: CaptureListener):
+        """
+        取消订阅录音帧.
+        """
+        self._subscriptions = [
+            sub for sub in self._subscriptions if sub.callback != callback
+        ]
+
+    def has_subscribers(self) -> bool:
+        return bool(self._subscriptions)
+
+    def publish(self, frame: np.ndarray):
+        """
+        在录音回调线程中分发一帧，单个订阅者出错不影响其他订阅者.
+        """
+        self.frames += 1
+        subscriptions = self._subscriptions
+        if not subscriptions:
+            return
+
+        view = frame.view()
+        view.flags.writeable = False
+
+        for sub in subscriptions:
+            start = time.perf_counter()
+            try:
+                sub.callback(view)
+            except Exception as e:
+                sub.errors += 1
+                logger.warning(f"录音帧订阅者 {sub.name} 处理失败: {e}")
+            sub.calls += 1
+            sub.busy_seconds += time.perf_counter() - start
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取分发统计信息（每个订阅者的调用次数、错误次数和平均耗时）.
+        """
+        return {
+            "frames": self.frames,
+            "subscribers": {
+                sub.name: {
+                    "calls": sub.calls,
+                    "errors": sub.errors,
+                    "avg_us": (
+                        round(sub.busy_seconds / sub.calls * 1e6, 1)
+                        if sub.calls
+                        else 0.0
+                    ),
+                }
+                for sub in self._subscriptions
+            },
+        }
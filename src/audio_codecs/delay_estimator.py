@@ -0,0 +1,105 @@
+from typing import List, Optional
+
+import numpy as np
+
+
+class DelayEstimator:
+    """
+    回声延迟估计器（GCC-PHAT互相关）
+    持续记录最近一段送入APM的参考信号与麦克风信号，估计回声相对参考信号的延迟，
+    用于设置 APM 的 stream delay。只在参考信号有足够能量时给出估计，结果取最近几次的中位数。
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        window_sec: float = 1.0,
+        max_delay_ms: float = 500.0,
+        min_rms: float = 100.0,
+        min_confidence: float = 10.0,
+        history: int = 5,
+    ):
+        """
+        Args:
+            sample_rate: 采样率
+            window_sec: 参与互相关的历史窗口长度（秒）
+            max_delay_ms: 搜索的最大延迟
+            min_rms: 参考信号RMS低于该值时不估计（扬声器基本静音）
+            min_confidence: 互相关峰值与平均幅度之比的下限
+            history: 取中位数的估计次数
+        """
+        self.sample_rate = sample_rate
+        self._window = int(sample_rate * window_sec)
+        self._max_lag = min(int(sample_rate * max_delay_ms / 1000), self._window - 1)
+        self._min_rms = min_rms
+        self._min_confidence = min_confidence
+        self._history_size = max(1, history)
+
+        self._render = np.zeros(self._window, dtype=np.float32)
+        self._capture = np.zeros(self._window, dtype=np.float32)
+        self._pos = 0
+        self._filled = 0
+        self._fft_size = 1 << int(np.ceil(np.log2(self._window * 2)))
+
+        self._estimates: List[float] = []
+        self.delay_ms: Optional[float] = None
+        self.confidence = 0.0
+
+    def reset(self):
+        self._pos = 0
+        self._filled = 0
+        self._estimates.clear()
+        self.delay_ms = None
+        self.confidence = 0.0
+
+    def update(self, render: np.ndarray, capture: np.ndarray):
+        """
+        追加一帧已对齐的参考信号与麦克风信号（长度相同）.
+        """
+        count = len(render)
+        end = self._pos + count
+        if end <= self._window:
+            self._render[self._pos : end] = render
+            self._capture[self._pos : end] = capture
+        else:
+            first = self._window - self._pos
+            self._render[self._pos :] = render[:first]
+            self._capture[self._pos :] = capture[:first]
+            self._render[: count - first] = render[first:]
+            self._capture[: count - first] = capture[first:]
+        self._pos = end % self._window
+        self._filled = min(self._window, self._filled + count)
+
+    def estimate(self) -> Optional[float]:
+        """估计当前回声延迟（毫秒）.
+
+        Returns:
+            平滑后的延迟，数据不足或参考信号过弱时返回上一次的结果
+        """
+        if self._filled < self._window:
+            return self.delay_ms
+
+        # 按时间顺序展开环形历史
+        render = np.roll(self._render, -self._pos)
+        capture = np.roll(self._capture, -self._pos)
+
+        if np.sqrt(np.mean(render * render)) < self._min_rms:
+            return self.delay_ms
+
+        render_spec = np.fft.rfft(render, self._fft_size)
+        capture_spec = np.fft.rfft(capture, self._fft_size)
+        cross = capture_spec * np.conj(render_spec)
+        cross /= np.abs(cross) + 1e-9
+        correlation = np.abs(np.fft.irfft(cross, self._fft_size)[: self._max_lag + 1])
+
+        lag = int(np.argmax(correlation))
+        confidence = float(correlation[lag] / (np.mean(correlation) + 1e-9))
+        self.confidence = confidence
+        if confidence < self._min_confidence:
+            return self.delay_ms
+
+        self._estimates.append(lag * 1000.0 / self.sample_rate)
+        if len(self._estimates) > self._history_size:
+            self._estimates.pop(0)
+        self.delay_ms = float(np.median(self._estimates))
+        return self.delay_ms
@@ -0,0 +1,122 @@
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from src.audio_codecs.ring_buffer import AudioRingBuffer
+
+
+class DriftCompensator:
+    """
+    参考信号时钟漂移补偿
+    参考信号与麦克风来自不同的时钟（不同声卡/虚拟设备），长时间运行后缓冲区水位会缓慢
+    上涨或下降，导致回声延迟漂移。这里在消费端按固定帧长读取，跟踪水位的平滑值，
+    偏离稳态水位超过容差时每隔若干帧增删一个采样，使延迟保持稳定而不产生跳变。
+    水位超过上限（例如参考流卡顿后突发写入）时才整段丢弃重新同步。
+    """
+
+    def __init__(
+        self,
+        buffer: AudioRingBuffer,
+        tolerance: int,
+        max_level: int,
+        warmup_frames: int = 50,
+        adjust_interval: int = 10,
+        smoothing: float = 0.02,
+    ):
+        """
+        Args:
+            buffer: 参考信号环形缓冲区（生产者为参考信号回调线程）
+            tolerance: 水位偏离稳态的容差（采样数）
+            max_level: 水位上限，超过后丢弃旧数据重新同步
+            warmup_frames: 预热帧数，预热结束时的平滑水位作为稳态水位
+            adjust_interval: 两次增删采样之间至少间隔的帧数
+            smoothing: 水位指数平滑系数
+        """
+        self._buffer = buffer
+        self._tolerance = tolerance
+        self._max_level = max_level
+        self._warmup_frames = warmup_frames
+        self._adjust_interval = max(1, adjust_interval)
+        self._smoothing = smoothing
+
+        self._level: Optional[float] = None
+        self._target: Optional[float] = None
+        self._frames = 0
+        self._since_adjust = 0
+
+        # 统计信息
+        self.dropped_samples = 0
+        self.inserted_samples = 0
+        self.resyncs = 0
+        self.underruns = 0
+
+    def reset(self):
+        """
+        重新测量稳态水位（例如参考流重建后）.
+        """
+        self._level = None
+        self._target = None
+        self._frames = 0
+        self._since_adjust = 0
+
+    def read_into(self, out: np.ndarray) -> bool:
+        """读取一帧到 out，必要时增删一个采样.
+
+        Returns:
+            数据不足时返回 False（out 未修改）
+        """
+        frame_size = len(out)
+        available = self._buffer.available()
+
+        if available > self._max_level:
+            # 突发积压：丢弃到稳态水位（未知时丢到一帧），重新同步
+            keep = int(self._target) if self._target is not None else frame_size
+            self._buffer.skip(available - max(keep, frame_size))
+            self.resyncs += 1
+            available = self._buffer.available()
+            self._level = float(available)
+
+        if available < frame_size:
+            self.underruns += 1
+            return False
+
+        self._level = (
+            float(available)
+            if self._level is None
+            else self._level + self._smoothing * (available - self._level)
+        )
+        self._frames += 1
+        self._since_adjust += 1
+        if self._target is None:
+            if self._frames >= self._warmup_frames:
+                self._target = self._level
+            return self._buffer.read_into(out)
+
+        if self._since_adjust >= self._adjust_interval:
+            drift = self._level - self._target
+            if drift > self._tolerance and available > frame_size:
+                # 参考时钟偏快：多消费一个采样
+                self._buffer.skip(1)
+                self.dropped_samples += 1
+                self._since_adjust = 0
+            elif drift < -self._tolerance and frame_size > 1:
+                # 参考时钟偏慢：少消费一个采样，末尾重复上一个采样
+                self._buffer.read_into(out[:-1])
+                out[-1] = out[-2]
+                self.inserted_samples += 1
+                self._since_adjust = 0
+                return True
+
+        return self._buffer.read_into(out)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "level": round(self._level, 1) if self._level is not None else None,
+            "target_level": (
+                round(self._target, 1) if self._target is not None else None
+            ),
+            "dropped_samples": self.dropped_samples,
+            "inserted_samples": self.inserted_samples,
+            "resyncs": self.resyncs,
+            "underruns": self.underruns,
+        }
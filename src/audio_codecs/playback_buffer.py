@@ -0,0 +1,197 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+
+class PlaybackBuffer:
+    """
+    跨线程播放抖动缓冲区
+    事件循环侧调用 put() 写入PCM帧，声卡驱动线程在输出回调中调用 get() 取帧。
+    只使用一把普通线程锁，不依赖非线程安全的 asyncio.Queue。
+
+    - 目标深度：欠载后需重新积累 target_depth 帧才恢复播放，吸收网络抖动
+    - 统计：占用帧数、欠载/溢出次数
+    - 排空信号：缓冲区被取空时通过 call_soon_threadsafe 通知事件循环
+    """
+
+    def __init__(
+        self,
+        max_frames: int = 500,
+        target_depth: int = 0,
+        prime_timeout: float = 0.1,
+    ):
+        self._frames = deque()
+        self._lock = threading.Lock()
+        self._max_frames = max_frames
+        self._target_depth = max(0, target_depth)
+        # 等待积累目标深度的最长时间，避免句尾不足目标深度的帧一直不播放
+        self._prime_timeout = prime_timeout
+
+        self._primed = self._target_depth == 0
+        self._pending_since: Optional[float] = None
+        self._playing = False
+        self._end_of_stream = False
+
+        # 统计信息
+        self.underrun_count = 0
+        self.overflow_count = 0
+        self.frames_in = 0
+        self.frames_out = 0
+
+        # 排空信号（仅在事件循环线程上操作）
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._drained = asyncio.Event()
+        self._drained.set()
+
+    def bind_loop(self, loop: asyncio.AbstractEventLoop):
+        """
+        绑定事件循环，用于从驱动线程投递排空信号.
+        """
+        self._loop = loop
+
+    @property
+    def target_depth(self) -> int:
+        return self._target_depth
+
+    def set_target_depth(self, depth: int):
+        with self._lock:
+            self._target_depth = max(0, depth)
+
+    def occupancy(self) -> int:
+        """
+        当前缓冲帧数.
+        """
+        return len(self._frames)
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def empty(self) -> bool:
+        return not self._frames
+
+    # ------------------------------------------------------------------
+    # 事件循环侧
+    # ------------------------------------------------------------------
+
+    def put(self, frame: np.ndarray):
+        """
+        写入一帧PCM数据，缓冲区满时丢弃最旧的帧.
+        """
+        with self._lock:
+            if len(self._frames) >= self._max_frames:
+                self._frames.popleft()
+                self.overflow_count += 1
+            if not self._frames and not self._primed:
+                self._pending_since = time.monotonic()
+            self._frames.append(frame)
+            self._end_of_stream = False
+            self.frames_in += 1
+        self._drained.clear()
+
+    def flush(self):
+        """
+        标记数据流结束，不足目标深度的剩余帧立即开始播放.
+        """
+        with self._lock:
+            self._end_of_stream = True
+            if self._frames:
+                self._primed = True
+
+    def clear(self) -> int:
+        """
+        清空缓冲区，返回丢弃的帧数.
+        """
+        with self._lock:
+            count = len(self._frames)
+            self._frames.clear()
+            self._primed = self._target_depth == 0
+            self._pending_since = None
+            self._playing = False
+        self._drained.set()
+        return count
+
+    async def wait_drained(self, timeout: Optional[float] = None) -> bool:
+        """等待缓冲区被播放完.
+
+        Returns:
+            是否在超时前排空
+        """
+        if self.empty():
+            return True
+        try:
+            await asyncio.wait_for(self._drained.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    # ------------------------------------------------------------------
+    # 驱动线程侧
+    # ------------------------------------------------------------------
+
+    def get(self) -> Optional[np.ndarray]:
+        """
+        取出一帧，无可播放数据时返回 None.
+        """
+        notify = False
+        with self._lock:
+            if not self._primed:
+                if not self._frames:
+                    return None
+                waited = (
+                    self._pending_since is not None
+                    and time.monotonic() - self._pending_since >= self._prime_timeout
+                )
+                if len(self._frames) < self._target_depth and not waited:
+                    return None
+                self._primed = True
+
+            if not self._frames:
+                if self._playing:
+                    # 播放中途断流：记录欠载并重新积累目标深度
+                    if not self._end_of_stream:
+                        self.underrun_count += 1
+                    self._playing = False
+                    self._primed = self._target_depth == 0
+                return None
+
+            frame = self._frames.popleft()
+            self.frames_out += 1
+            self._playing = True
+            if not self._frames:
+                notify = True
+
+        if notify:
+            self._notify_drained()
+        return frame
+
+    def _notify_drained(self):
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            loop.call_soon_threadsafe(self._set_drained)
+        except RuntimeError:
+            # 事件循环已关闭
+            pass
+
+    def _set_drained(self):
+        if not self._frames:
+            self._drained.set()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取缓冲区统计信息.
+        """
+        return {
+            "occupancy": len(self._frames),
+            "target_depth": self._target_depth,
+            "max_frames": self._max_frames,
+            "underruns": self.underrun_count,
+            "overflows": self.overflow_count,
+            "frames_in": self.frames_in,
+            "frames_out": self.frames_out,
+        }
@@ -0,0 +1,297 @@
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+import soxr
+
+from libs.webrtc_apm import as_short_pointer
+from src.audio_codecs.delay_estimator import DelayEstimator
+from src.audio_codecs.drift_compensator import DriftCompensator
+from src.audio_codecs.ring_buffer import AudioRingBuffer
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class ReferenceAEC:
+    """
+    以本机播放PCM为参考信号的软件回声消除
+    播放回调把实际送往扬声器的PCM写入参考缓冲区，录音帧投递到工作线程，
+    工作线程逐帧取出对齐的参考信号，依次执行 ProcessReverseStream / ProcessStream，
+    再把处理后的帧交给输出回调（通常是录音帧分发）。APM 不在录音回调线程中运行。
+
+    不依赖声卡回环或 BlackHole 等虚拟设备；process_frame 可以脱离声卡离线调用。
+    """
+
+    def __init__(
+        self,
+        apm,
+        capture_config,
+        render_config,
+        render_sample_rate: int,
+        sample_rate: int = 16000,
+        frame_size: int = 160,
+        initial_delay_ms: int = 50,
+        estimate_interval_sec: float = 2.0,
+        max_render_backlog_ms: int = 100,
+    ):
+        """
+        Args:
+            apm: WebRTCAudioProcessing 实例（已应用回声消除配置）
+            capture_config: 采集流配置句柄
+            render_config: 参考流配置句柄
+            render_sample_rate: 播放PCM的采样率（声卡输出采样率）
+            sample_rate: APM处理采样率
+            frame_size: 每帧采样数（10ms）
+            initial_delay_ms: 初始stream delay（通常为输入输出流延迟之和）
+            estimate_interval_sec: 延迟估计的间隔
+            max_render_backlog_ms: 参考信号积压上限，超出时丢弃旧数据重新同步
+        """
+        self.apm = apm
+        self.capture_config = capture_config
+        self.render_config = render_config
+        self.sample_rate = sample_rate
+        self.frame_size = frame_size
+        self.render_sample_rate = render_sample_rate
+
+        # 参考信号：播放线程写入（声卡采样率），工作线程读取
+        self._render_buffer = AudioRingBuffer(render_sample_rate)
+        self._render_chunk = np.zeros(render_sample_rate // 100, dtype=np.int16)
+        # 播放与录音时钟漂移补偿，积压超过上限时重新同步
+        self._render_reader = DriftCompensator(
+            self._render_buffer,
+            tolerance=render_sample_rate // 500,  # 2ms
+            max_level=render_sample_rate * max_render_backlog_ms // 1000,
+        )
+        self._render_resampler = None
+        self._render_16k = None
+        if render_sample_rate != sample_rate:
+            self._render_resampler = soxr.ResampleStream(
+                render_sample_rate, sample_rate, 1, dtype="int16", quality="QQ"
+            )
+            self._render_16k = AudioRingBuffer(sample_rate)
+
+        # APM输入输出缓冲区：预分配复用
+        self._capture_in = np.zeros(frame_size, dtype=np.int16)
+        self._capture_out = np.zeros(frame_size, dtype=np.int16)
+        self._render_in = np.zeros(frame_size, dtype=np.int16)
+        self._render_out = np.zeros(frame_size, dtype=np.int16)
+        self._capture_in_ptr = as_short_pointer(self._capture_in)
+        self._capture_out_ptr = as_short_pointer(self._capture_out)
+        self._render_in_ptr = as_short_pointer(self._render_in)
+        self._render_out_ptr = as_short_pointer(self._render_out)
+
+        # 延迟估计
+        self._delay_estimator = DelayEstimator(sample_rate=sample_rate)
+        self._estimate_every = max(1, int(estimate_interval_sec * sample_rate / frame_size))
+        self._frames_since_estimate = 0
+        self.stream_delay_ms = int(initial_delay_ms)
+        self.apm.set_stream_delay_ms(self.stream_delay_ms)
+
+        # 工作线程
+        self._sink: Optional[Callable[[np.ndarray], None]] = None
+        self._capture_queue: "queue.Queue" = queue.Queue(maxsize=50)
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+        # 统计信息
+        self.frames_processed = 0
+        self.frames_bypassed = 0
+        self.capture_dropped = 0
+        self.apm_errors = 0
+        self._busy_seconds = 0.0
+
+    # ------------------------------------------------------------------
+    # 生命周期
+    # ------------------------------------------------------------------
+
+    def set_output(self, sink: Callable[[np.ndarray], None]):
+        """
+        设置处理后帧的去向（在工作线程中调用）.
+        """
+        self._sink = sink
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._worker_loop, name="ReferenceAEC", daemon=True
+        )
+        self._thread.start()
+        logger.info(
+            f"软件回声消除已启动，参考信号采样率: {self.render_sample_rate}Hz，"
+            f"初始延迟: {self.stream_delay_ms}ms"
+        )
+
+    def stop(self, timeout: float = 1.0):
+        self._running = False
+        if self._thread and self._thread.is_alive():
+            try:
+                self._capture_queue.put_nowait(None)
+            except queue.Full:
+                pass
+            self._thread.join(timeout)
+        self._thread = None
+        logger.info("软件回声消除已停止")
+
+    def is_running(self) -> bool:
+        return self._running and self._thread is not None and self._thread.is_alive()
+
+    # ------------------------------------------------------------------
+    # 音频线程接口
+    # ------------------------------------------------------------------
+
+    def push_render(self, pcm: np.ndarray):
+        """
+        播放回调线程调用：记录实际送往扬声器的PCM（含静音）.
+        """
+        self._render_buffer.write(pcm)
+
+    def submit_capture(self, frame: np.ndarray, process: bool = True):
+        """录音回调线程调用：投递一帧16kHz录音，非阻塞.
+
+        Args:
+            frame: 16kHz单声道int16帧
+            process: False 时直接透传（AEC被临时关闭），仍经工作线程以保持输出顺序
+        """
+        item = (frame, process)
+        try:
+            self._capture_queue.put_nowait(item)
+        except queue.Full:
+            try:
+                self._capture_queue.get_nowait()
+                self.capture_dropped += 1
+            except queue.Empty:
+                pass
+            try:
+                self._capture_queue.put_nowait(item)
+            except queue.Full:
+                self.capture_dropped += 1
+
+    def _worker_loop(self):
+        while self._running:
+            item = self._capture_queue.get()
+            if item is None:
+                break
+
+            frame, process = item
+            try:
+                if process and len(frame) == self.frame_size:
+                    output = self.process_frame(frame)
+                else:
+                    # 透传时仍消费参考信号，保持参考与录音的相对位置
+                    self._next_render_frame()
+                    self.frames_bypassed += 1
+                    output = frame
+            except Exception as e:
+                self.apm_errors += 1
+                logger.warning(f"软件回声消除处理失败，使用原始音频: {e}")
+                output = frame
+
+            sink = self._sink
+            if sink is not None:
+                try:
+                    sink(output)
+                except Exception as e:
+                    logger.warning(f"回声消除输出回调失败: {e}")
+
+    # ------------------------------------------------------------------
+    # 处理
+    # ------------------------------------------------------------------
+
+    def process_frame(self, capture: np.ndarray) -> np.ndarray:
+        """对一帧录音执行回声消除（同步，可离线调用）.
+
+        Args:
+            capture: 16kHz单声道int16帧，长度为 frame_size
+
+        Returns:
+            处理后的帧（新数组，可被下游持有）
+        """
+        start = time.perf_counter()
+        self._next_render_frame()
+        np.copyto(self._capture_in, capture, casting="unsafe")
+
+        self._delay_estimator.update(self._render_in, self._capture_in)
+        self._frames_since_estimate += 1
+        if self._frames_since_estimate >= self._estimate_every:
+            self._frames_since_estimate = 0
+            self._update_stream_delay()
+
+        self.apm.set_stream_delay_ms(self.stream_delay_ms)
+        render_result = self.apm.process_reverse_stream(
+            self._render_in_ptr, self.render_config, self.render_config, self._render_out_ptr
+        )
+        if render_result != 0:
+            self.apm_errors += 1
+
+        capture_result = self.apm.process_stream(
+            self._capture_in_ptr, self.capture_config, self.capture_config, self._capture_out_ptr
+        )
+        self.frames_processed += 1
+        self._busy_seconds += time.perf_counter() - start
+        if capture_result != 0:
+            self.apm_errors += 1
+            return np.array(capture, dtype=np.int16)
+
+        return self._capture_out.copy()
+
+    def _next_render_frame(self):
+        """
+        取出与当前录音帧对齐的10ms参考信号（16kHz）写入 _render_in.
+        """
+        if self._render_resampler is None:
+            if not self._render_reader.read_into(self._render_in):
+                self._render_in.fill(0)
+            return
+
+        while self._render_16k.available() < self.frame_size:
+            if self._render_reader.read_into(self._render_chunk):
+                chunk = self._render_chunk
+            else:
+                # 播放端无数据（例如播放流未启动），以静音推进参考时钟
+                chunk = np.zeros(len(self._render_chunk), dtype=np.int16)
+            resampled = self._render_resampler.resample_chunk(chunk, last=False)
+            if len(resampled):
+                self._render_16k.write(resampled)
+
+        self._render_16k.read_into(self._render_in)
+
+    def _update_stream_delay(self):
+        delay_ms = self._delay_estimator.estimate()
+        if delay_ms is None:
+            return
+        delay_ms = int(round(delay_ms))
+        if abs(delay_ms - self.stream_delay_ms) >= 5:
+            logger.info(
+                f"回声延迟估计: {self.stream_delay_ms}ms -> {delay_ms}ms "
+                f"(置信度 {self._delay_estimator.confidence:.1f})"
+            )
+            self.stream_delay_ms = delay_ms
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取运行统计信息.
+        """
+        return {
+            "running": self.is_running(),
+            "stream_delay_ms": self.stream_delay_ms,
+            "delay_confidence": round(self._delay_estimator.confidence, 1),
+            "frames_processed": self.frames_processed,
+            "frames_bypassed": self.frames_bypassed,
+            "capture_backlog": self._capture_queue.qsize(),
+            "capture_dropped": self.capture_dropped,
+            "render_backlog_ms": round(
+                self._render_buffer.available() * 1000 / self.render_sample_rate, 1
+            ),
+            "render_drift": self._render_reader.get_stats(),
+            "apm_errors": self.apm_errors,
+            "avg_process_us": (
+                round(self._busy_seconds / self.frames_processed * 1e6, 1)
+                if self.frames_processed
+                else 0.0
+            ),
+        }
@@ -0,0 +1,134 @@
+from typing import Optional
+
+import numpy as np
+
+
+class AudioRingBuffer:
+    """
+    单生产者/单消费者环形缓冲区（无锁）
+    基于预分配的NumPy数组，读写均为切片批量拷贝，没有逐采样的Python操作。
+    生产者线程只修改写指针，消费者线程只修改读指针，依靠GIL保证指针赋值的原子性。
+    """
+
+    def __init__(self, capacity: int, dtype=np.int16):
+        if capacity <= 0:
+            raise ValueError(f"缓冲区容量必须大于0: {capacity}")
+
+        self._capacity = int(capacity)
+        self._dtype = np.dtype(dtype)
+        self._buffer = np.zeros(self._capacity, dtype=self._dtype)
+
+        # 读写指针单调递增，取模得到实际位置
+        self._read_pos = 0  # 仅消费者修改
+        self._write_pos = 0  # 仅生产者修改
+
+        # 因缓冲区满而丢弃的采样数
+        self.overflow_samples = 0
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._dtype
+
+    def available(self) -> int:
+        """
+        可读采样数.
+        """
+        return self._write_pos - self._read_pos
+
+    def free_space(self) -> int:
+        """
+        可写采样数.
+        """
+        return self._capacity - (self._write_pos - self._read_pos)
+
+    def __len__(self) -> int:
+        return self.available()
+
+    def __bool__(self) -> bool:
+        return self.available() > 0
+
+    # ------------------------------------------------------------------
+    # 生产者接口
+    # ------------------------------------------------------------------
+
+    def write(self, data: np.ndarray) -> int:
+        """写入数据（生产者调用），缓冲区满时丢弃超出部分.
+
+        Args:
+            data: 一维音频数据
+
+        Returns:
+            实际写入的采样数
+        """
+        data = np.asarray(data, dtype=self._dtype).reshape(-1)
+        count = len(data)
+        space = self.free_space()
+        if count > space:
+            self.overflow_samples += count - space
+            count = space
+        if count <= 0:
+            return 0
+
+        start = self._write_pos % self._capacity
+        first = min(count, self._capacity - start)
+        self._buffer[start : start + first] = data[:first]
+        if count > first:
+            self._buffer[: count - first] = data[first:count]
+
+        # 数据拷贝完成后再发布写指针
+        self._write_pos += count
+        return count
+
+    # ------------------------------------------------------------------
+    # 消费者接口
+    # ------------------------------------------------------------------
+
+    def read_into(self, out: np.ndarray) -> bool:
+        """读取 len(out) 个采样到目标数组（消费者调用）.
+
+        Args:
+            out: 可写的一维数组（可以是 outdata[:, 0] 这样的视图）
+
+        Returns:
+            数据不足时返回 False 且不消耗任何数据
+        """
+        count = len(out)
+        if self.available() < count:
+            return False
+
+        start = self._read_pos % self._capacity
+        first = min(count, self._capacity - start)
+        out[:first] = self._buffer[start : start + first]
+        if count > first:
+            out[first:] = self._buffer[: count - first]
+
+        self._read_pos += count
+        return True
+
+    def read(self, count: int) -> Optional[np.ndarray]:
+        """
+        读取指定数量的采样，数据不足时返回 None.
+        """
+        if self.available() < count:
+            return None
+        out = np.empty(count, dtype=self._dtype)
+        self.read_into(out)
+        return out
+
+    def skip(self, count: int) -> int:
+        """
+        丢弃最旧的采样（消费者调用），返回实际丢弃数量.
+        """
+        count = max(0, min(count, self.available()))
+        self._read_pos += count
+        return count
+
+    def clear(self) -> int:
+        """
+        清空缓冲区（消费者调用），返回丢弃的采样数.
+        """
+        return self.skip(self.available())
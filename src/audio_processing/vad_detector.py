@@ -1,20 +1,20 @@
-import logging
-import threading
-import time
+import asyncio
 
 import numpy as np
-import pyaudio
 import webrtcvad
 
-from src.constants.constants import AbortReason, DeviceState
+from src.constants.constants import AbortReason, AudioConfig, DeviceState
+from src.utils.logging_config import get_logger
 
-# 配置日志
-logger = logging.getLogger("VADDetector")
+logger = get_logger(__name__)
 
 
 class VADDetector:
     """
     基于WebRTC VAD的语音活动检测器，用于检测用户打断.
+
+    订阅 AudioCodec 的录音帧分发（capture_hub），与编码、唤醒词共享同一路麦克风流，
+    每到一帧即检测一次（事件驱动），不再单独打开输入设备或轮询.
     """
 
     def __init__(self, audio_codec, protocol, app_instance, loop):
@@ -36,7 +36,7 @@ class VADDetector:
         self.vad.set_mode(3)  # 设置最高灵敏度
 
         # 参数设置
-        self.sample_rate = 16000
+        self.sample_rate = AudioConfig.INPUT_SAMPLE_RATE
         self.frame_duration = 20  # 毫秒
         self.frame_size = int(self.sample_rate * self.frame_duration / 1000)
         self.speech_window = 5  # 连续检测到多少帧语音才触发打断
@@ -45,32 +45,26 @@ class VADDetector:
         # 状态变量
         self.running = False
         self.paused = False
-        self.thread = None
         self.speech_count = 0
         self.silence_count = 0
         self.triggered = False
 
-        # 创建独立的PyAudio实例和流，避免与主音频流冲突
-        self.pa = None
-        self.stream = None
+        # 录音帧(10ms)拼成VAD帧(20ms)的预分配缓冲区
+        self._frame_buffer = np.zeros(self.frame_size, dtype=np.int16)
+        self._buffered = 0
 
     def start(self):
         """
         启动VAD检测器.
         """
-        if self.thread and self.thread.is_alive():
+        if self.running:
             logger.warning("VAD检测器已经在运行")
             return
 
         self.running = True
         self.paused = False
-
-        # 初始化PyAudio和流
-        self._initialize_audio_stream()
-
-        # 启动检测线程
-        self.thread = threading.Thread(target=self._detection_loop, daemon=True)
-        self.thread.start()
+        self._reset_state()
+        self.audio_codec.add_audio_listener(self._on_audio_frame, name="vad")
         logger.info("VAD检测器已启动")
 
     def stop(self):
@@ -78,13 +72,7 @@ class VADDetector:
         停止VAD检测器.
         """
         self.running = False
-
-        # 关闭音频流
-        self._close_audio_stream()
-
-        if self.thread and self.thread.is_alive():
-            self.thread.join(timeout=1.0)
-
+        self.audio_codec.remove_audio_listener(self._on_audio_frame)
         logger.info("VAD检测器已停止")
 
     def pause(self):
@@ -100,9 +88,7 @@ class VADDetector:
         """
         self.paused = False
         # 重置状态
-        self.speech_count = 0
-        self.silence_count = 0
-        self.triggered = False
+        self._reset_state()
         logger.info("VAD检测器已恢复")
 
     def is_running(self):
@@ -111,135 +97,50 @@ class VADDetector:
         """
         return self.running and not self.paused
 
-    def _initialize_audio_stream(self):
-        """
-        初始化独立的音频流.
-        """
-        try:
-            # 创建PyAudio实例
-            self.pa = pyaudio.PyAudio()
-
-            # 获取默认输入设备
-            device_index = None
-            for i in range(self.pa.get_device_count()):
-                device_info = self.pa.get_device_info_by_index(i)
-                if device_info["maxInputChannels"] > 0:
-                    device_index = i
-                    break
-
-            if device_index is None:
-                logger.error("找不到可用的输入设备")
-                return False
-
-            # 创建输入流
-            self.stream = self.pa.open(
-                format=pyaudio.paInt16,
-                channels=1,
-                rate=self.sample_rate,
-                input=True,
-                input_device_index=device_index,
-                frames_per_buffer=self.frame_size,
-                start=True,
-            )
-
-            logger.info(f"VAD检测器音频流已初始化，使用设备索引: {device_index}")
-            return True
-
-        except Exception as e:
-            logger.error(f"初始化VAD音频流失败: {e}")
-            return False
-
-    def _close_audio_stream(self):
+    def _on_audio_frame(self, frame: np.ndarray):
         """
-        关闭音频流.
+        录音回调线程调用：累积到一个VAD帧后立即检测.
         """
-        try:
-            if self.stream:
-                self.stream.stop_stream()
-                self.stream.close()
-                self.stream = None
-
-            if self.pa:
-                self.pa.terminate()
-                self.pa = None
+        if not self.running or self.paused:
+            return
 
-            logger.info("VAD检测器音频流已关闭")
-        except Exception as e:
-            logger.error(f"关闭VAD音频流失败: {e}")
+        # 只在说话状态下进行检测
+        if self.app.device_state != DeviceState.SPEAKING:
+            if self.speech_count or self._buffered:
+                self._reset_state()
+            return
 
-    def _detection_loop(self):
-        """
-        VAD检测主循环.
-        """
-        logger.info("VAD检测循环已启动")
-
-        while self.running:
-            # 如果暂停或者音频流未初始化，则跳过
-            if self.paused or not self.stream:
-                time.sleep(0.1)
-                continue
-
-            try:
-                # 只在说话状态下进行检测
-                if self.app.device_state == DeviceState.SPEAKING:
-                    # 读取音频帧
-                    frame = self._read_audio_frame()
-                    if not frame:
-                        time.sleep(0.01)
-                        continue
-
-                    # 检测是否是语音
-                    is_speech = self._detect_speech(frame)
-
-                    # 如果检测到语音并且达到触发条件，处理打断
-                    if is_speech:
-                        self._handle_speech_frame(frame)
-                    else:
-                        self._handle_silence_frame(frame)
+        offset = 0
+        while offset < len(frame):
+            count = min(len(frame) - offset, self.frame_size - self._buffered)
+            self._frame_buffer[self._buffered : self._buffered + count] = frame[
+                offset : offset + count
+            ]
+            self._buffered += count
+            offset += count
+
+            if self._buffered == self.frame_size:
+                self._buffered = 0
+                if self._detect_speech(self._frame_buffer):
+                    self._handle_speech_frame()
                 else:
-                    # 不在说话状态，重置状态
-                    self._reset_state()
-
-            except Exception as e:
-                logger.error(f"VAD检测循环出错: {e}")
-
-            time.sleep(0.01)  # 小延迟，减少CPU使用
-
-        logger.info("VAD检测循环已结束")
-
-    def _read_audio_frame(self):
-        """
-        读取一帧音频数据.
-        """
-        try:
-            if not self.stream or not self.stream.is_active():
-                return None
-
-            # 读取音频数据
-            data = self.stream.read(self.frame_size, exception_on_overflow=False)
-            return data
-        except Exception as e:
-            logger.error(f"读取音频帧失败: {e}")
-            return None
+                    self._handle_silence_frame()
+                if self.paused:
+                    return
 
-    def _detect_speech(self, frame):
+    def _detect_speech(self, frame: np.ndarray) -> bool:
         """
         检测是否是语音.
         """
         try:
-            # 确保帧长度正确
-            if len(frame) != self.frame_size * 2:  # 16位音频，每个样本2字节
-                return False
-
             # 使用VAD检测
-            is_speech = self.vad.is_speech(frame, self.sample_rate)
-
-            # 计算音频能量
-            audio_data = np.frombuffer(frame, dtype=np.int16)
-            energy = np.mean(np.abs(audio_data))
+            is_speech = self.vad.is_speech(frame.tobytes(), self.sample_rate)
+            if not is_speech:
+                return False
 
-            # 结合VAD和能量阈值
-            is_valid_speech = is_speech and energy > self.energy_threshold
+            # 计算音频能量，结合VAD和能量阈值
+            energy = np.mean(np.abs(frame, dtype=np.int32))
+            is_valid_speech = energy > self.energy_threshold
 
             if is_valid_speech:
                 logger.debug(
@@ -251,7 +152,7 @@ class VADDetector:
             logger.error(f"检测语音失败: {e}")
             return False
 
-    def _handle_speech_frame(self, frame):
+    def _handle_speech_frame(self):
         """
         处理语音帧.
         """
@@ -269,11 +170,9 @@ class VADDetector:
             logger.info("VAD检测器已自动暂停以防止重复触发")
 
             # 重置状态
-            self.speech_count = 0
-            self.silence_count = 0
-            self.triggered = False
+            self._reset_state()
 
-    def _handle_silence_frame(self, frame):
+    def _handle_silence_frame(self):
         """
         处理静音帧.
         """
@@ -287,12 +186,14 @@ class VADDetector:
         self.speech_count = 0
         self.silence_count = 0
         self.triggered = False
+        self._buffered = 0
 
     def _trigger_interrupt(self):
         """
-        触发打断.
+        触发打断：从录音回调线程切回事件循环执行.
         """
-        # 通知应用程序中止当前语音输出
-        self.app.schedule(
-            lambda: self.app.abort_speaking(AbortReason.WAKE_WORD_DETECTED)
+        if self.loop is None or self.loop.is_closed():
+            return
+        asyncio.run_coroutine_threadsafe(
+            self.app.abort_speaking(AbortReason.WAKE_WORD_DETECTED), self.loop
         )
@@ -1,4 +1,6 @@
 import asyncio
+import queue
+import threading
 import time
 from pathlib import Path
 from typing import Callable, Optional
@@ -8,6 +10,7 @@ import sherpa_onnx
 
 from src.constants.constants import AudioConfig
 from src.utils.config_manager import ConfigManager
+from src.utils.latency_histogram import LatencyHistogram
 from src.utils.logging_config import get_logger
 from src.utils.resource_finder import resource_finder
 
@@ -21,7 +24,19 @@ class WakeWordDetector:
         self.audio_codec = None
         self.is_running_flag = False
         self.paused = False
-        self.detection_task = None
+
+        # KWS工作线程：录音回调线程投递帧，工作线程阻塞等待，检测结果投递回事件循环
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._worker_thread: Optional[threading.Thread] = None
+        self._frame_queue: "queue.Queue" = queue.Queue(maxsize=200)
+        self._dropped_frames = 0
+
+        # 运行指标
+        self._detection_latency = LatencyHistogram()
+        self._detection_count = 0
+        self._cpu_seconds = 0.0
+        self._cpu_window_start = (time.monotonic(), 0.0)
+        self._cpu_per_second = 0.0
 
         # 防重复触发机制 - 缩短冷却时间提高响应
         self.last_detection_time = 0
@@ -83,6 +98,18 @@ class WakeWordDetector:
         self.num_trailing_blanks = config.get_config(
             "WAKE_WORD_OPTIONS.NUM_TRAILING_BLANKS", 1
         )
+        # 攒批的延迟预算：收到首帧后最多等待该时长凑齐一批再解码
+        self.latency_budget_ms = config.get_config(
+            "WAKE_WORD_OPTIONS.LATENCY_BUDGET_MS", 40
+        )
+        self._batch_samples = max(
+            AudioConfig.INPUT_FRAME_SIZE,
+            int(self.sample_rate * self.latency_budget_ms / 1000),
+        )
+        # 预分配的float32转换缓冲区（多留一帧余量）
+        self._float_buffer = np.zeros(
+            self._batch_samples + AudioConfig.INPUT_FRAME_SIZE, dtype=np.float32
+        )
 
         logger.info(
             f"KWS配置加载完成 - 阈值: {self.keywords_threshold}, 分数: {self.keywords_score}"
@@ -154,7 +181,12 @@ class WakeWordDetector:
             logger.error("KeywordSpotter未初始化")
             return False
 
+        if audio_codec is None:
+            logger.error("音频编解码器不可用，无法启动唤醒词检测")
+            return False
+
         try:
+            self._loop = asyncio.get_running_loop()
             self.audio_codec = audio_codec
             self.is_running_flag = True
             self.paused = False
@@ -162,8 +194,12 @@ class WakeWordDetector:
             # 创建检测流
             self.stream = self.keyword_spotter.create_stream()
 
-            # 启动检测任务
-            self.detection_task = asyncio.create_task(self._detection_loop())
+            # 启动KWS工作线程并订阅录音帧
+            self._worker_thread = threading.Thread(
+                target=self._worker_loop, name="KWS", daemon=True
+            )
+            self._worker_thread.start()
+            self.audio_codec.add_audio_listener(self._on_audio_frame, name="wake_word")
 
             logger.info("Sherpa-ONNX KeywordSpotter检测器启动成功")
             return True
@@ -172,95 +208,155 @@ class WakeWordDetector:
             self.enabled = False
             return False
 
-    async def _detection_loop(self):
+    def _on_audio_frame(self, frame: np.ndarray):
         """
-        检测循环.
+        录音回调线程调用：仅入队，队列满时丢弃最旧的帧.
+        """
+        if self.paused or not self.is_running_flag:
+            return
+        item = (frame, time.monotonic())
+        try:
+            self._frame_queue.put_nowait(item)
+        except queue.Full:
+            try:
+                self._frame_queue.get_nowait()
+                self._dropped_frames += 1
+            except queue.Empty:
+                pass
+            try:
+                self._frame_queue.put_nowait(item)
+            except queue.Full:
+                self._dropped_frames += 1
+
+    def _worker_loop(self):
+        """
+        KWS工作线程：阻塞等待音频帧，按延迟预算攒批后解码.
         """
         error_count = 0
         MAX_ERRORS = 5
+        cpu_start = time.thread_time()
 
         while self.is_running_flag:
-            try:
-                if self.paused:
-                    await asyncio.sleep(0.1)
-                    continue
-
-                if not self.audio_codec:
-                    await asyncio.sleep(0.5)
-                    continue
-
-                # 处理音频数据
-                await self._process_audio()
+            item = self._frame_queue.get()
+            if item is None:
+                break
 
-                # 减少延迟提高响应速度
-                await asyncio.sleep(0.005)
+            try:
+                batch_len, captured_at = self._collect_batch(item)
+                if batch_len and not self.paused:
+                    self._decode_batch(batch_len, captured_at)
                 error_count = 0
-
-            except asyncio.CancelledError:
-                break
             except Exception as e:
                 error_count += 1
-                logger.error(f"KWS检测循环错误({error_count}/{MAX_ERRORS}): {e}")
-
-                # 调用错误回调
-                if self.on_error:
-                    try:
-                        if asyncio.iscoroutinefunction(self.on_error):
-                            await self.on_error(e)
-                        else:
-                            self.on_error(e)
-                    except Exception as callback_error:
-                        logger.error(f"执行错误回调时失败: {callback_error}")
-
+                logger.error(f"KWS检测错误({error_count}/{MAX_ERRORS}): {e}")
+                self._post_to_loop(self._notify_error, e)
                 if error_count >= MAX_ERRORS:
                     logger.critical("达到最大错误次数，停止KWS检测")
                     break
-                await asyncio.sleep(1)
+                time.sleep(1)
+            finally:
+                self._update_cpu_usage(time.thread_time() - cpu_start)
 
-    async def _process_audio(self):
-        """处理音频数据 - 批量处理优化"""
-        try:
-            if not self.audio_codec or not self.stream:
-                return
-
-            # 批量获取多个音频帧以提高效率
-            audio_batches = []
-            for _ in range(3):  # 一次处理最多3帧
-                data = await self.audio_codec.get_raw_audio_for_detection()
-                if data:
-                    audio_batches.append(data)
-
-            if not audio_batches:
-                return
-
-            # 批量处理音频数据
-            for data in audio_batches:
-                # 转换音频格式
-                if isinstance(data, bytes):
-                    samples = (
-                        np.frombuffer(data, dtype=np.int16).astype(np.float32) / 32768.0
-                    )
-                else:
-                    samples = np.array(data, dtype=np.float32)
+        logger.info("KWS工作线程已退出")
+
+    def _collect_batch(self, first_item):
+        """
+        将首帧及延迟预算内到达的帧转换到预分配的float32缓冲区，返回(采样数, 末帧采集时间).
+        """
+        deadline = first_item[1] + self.latency_budget_ms / 1000
+        item = first_item
+        offset = 0
+        captured_at = first_item[1]
+        capacity = len(self._float_buffer)
+
+        while True:
+            frame, captured_at = item
+            count = min(len(frame), capacity - offset)
+            # int16 -> float32 直接写入预分配缓冲区，无临时数组
+            np.multiply(
+                frame[:count],
+                1.0 / 32768.0,
+                out=self._float_buffer[offset : offset + count],
+                casting="unsafe",
+            )
+            offset += count
+            if offset >= self._batch_samples:
+                break
 
-                # 提供音频数据给KeywordSpotter
-                self.stream.accept_waveform(
-                    sample_rate=self.sample_rate, waveform=samples
+            remaining = deadline - time.monotonic()
+            try:
+                item = (
+                    self._frame_queue.get(timeout=remaining)
+                    if remaining > 0
+                    else self._frame_queue.get_nowait()
                 )
+            except queue.Empty:
+                break
+            if item is None:
+                # 退出信号放回队列，由主循环处理
+                self._frame_queue.put_nowait(None)
+                break
 
-            # 处理检测结果
-            while self.keyword_spotter.is_ready(self.stream):
-                self.keyword_spotter.decode_stream(self.stream)
-                result = self.keyword_spotter.get_result(self.stream)
+        return offset, captured_at
 
-                if result:
-                    await self._handle_detection_result(result)
-                    # 重置流状态
-                    self.keyword_spotter.reset_stream(self.stream)
-                    break  # 检测到后立即处理，不继续批量处理
+    def _decode_batch(self, sample_count: int, captured_at: float):
+        """
+        在工作线程中解码一批音频，仅将检测结果投递回事件循环.
+        """
+        self.stream.accept_waveform(
+            sample_rate=self.sample_rate, waveform=self._float_buffer[:sample_count]
+        )
 
-        except Exception as e:
-            logger.debug(f"KWS音频处理错误: {e}")
+        while self.keyword_spotter.is_ready(self.stream):
+            self.keyword_spotter.decode_stream(self.stream)
+            result = self.keyword_spotter.get_result(self.stream)
+
+            if result:
+                self._detection_latency.record(
+                    (time.monotonic() - captured_at) * 1000
+                )
+                self._detection_count += 1
+                # 重置流状态
+                self.keyword_spotter.reset_stream(self.stream)
+                self._post_to_loop(self._schedule_detection, result)
+                break  # 检测到后立即处理，不继续批量处理
+
+    def _update_cpu_usage(self, cpu_seconds: float):
+        """
+        更新工作线程CPU占用（每秒CPU秒数）.
+        """
+        self._cpu_seconds = cpu_seconds
+        now = time.monotonic()
+        window_start, window_cpu = self._cpu_window_start
+        elapsed = now - window_start
+        if elapsed >= 1.0:
+            self._cpu_per_second = (cpu_seconds - window_cpu) / elapsed
+            self._cpu_window_start = (now, cpu_seconds)
+
+    def _post_to_loop(self, callback, *args):
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            # 事件循环已关闭
+            pass
+
+    def _schedule_detection(self, result):
+        if self.is_running_flag:
+            asyncio.create_task(self._handle_detection_result(result))
+
+    def _notify_error(self, error):
+        if not self.on_error:
+            return
+        try:
+            if asyncio.iscoroutinefunction(self.on_error):
+                asyncio.create_task(self.on_error(error))
+            else:
+                self.on_error(error)
+        except Exception as callback_error:
+            logger.error(f"执行错误回调时失败: {callback_error}")
 
     async def _handle_detection_result(self, result):
         """
@@ -289,12 +385,18 @@ class WakeWordDetector:
         """
         self.is_running_flag = False
 
-        if self.detection_task:
-            self.detection_task.cancel()
+        if self.audio_codec:
+            self.audio_codec.remove_audio_listener(self._on_audio_frame)
+
+        if self._worker_thread and self._worker_thread.is_alive():
+            # 放入退出信号唤醒阻塞中的工作线程
             try:
-                await self.detection_task
-            except asyncio.CancelledError:
-                pass
+                self._frame_queue.put_nowait(None)
+            except queue.Full:
+                self._drain_frame_queue()
+                self._frame_queue.put_nowait(None)
+            await asyncio.to_thread(self._worker_thread.join, 2.0)
+        self._worker_thread = None
 
         logger.info("Sherpa-ONNX KeywordSpotter检测器已停止")
 
@@ -303,6 +405,7 @@ class WakeWordDetector:
         暂停检测.
         """
         self.paused = True
+        self._drain_frame_queue()
         logger.debug("KWS检测已暂停")
 
     async def resume(self):
@@ -350,8 +453,22 @@ class WakeWordDetector:
             "keywords_threshold": self.keywords_threshold,
             "keywords_score": self.keywords_score,
             "is_running": self.is_running(),
+            "latency_budget_ms": self.latency_budget_ms,
+            "detections": self._detection_count,
+            "detection_latency": self._detection_latency.snapshot(),
+            "cpu_seconds": round(self._cpu_seconds, 3),
+            "cpu_per_second": round(self._cpu_per_second, 4),
+            "frame_backlog": self._frame_queue.qsize(),
+            "dropped_frames": self._dropped_frames,
         }
 
+    def _drain_frame_queue(self):
+        while True:
+            try:
+                self._frame_queue.get_nowait()
+            except queue.Empty:
+                break
+
     def clear_cache(self):
         """
         清空缓存.
@@ -7,6 +7,7 @@ import aiohttp
 from src.constants.system import SystemConstants
 from src.utils.config_manager import ConfigManager
 from src.utils.device_fingerprint import DeviceFingerprint
+from src.utils.http_client import get_http_client
 from src.utils.logging_config import get_logger
 
 
@@ -132,27 +133,25 @@ class Ota:
         payload = self.build_payload()
 
         try:
-            # 使用aiohttp异步发送请求
-            timeout = aiohttp.ClientTimeout(total=10)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.post(
-                    self.ota_version_url, headers=headers, json=payload
-                ) as response:
-                    # 检查HTTP状态码
-                    if response.status != 200:
-                        self.logger.error(f"OTA服务器错误: HTTP {response.status}")
-                        raise ValueError(f"OTA服务器返回错误状态码: {response.status}")
-
-                    # 解析JSON数据
-                    response_data = await response.json()
-
-                    # 调试信息：打印完整的OTA响应
-                    self.logger.debug(
-                        f"OTA服务器返回数据: "
-                        f"{json.dumps(response_data, indent=4, ensure_ascii=False)}"
-                    )
-
-                    return response_data
+            # 使用共享HTTP客户端异步发送请求（POST不重试）
+            response = await get_http_client().post(
+                self.ota_version_url, headers=headers, json=payload, timeout=10
+            )
+            # 检查HTTP状态码
+            if response.status != 200:
+                self.logger.error(f"OTA服务器错误: HTTP {response.status}")
+                raise ValueError(f"OTA服务器返回错误状态码: {response.status}")
+
+            # 解析JSON数据
+            response_data = response.json()
+
+            # 调试信息：打印完整的OTA响应
+            self.logger.debug(
+                f"OTA服务器返回数据: "
+                f"{json.dumps(response_data, indent=4, ensure_ascii=False)}"
+            )
+
+            return response_data
 
         except asyncio.TimeoutError:
             self.logger.error("OTA请求超时，请检查网络或服务器状态")
@@ -0,0 +1,318 @@
+"""
+MCP工具包延迟加载.
+
+每个工具包的schema（名称、描述、参数）缓存为静态清单，启动时直接按清单注册占位工具，
+工具包的实现模块（及其依赖的pygame、cv2、lunar_python等）在第一次 tools/call 时才导入。
+清单按工具包源文件的修改时间和大小做指纹，源码变化后自动失效并重新生成。
+"""
+
+import asyncio
+import importlib
+import importlib.util
+import json
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from src.constants.system import SystemConstants
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# 清单格式版本，序列化字段变化时递增
+MANIFEST_VERSION = 1
+MANIFEST_FILENAME = "mcp_tool_manifest.json"
+
+
+@dataclass
+class ToolPackage:
+    """
+    工具包定义.
+    """
+
+    name: str
+    module: str
+    # register(add_tool)：导入实现模块并注册该包的全部工具
+    register: Callable[[Callable], None]
+
+
+class ToolManifestCache:
+    """
+    工具包schema清单的磁盘缓存.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._data: Dict[str, Any] = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"读取MCP工具清单失败，将重新生成: {e}")
+            return
+
+        if data.get("version") != MANIFEST_VERSION:
+            return
+        if data.get("app_version") != SystemConstants.APP_VERSION:
+            return
+        self._data = data.get("packages", {})
+
+    def get(self, package: ToolPackage) -> Optional[List[Dict[str, Any]]]:
+        entry = self._data.get(package.name)
+        if not entry or entry.get("fingerprint") != package_fingerprint(package):
+            return None
+        return entry.get("tools")
+
+    def put(self, package: ToolPackage, tools: List[Dict[str, Any]]):
+        self._data[package.name] = {
+            "fingerprint": package_fingerprint(package),
+            "tools": tools,
+        }
+        self._dirty = True
+
+    def invalidate(self, package: ToolPackage):
+        if self._data.pop(package.name, None) is not None:
+            self._dirty = True
+
+    def save(self):
+        if not self._dirty:
+            return
+        data = {
+            "version": MANIFEST_VERSION,
+            "app_version": SystemConstants.APP_VERSION,
+            "packages": self._data,
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            tmp_path.replace(self.path)
+            self._dirty = False
+        except OSError as e:
+            logger.warning(f"保存MCP工具清单失败: {e}")
+
+
+def package_fingerprint(package: ToolPackage) -> str:
+    """
+    工具包源文件指纹（不导入包本身）.
+    """
+    try:
+        spec = importlib.util.find_spec(package.module)
+    except (ImportError, ValueError):
+        spec = None
+    if spec is None:
+        return ""
+
+    if spec.submodule_search_locations:
+        files = []
+        for location in spec.submodule_search_locations:
+            files.extend(sorted(Path(location).rglob("*.py")))
+    elif spec.origin:
+        files = [Path(spec.origin)]
+    else:
+        files = []
+
+    parts = []
+    for path in files:
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        parts.append(f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}")
+    # 打包后的程序没有源文件，仅依赖应用版本号
+    return "|".join(parts)
+
+
+def serialize_tool(tool) -> Dict[str, Any]:
+    return {
+        "name": tool.name,
+        "description": tool.description,
+        "properties": [
+            {
+                "name": prop.name,
+                "type": prop.type.value,
+                "default": prop.default_value,
+                "min": prop.min_value,
+                "max": prop.max_value,
+            }
+            for prop in tool.properties.properties
+        ],
+        "timeout": tool.timeout,
+    }
+
+
+class LazyToolLoader:
+    """
+    按清单注册占位工具，首次调用时导入工具包并替换为真实回调.
+    """
+
+    def __init__(self, server, cache: ToolManifestCache):
+        self.server = server
+        self.cache = cache
+        self._packages: Dict[str, ToolPackage] = {}
+        self._loaded: Dict[str, Dict[str, Any]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self.report: Dict[str, Dict[str, Any]] = {}
+
+    def register(self, package: ToolPackage, lazy: bool = True):
+        """
+        注册一个工具包：清单命中时注册占位工具，否则立即导入并生成清单.
+        """
+        self._packages[package.name] = package
+        manifest = self.cache.get(package) if lazy else None
+
+        start = time.perf_counter()
+        if manifest is not None:
+            for entry in manifest:
+                self.server.add_tool(self._build_stub(package, entry))
+            self.report[package.name] = {
+                "mode": "lazy",
+                "tools": len(manifest),
+                "register_ms": round((time.perf_counter() - start) * 1000, 2),
+                "import_ms": None,
+                "modules_imported": 0,
+            }
+            return
+
+        modules_before = len(sys.modules)
+        tools = self._collect_tools(package)
+        for tool in tools.values():
+            self.server.add_tool(tool)
+        elapsed = round((time.perf_counter() - start) * 1000, 2)
+        self._loaded[package.name] = tools
+        self.cache.put(package, [serialize_tool(tool) for tool in tools.values()])
+        self.report[package.name] = {
+            "mode": "eager",
+            "tools": len(tools),
+            "register_ms": elapsed,
+            "import_ms": elapsed,
+            "modules_imported": len(sys.modules) - modules_before,
+        }
+
+    def _collect_tools(self, package: ToolPackage) -> Dict[str, Any]:
+        """
+        执行工具包注册函数，收集其全部工具（不加入服务器）.
+        """
+        from src.mcp.mcp_server import McpTool
+
+        tools: Dict[str, Any] = {}
+
+        def capture(tool):
+            if isinstance(tool, tuple):
+                tool = McpTool(*tool)
+            tools[tool.name] = tool
+
+        package.register(capture)
+        return tools
+
+    def _build_stub(self, package: ToolPackage, entry: Dict[str, Any]):
+        from src.mcp.mcp_server import McpTool, Property, PropertyList, PropertyType
+
+        properties = PropertyList(
+            [
+                Property(
+                    prop["name"],
+                    PropertyType(prop["type"]),
+                    default_value=prop.get("default"),
+                    min_value=prop.get("min"),
+                    max_value=prop.get("max"),
+                )
+                for prop in entry["properties"]
+            ]
+        )
+        tool_name = entry["name"]
+
+        async def lazy_callback(args):
+            callback = await self._resolve(package, tool_name)
+            if asyncio.iscoroutinefunction(callback):
+                return await callback(args)
+            return await asyncio.to_thread(callback, args)
+
+        return McpTool(
+            tool_name,
+            entry["description"],
+            properties,
+            lazy_callback,
+            timeout=entry.get("timeout"),
+        )
+
+    async def _resolve(self, package: ToolPackage, tool_name: str) -> Callable:
+        """
+        返回工具的真实回调，必要时导入工具包.
+        """
+        tools = self._loaded.get(package.name)
+        if tools is None:
+            lock = self._locks.setdefault(package.name, asyncio.Lock())
+            async with lock:
+                tools = self._loaded.get(package.name)
+                if tools is None:
+                    tools = await self._load_package(package)
+
+        tool = tools.get(tool_name)
+        if tool is None:
+            raise RuntimeError(f"工具包 {package.name} 中不存在工具 {tool_name}")
+        return tool.callback
+
+    async def _load_package(self, package: ToolPackage) -> Dict[str, Any]:
+        modules_before = len(sys.modules)
+        start = time.perf_counter()
+        # 导入耗时较长（pygame、cv2等），放到线程中避免阻塞事件循环
+        await asyncio.to_thread(importlib.import_module, package.module)
+        tools = self._collect_tools(package)
+        import_ms = round((time.perf_counter() - start) * 1000, 2)
+        self._loaded[package.name] = tools
+
+        # 替换占位回调，后续调用不再经过延迟加载
+        stale = False
+        for name, tool in tools.items():
+            registered = self.server.get_tool(name)
+            if registered is None:
+                # 清单中没有的新工具，直接注册
+                stale = True
+                self.server.add_tool(tool)
+                continue
+            registered.callback = tool.callback
+        manifest_names = {entry["name"] for entry in (self.cache.get(package) or [])}
+        if stale or manifest_names - set(tools):
+            # 清单与实现不一致：下次启动重新生成
+            logger.warning(f"MCP工具包 {package.name} 的清单已过期，下次启动时重新生成")
+            self.cache.invalidate(package)
+            await asyncio.to_thread(self.cache.save)
+
+        report = self.report.setdefault(package.name, {"mode": "lazy"})
+        report["import_ms"] = import_ms
+        report["modules_imported"] = len(sys.modules) - modules_before
+        logger.info(
+            f"MCP工具包 {package.name} 首次调用加载完成，耗时 {import_ms:.1f}ms，"
+            f"新导入模块 {report['modules_imported']} 个"
+        )
+        return tools
+
+    def is_loaded(self, package_name: str) -> bool:
+        return package_name in self._loaded
+
+    def log_report(self, total_ms: float):
+        lazy = [name for name, item in self.report.items() if item["mode"] == "lazy"]
+        logger.info(
+            f"MCP工具包注册完成，耗时 {total_ms:.1f}ms，"
+            f"延迟加载 {len(lazy)}/{len(self.report)} 个工具包"
+        )
+        for name, item in self.report.items():
+            if item["mode"] == "lazy":
+                logger.info(
+                    f"  {name}: {item['tools']}个工具，按清单注册 {item['register_ms']}ms"
+                )
+            else:
+                logger.info(
+                    f"  {name}: {item['tools']}个工具，导入注册 {item['register_ms']}ms，"
+                    f"新导入模块 {item['modules_imported']} 个"
+                )
@@ -4,19 +4,42 @@ Reference: https://modelcontextprotocol.io/specification/2024-11-05
 """
 
 import asyncio
+import importlib
 import json
+import logging
+import time
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 from src.constants.system import SystemConstants
+from src.mcp.lazy_tools import (
+    MANIFEST_FILENAME,
+    LazyToolLoader,
+    ToolManifestCache,
+    ToolPackage,
+)
+from src.utils import json_utils
+from src.utils.config_manager import ConfigManager
 from src.utils.logging_config import get_logger
+from src.utils.resource_finder import get_user_cache_dir
 
 logger = get_logger(__name__)
 
 # 返回值类型
 ReturnValue = Union[bool, int, str]
 
+# tools/list 单页大小上限（字节）
+TOOLS_LIST_MAX_PAYLOAD = 8000
+
+# 工具schema代际：任何工具schema变化时递增，用于使缓存的序列化结果失效
+_schema_generation = 0
+
+
+def _bump_schema_generation():
+    global _schema_generation
+    _schema_generation += 1
+
 
 class PropertyType(Enum):
     """
@@ -97,6 +120,7 @@ class PropertyList:
 
     def add_property(self, prop: Property):
         self.properties.append(prop)
+        _bump_schema_generation()
 
     def __getitem__(self, name: str) -> Property:
         for prop in self.properties:
@@ -154,6 +178,25 @@ class McpTool:
     description: str
     properties: PropertyList
     callback: Callable[[Dict[str, Any]], ReturnValue]
+    # 单次调用超时（秒），None 时使用服务器配置
+    timeout: Optional[float] = None
+
+    _SCHEMA_FIELDS = ("name", "description", "properties")
+
+    def __setattr__(self, key, value):
+        super().__setattr__(key, value)
+        if key in self._SCHEMA_FIELDS:
+            _bump_schema_generation()
+
+    def schema_json(self) -> str:
+        """
+        获取序列化后的工具schema（缓存，schema变化后自动重新生成）.
+        """
+        cache = self.__dict__.get("_schema_cache")
+        if cache is None or cache[0] != _schema_generation:
+            cache = (_schema_generation, json.dumps(self.to_json()))
+            self.__dict__["_schema_cache"] = cache
+        return cache[1]
 
     def to_json(self) -> Dict[str, Any]:
         """
@@ -177,11 +220,11 @@ class McpTool:
             # 解析参数
             parsed_args = self.properties.parse_arguments(arguments)
 
-            # 调用回调函数
+            # 调用回调函数，同步回调在线程中执行，避免阻塞事件循环
             if asyncio.iscoroutinefunction(self.callback):
                 result = await self.callback(parsed_args)
             else:
-                result = self.callback(parsed_args)
+                result = await asyncio.to_thread(self.callback, parsed_args)
 
             # 格式化返回值
             if isinstance(result, bool):
@@ -191,17 +234,110 @@ class McpTool:
             else:
                 text = str(result)
 
-            return json.dumps(
+            return json_utils.dumps(
                 {"content": [{"type": "text", "text": text}], "isError": False}
             )
 
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
             logger.error(f"Error calling tool {self.name}: {e}", exc_info=True)
-            return json.dumps(
+            return json_utils.dumps(
                 {"content": [{"type": "text", "text": str(e)}], "isError": True}
             )
 
 
+def _manager_tools(module: str, getter: str) -> Callable[[Callable], None]:
+    """
+    通过工具包管理器的 init_tools 注册工具.
+    """
+
+    def register(add_tool: Callable):
+        manager = getattr(importlib.import_module(module), getter)()
+        manager.init_tools(add_tool, PropertyList, Property, PropertyType)
+
+    return register
+
+
+def _register_camera_tools(add_tool: Callable):
+    from src.mcp.tools.camera import take_photo
+
+    # 注册take_photo工具
+    properties = PropertyList([Property("question", PropertyType.STRING)])
+    add_tool(
+        McpTool(
+            "take_photo",
+            "拍照并分析图像内容。可以进行物体识别、文字识别、场景分析、问题解答等。适用于：看看这是什么、拍照识别、读取文字、分析场景、解答问题等需求。Take photo and analyze image content including object recognition, text recognition, scene analysis, and question answering.",
+            properties,
+            take_photo,
+        )
+    )
+
+
+def _common_tool_packages() -> List[ToolPackage]:
+    """
+    通用工具包（按注册顺序）.
+    """
+    return [
+        # 系统工具
+        ToolPackage(
+            "system",
+            "src.mcp.tools.system",
+            _manager_tools("src.mcp.tools.system", "get_system_tools_manager"),
+        ),
+        # 日程管理工具
+        ToolPackage(
+            "calendar",
+            "src.mcp.tools.calendar",
+            _manager_tools("src.mcp.tools.calendar", "get_calendar_manager"),
+        ),
+        # 倒计时器工具
+        ToolPackage(
+            "timer",
+            "src.mcp.tools.timer",
+            _manager_tools("src.mcp.tools.timer", "get_timer_manager"),
+        ),
+        # 音乐播放器工具
+        ToolPackage(
+            "music",
+            "src.mcp.tools.music",
+            _manager_tools("src.mcp.tools.music", "get_music_tools_manager"),
+        ),
+        # 12306铁路查询工具
+        ToolPackage(
+            "railway",
+            "src.mcp.tools.railway",
+            _manager_tools("src.mcp.tools.railway", "get_railway_tools_manager"),
+        ),
+        # 搜索工具
+        ToolPackage(
+            "search",
+            "src.mcp.tools.search",
+            _manager_tools("src.mcp.tools.search", "get_search_manager"),
+        ),
+        # 菜谱工具
+        ToolPackage(
+            "recipe",
+            "src.mcp.tools.recipe",
+            _manager_tools("src.mcp.tools.recipe", "get_recipe_manager"),
+        ),
+        # 摄像头工具
+        ToolPackage("camera", "src.mcp.tools.camera", _register_camera_tools),
+        # 高德地图工具
+        ToolPackage(
+            "amap",
+            "src.mcp.tools.amap",
+            _manager_tools("src.mcp.tools.amap", "get_amap_manager"),
+        ),
+        # 八字命理工具
+        ToolPackage(
+            "bazi",
+            "src.mcp.tools.bazi",
+            _manager_tools("src.mcp.tools.bazi", "get_bazi_manager"),
+        ),
+    ]
+
+
 class McpServer:
     """
     MCP服务器实现.
@@ -220,8 +356,36 @@ class McpServer:
 
     def __init__(self):
         self.tools: List[McpTool] = []
+        # 工具名索引，与 tools 同步维护
+        self._tool_index: Dict[str, McpTool] = {}
         self._send_callback: Optional[Callable] = None
         self._camera = None
+        self._tool_loader: Optional[LazyToolLoader] = None
+
+        # tools/list 分页缓存：cursor -> 序列化好的result，工具或schema变化后失效
+        self._tools_version = 0
+        self._pages: Dict[str, str] = {}
+        self._pages_key: Optional[Tuple[int, int]] = None
+
+        # 工具调用：每个调用独立任务，按请求ID跟踪，限制并发数
+        config = ConfigManager.get_instance()
+        self._max_concurrent_calls = max(
+            1, config.get_config("MCP_OPTIONS.MAX_CONCURRENT_TOOL_CALLS", 4)
+        )
+        self._default_call_timeout = config.get_config(
+            "MCP_OPTIONS.TOOL_CALL_TIMEOUT", 60
+        )
+        self._tool_timeouts: Dict[str, float] = (
+            config.get_config("MCP_OPTIONS.TOOL_TIMEOUTS", {}) or {}
+        )
+        self._call_semaphore: Optional[asyncio.Semaphore] = None
+        self._call_tasks: Dict[Any, asyncio.Task] = {}
+        self._call_stats = {
+            "completed": 0,
+            "failed": 0,
+            "timed_out": 0,
+            "cancelled": 0,
+        }
 
     def set_send_callback(self, callback: Callable):
         """
@@ -239,91 +403,58 @@ class McpServer:
             tool = McpTool(name, description, properties, callback)
 
         # 检查是否已存在
-        if any(t.name == tool.name for t in self.tools):
+        if tool.name in self._tool_index:
             logger.warning(f"Tool {tool.name} already added")
             return
 
         logger.info(f"Add tool: {tool.name}")
         self.tools.append(tool)
+        self._tool_index[tool.name] = tool
+        self._tools_version += 1
 
-    def add_common_tools(self):
+    def get_tool(self, name: str) -> Optional[McpTool]:
         """
-        添加通用工具.
+        按名称查找工具.
         """
-        # 备份原有工具列表
-        original_tools = self.tools.copy()
-        self.tools.clear()
-
-        # 添加系统工具
-        from src.mcp.tools.system import get_system_tools_manager
-
-        system_manager = get_system_tools_manager()
-        system_manager.init_tools(self.add_tool, PropertyList, Property, PropertyType)
-
-        # 添加日程管理工具
-        from src.mcp.tools.calendar import get_calendar_manager
-
-        calendar_manager = get_calendar_manager()
-        calendar_manager.init_tools(self.add_tool, PropertyList, Property, PropertyType)
-
-        # 添加倒计时器工具
-        from src.mcp.tools.timer import get_timer_manager
-
-        timer_manager = get_timer_manager()
-        timer_manager.init_tools(self.add_tool, PropertyList, Property, PropertyType)
-
-        # 添加音乐播放器工具
-        from src.mcp.tools.music import get_music_tools_manager
+        return self._tool_index.get(name)
 
-        music_manager = get_music_tools_manager()
-        music_manager.init_tools(self.add_tool, PropertyList, Property, PropertyType)
-
-        # 添加12306铁路查询工具
-        from src.mcp.tools.railway import get_railway_tools_manager
-
-        railway_manager = get_railway_tools_manager()
-        railway_manager.init_tools(self.add_tool, PropertyList, Property, PropertyType)
-
-        # 添加搜索工具
-        from src.mcp.tools.search import get_search_manager
-
-        search_manager = get_search_manager()
-        search_manager.init_tools(self.add_tool, PropertyList, Property, PropertyType)
-
-        # 添加菜谱工具
-        from src.mcp.tools.recipe import get_recipe_manager
-
-        recipe_manager = get_recipe_manager()
-        recipe_manager.init_tools(self.add_tool, PropertyList, Property, PropertyType)
-
-        # 添加摄像头工具
-        from src.mcp.tools.camera import take_photo
-
-        # 注册take_photo工具
-        properties = PropertyList([Property("question", PropertyType.STRING)])
-        self.add_tool(
-            McpTool(
-                "take_photo",
-                "拍照并分析图像内容。可以进行物体识别、文字识别、场景分析、问题解答等。适用于：看看这是什么、拍照识别、读取文字、分析场景、解答问题等需求。Take photo and analyze image content including object recognition, text recognition, scene analysis, and question answering.",
-                properties,
-                take_photo,
-            )
-        )
+    def _reset_tools(self):
+        self.tools.clear()
+        self._tool_index.clear()
+        self._tools_version += 1
 
-        # 添加高德地图工具
-        from src.mcp.tools.amap import get_amap_manager
+    def add_common_tools(self):
+        """添加通用工具.
 
-        amap_manager = get_amap_manager()
-        amap_manager.init_tools(self.add_tool, PropertyList, Property, PropertyType)
+        工具包按缓存的schema清单注册，实现模块在首次调用时才导入；清单缺失或过期的
+        工具包立即导入并重新生成清单。
+        """
+        # 备份原有工具列表
+        original_tools = self.tools.copy()
+        self._reset_tools()
 
-        # 添加八字命理工具
-        from src.mcp.tools.bazi import get_bazi_manager
+        config = ConfigManager.get_instance()
+        lazy = config.get_config("MCP_OPTIONS.LAZY_TOOL_LOADING", True)
 
-        bazi_manager = get_bazi_manager()
-        bazi_manager.init_tools(self.add_tool, PropertyList, Property, PropertyType)
+        start = time.perf_counter()
+        cache = ToolManifestCache(get_user_cache_dir() / MANIFEST_FILENAME)
+        self._tool_loader = LazyToolLoader(self, cache)
+        for package in _common_tool_packages():
+            self._tool_loader.register(package, lazy=lazy)
+        cache.save()
+        self._tool_loader.log_report((time.perf_counter() - start) * 1000)
 
         # 恢复原有工具
-        self.tools.extend(original_tools)
+        for tool in original_tools:
+            self.add_tool(tool)
+
+    def get_tool_package_report(self) -> Dict[str, Dict[str, Any]]:
+        """
+        获取各工具包的注册方式与加载耗时.
+        """
+        if self._tool_loader is None:
+            return {}
+        return {name: dict(item) for name, item in self._tool_loader.report.items()}
 
     async def parse_message(self, message: Union[str, Dict[str, Any]]):
         """
@@ -331,13 +462,14 @@ class McpServer:
         """
         try:
             if isinstance(message, str):
-                data = json.loads(message)
+                data = json_utils.loads(message)
             else:
                 data = message
 
-            logger.info(
-                f"[MCP] 解析消息: {json.dumps(data, ensure_ascii=False, indent=2)}"
-            )
+            # 完整消息只在DEBUG级别输出，避免大消息在事件循环上格式化
+            if logger.isEnabledFor(logging.DEBUG):
+                raw = message if isinstance(message, str) else json_utils.dumps(data)
+                logger.debug(f"[MCP] 解析消息: {json_utils.preview(raw)}")
 
             # 检查JSONRPC版本
             if data.get("jsonrpc") != "2.0":
@@ -349,9 +481,12 @@ class McpServer:
                 logger.error("Missing method")
                 return
 
-            # 忽略通知
+            # 通知：仅处理取消请求，其余忽略
             if method.startswith("notifications"):
-                logger.info(f"[MCP] 忽略通知消息: {method}")
+                if method == "notifications/cancelled":
+                    self._handle_cancelled(data.get("params") or {})
+                else:
+                    logger.info(f"[MCP] 忽略通知消息: {method}")
                 return
 
             params = data.get("params", {})
@@ -361,7 +496,18 @@ class McpServer:
                 logger.error(f"Invalid id for method: {method}")
                 return
 
-            logger.info(f"[MCP] 处理方法: {method}, ID: {id}, 参数: {params}")
+            # INFO只输出一行摘要，完整参数仅在DEBUG级别输出
+            if method == "tools/call":
+                logger.info(
+                    f"[MCP] 处理方法: {method}, ID: {id}, 工具: {params.get('name')}"
+                )
+            else:
+                logger.info(f"[MCP] 处理方法: {method}, ID: {id}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    f"[MCP] 方法 {method} 参数: "
+                    f"{json_utils.preview(json_utils.dumps(params))}"
+                )
 
             # 处理不同的方法
             if method == "initialize":
@@ -369,7 +515,7 @@ class McpServer:
             elif method == "tools/list":
                 await self._handle_tools_list(id, params)
             elif method == "tools/call":
-                await self._handle_tool_call(id, params)
+                await self._dispatch_tool_call(id, params)
             else:
                 logger.error(f"Method not implemented: {method}")
                 await self._reply_error(id, f"Method not implemented: {method}")
@@ -404,75 +550,181 @@ class McpServer:
         处理工具列表请求.
         """
         cursor = params.get("cursor", "")
-        max_payload_size = 8000
+        await self._reply_raw_result(id, self._get_tools_page(cursor))
 
-        tools_json = []
-        total_size = 0
-        found_cursor = not cursor
-        next_cursor = ""
-
-        for tool in self.tools:
-            # 如果还没找到起始位置，继续搜索
-            if not found_cursor:
-                if tool.name == cursor:
-                    found_cursor = True
-                else:
-                    continue
+    def _get_tools_page(self, cursor: str) -> str:
+        """
+        获取 cursor 对应的已序列化分页结果，工具或schema变化后重新预计算.
+        """
+        key = (self._tools_version, _schema_generation)
+        if self._pages_key != key:
+            self._pages = self._build_tools_pages()
+            self._pages_key = key
 
-            # 检查大小
-            tool_json = tool.to_json()
-            tool_size = len(json.dumps(tool_json))
+        page = self._pages.get(cursor)
+        if page is None:
+            # 非分页起点的cursor（兼容旧行为：从该工具开始列出）
+            start = next(
+                (i for i, tool in enumerate(self.tools) if tool.name == cursor),
+                len(self.tools),
+            )
+            page, _ = self._build_tools_page(start)
+            # 只缓存真实存在的工具名，任意cursor不会让缓存无限增长
+            if start < len(self.tools):
+                self._pages[cursor] = page
+        return page
 
-            if total_size + tool_size + 100 > max_payload_size:
-                next_cursor = tool.name
-                break
+    def _build_tools_pages(self) -> Dict[str, str]:
+        """
+        按 8000 字节预算预先切分所有分页.
+        """
+        pages = {}
+        start, cursor = 0, ""
+        while True:
+            page, next_index = self._build_tools_page(start)
+            pages[cursor] = page
+            if next_index is None:
+                return pages
+            start, cursor = next_index, self.tools[next_index].name
 
-            tools_json.append(tool_json)
+    def _build_tools_page(self, start: int) -> Tuple[str, Optional[int]]:
+        """
+        从 start 开始构建一页，返回 (result JSON, 下一页起点).
+        """
+        schemas = []
+        total_size = 0
+        next_index = None
+
+        for index in range(start, len(self.tools)):
+            schema = self.tools[index].schema_json()
+            tool_size = len(schema)
+
+            if total_size + tool_size + 100 > TOOLS_LIST_MAX_PAYLOAD:
+                if schemas:
+                    next_index = index
+                    break
+                # 单个工具已超出预算时独占一页，保证分页总能向前推进
+                logger.warning(
+                    f"[MCP] 工具 {self.tools[index].name} 的schema为{tool_size}字节，"
+                    f"超过单页预算{TOOLS_LIST_MAX_PAYLOAD}字节"
+                )
+
+            schemas.append(schema)
             total_size += tool_size
 
-        result = {"tools": tools_json}
-        if next_cursor:
-            result["nextCursor"] = next_cursor
+        page = '{"tools": [' + ", ".join(schemas) + "]"
+        if next_index is not None:
+            page += ', "nextCursor": ' + json.dumps(self.tools[next_index].name)
+        return page + "}", next_index
 
-        await self._reply_result(id, result)
+    async def _dispatch_tool_call(self, id: int, params: Dict[str, Any]):
+        """
+        将工具调用放入独立任务执行，消息处理立即返回.
+        """
+        if id in self._call_tasks:
+            logger.warning(f"[MCP] 重复的工具调用请求ID: {id}")
+            await self._reply_error(id, "Duplicate request id", code=-32600)
+            return
+
+        if self._call_semaphore is None:
+            self._call_semaphore = asyncio.Semaphore(self._max_concurrent_calls)
+
+        task = asyncio.create_task(
+            self._handle_tool_call(id, params), name=f"MCP工具调用-{id}"
+        )
+        self._call_tasks[id] = task
+        task.add_done_callback(lambda t: self._call_tasks.pop(id, None))
+
+    def _handle_cancelled(self, params: Dict[str, Any]):
+        """
+        处理 notifications/cancelled：按请求ID取消正在执行的工具调用.
+        """
+        request_id = params.get("requestId")
+        task = self._call_tasks.get(request_id)
+        if task is None or task.done():
+            logger.info(f"[MCP] 取消请求的调用不存在或已完成: {request_id}")
+            return
+
+        logger.info(f"[MCP] 取消工具调用: ID={request_id}, 原因: {params.get('reason')}")
+        task.cancel()
+
+    def _get_call_timeout(self, tool: McpTool) -> Optional[float]:
+        timeout = self._tool_timeouts.get(tool.name, tool.timeout)
+        if timeout is None:
+            timeout = self._default_call_timeout
+        return timeout if timeout and timeout > 0 else None
 
     async def _handle_tool_call(self, id: int, params: Dict[str, Any]):
         """
         处理工具调用请求.
         """
-        logger.info(f"[MCP] 收到工具调用请求! ID={id}, 参数={params}")
-
         tool_name = params.get("name")
         if not tool_name:
             await self._reply_error(id, "Missing tool name")
             return
 
-        logger.info(f"[MCP] 尝试调用工具: {tool_name}")
-
         # 查找工具
-        tool = None
-        for t in self.tools:
-            if t.name == tool_name:
-                tool = t
-                break
-
+        tool = self._tool_index.get(tool_name)
         if not tool:
             await self._reply_error(id, f"Unknown tool: {tool_name}")
             return
 
         # 获取参数
         arguments = params.get("arguments", {})
+        timeout = self._get_call_timeout(tool)
 
-        logger.info(f"[MCP] 开始执行工具 {tool_name}, 参数: {arguments}")
-
-        # 异步调用工具
         try:
-            result = await tool.call(arguments)
-            logger.info(f"[MCP] 工具 {tool_name} 执行成功，结果: {result}")
-            await self._reply_result(id, json.loads(result))
+            async with self._call_semaphore:
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        f"[MCP] 开始执行工具 {tool_name}, 参数: "
+                        f"{json_utils.preview(json_utils.dumps(arguments))}"
+                    )
+                result = await asyncio.wait_for(tool.call(arguments), timeout)
+        except asyncio.TimeoutError:
+            self._call_stats["timed_out"] += 1
+            logger.warning(f"[MCP] 工具 {tool_name} 执行超时({timeout}s)")
+            await self._reply_error(id, f"Tool {tool_name} timed out after {timeout}s")
+            return
+        except asyncio.CancelledError:
+            # 被取消的请求不再响应
+            self._call_stats["cancelled"] += 1
+            logger.info(f"[MCP] 工具 {tool_name} 已取消: ID={id}")
+            raise
         except Exception as e:
+            self._call_stats["failed"] += 1
             logger.error(f"[MCP] 工具 {tool_name} 执行失败: {e}", exc_info=True)
             await self._reply_error(id, str(e))
+            return
+
+        self._call_stats["completed"] += 1
+        logger.info(f"[MCP] 工具 {tool_name} 执行成功，结果长度={len(result)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"[MCP] 工具 {tool_name} 结果: {json_utils.preview(result)}")
+        # 工具结果已是JSON文本，直接嵌入响应，不再解析和重新序列化
+        await self._reply_raw_result(id, result)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取工具调用统计信息.
+        """
+        return {
+            "tools": len(self.tools),
+            "active_calls": len(self._call_tasks),
+            "max_concurrent_calls": self._max_concurrent_calls,
+            **self._call_stats,
+        }
+
+    async def close(self):
+        """
+        取消所有进行中的工具调用.
+        """
+        tasks = [task for task in self._call_tasks.values() if not task.done()]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._call_tasks.clear()
 
     async def _parse_capabilities(self, capabilities):
         """
@@ -496,23 +748,35 @@ class McpServer:
         """
         发送成功响应.
         """
-        payload = {"jsonrpc": "2.0", "id": id, "result": result}
+        await self._reply_raw_result(id, json_utils.dumps(result))
 
-        result_len = len(json.dumps(result))
-        logger.info(f"[MCP] 发送成功响应: ID={id}, 结果长度={result_len}")
+    async def _reply_raw_result(self, id: int, result_json: str):
+        """
+        发送已序列化的成功响应.
+        """
+        logger.info(f"[MCP] 发送成功响应: ID={id}, 结果长度={len(result_json)}")
 
         if self._send_callback:
-            await self._send_callback(json.dumps(payload))
+            await self._send_callback(
+                '{"jsonrpc":"2.0","id":'
+                + json_utils.dumps(id)
+                + ',"result":'
+                + result_json
+                + "}"
+            )
         else:
             logger.error("[MCP] 发送回调未设置!")
 
-    async def _reply_error(self, id: int, message: str):
+    async def _reply_error(self, id: int, message: str, code: Optional[int] = None):
         """
-        发送错误响应.
+        发送错误响应，code 为 JSON-RPC 错误码（可选）.
         """
-        payload = {"jsonrpc": "2.0", "id": id, "error": {"message": message}}
+        error = {"message": message}
+        if code is not None:
+            error["code"] = code
+        payload = {"jsonrpc": "2.0", "id": id, "error": error}
 
         logger.error(f"[MCP] 发送错误响应: ID={id}, 错误={message}")
 
         if self._send_callback:
-            await self._send_callback(json.dumps(payload))
+            await self._send_callback(json_utils.dumps(payload))
@@ -6,8 +6,7 @@
 import json
 from typing import Any, Dict
 
-import aiohttp
-
+from src.utils.http_client import get_http_client
 from src.utils.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -40,9 +39,7 @@ async def maps_regeocode(args: Dict[str, Any]) -> str:
         url = "https://restapi.amap.com/v3/geocode/regeo"
         params = {"location": location, "key": api_key, "source": "py_xiaozhi"}
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params) as response:
-                data = await response.json()
+        data = await get_http_client().get_json(url, params=params)
 
         if data.get("status") != "1":
             error_msg = f"逆地理编码失败: {data.get('info', data.get('infocode'))}"
@@ -95,9 +92,7 @@ async def maps_geo(args: Dict[str, Any]) -> str:
         if city:
             params["city"] = city
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params) as response:
-                data = await response.json()
+        data = await get_http_client().get_json(url, params=params)
 
         if data.get("status") != "1":
             error_msg = f"地理编码失败: {data.get('info', data.get('infocode'))}"
@@ -158,9 +153,7 @@ async def maps_ip_location(args: Dict[str, Any]) -> str:
         url = "https://restapi.amap.com/v3/ip"
         params = {"ip": ip, "key": api_key, "source": "py_xiaozhi"}
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params) as response:
-                data = await response.json()
+        data = await get_http_client().get_json(url, params=params)
 
         if data.get("status") != "1":
             error_msg = f"IP定位失败: {data.get('info', data.get('infocode'))}"
@@ -214,9 +207,7 @@ async def maps_weather(args: Dict[str, Any]) -> str:
             "extensions": "all",
         }
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params) as response:
-                data = await response.json()
+        data = await get_http_client().get_json(url, params=params)
 
         if data.get("status") != "1":
             error_msg = f"天气查询失败: {data.get('info', data.get('infocode'))}"
@@ -279,9 +270,7 @@ async def maps_direction_walking(args: Dict[str, Any]) -> str:
             "source": "py_xiaozhi",
         }
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params) as response:
-                data = await response.json()
+        data = await get_http_client().get_json(url, params=params)
 
         if data.get("status") != "1":
             error_msg = f"步行路径规划失败: {data.get('info', data.get('infocode'))}"
@@ -361,9 +350,7 @@ async def maps_direction_driving(args: Dict[str, Any]) -> str:
             "source": "py_xiaozhi",
         }
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params) as response:
-                data = await response.json()
+        data = await get_http_client().get_json(url, params=params)
 
         if data.get("status") != "1":
             error_msg = f"驾车路径规划失败: {data.get('info', data.get('infocode'))}"
@@ -452,9 +439,7 @@ async def maps_text_search(args: Dict[str, Any]) -> str:
         if types:
             params["types"] = types
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params) as response:
-                data = await response.json()
+        data = await get_http_client().get_json(url, params=params)
 
         if data.get("status") != "1":
             error_msg = f"搜索失败: {data.get('info', data.get('infocode'))}"
@@ -526,9 +511,7 @@ async def maps_around_search(args: Dict[str, Any]) -> str:
         if keywords:
             params["keywords"] = keywords
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params) as response:
-                data = await response.json()
+        data = await get_http_client().get_json(url, params=params)
 
         if data.get("status") != "1":
             error_msg = f"周边搜索失败: {data.get('info', data.get('infocode'))}"
@@ -591,9 +574,7 @@ async def maps_search_detail(args: Dict[str, Any]) -> str:
         url = "https://restapi.amap.com/v3/place/detail"
         params = {"id": poi_id, "key": api_key, "source": "py_xiaozhi"}
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params) as response:
-                data = await response.json()
+        data = await get_http_client().get_json(url, params=params)
 
         if data.get("status") != "1":
             error_msg = f"POI详情查询失败: {data.get('info', data.get('infocode'))}"
@@ -673,9 +654,7 @@ async def maps_distance(args: Dict[str, Any]) -> str:
             "source": "py_xiaozhi",
         }
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params) as response:
-                data = await response.json()
+        data = await get_http_client().get_json(url, params=params)
 
         if data.get("status") != "1":
             error_msg = f"距离测量失败: {data.get('info', data.get('infocode'))}"
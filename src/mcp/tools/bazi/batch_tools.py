@@ -0,0 +1,325 @@
+"""
+八字批量分析工具函数.
+
+一次调用处理多个出生时间（家人对比）或一段日期（逐日择日），返回紧凑的表格结果：
+- 条目按公历时间排序后处理，相邻条目共用 LunarYear 节气表和转换缓存，结果按输入顺序返回
+- 只计算表格需要的字段，不生成大运、详细解读等单次分析才需要的内容
+- 条目达到阈值且有多个CPU时，按排序后的连续分段分发到进程池
+"""
+
+import asyncio
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from multiprocessing import get_context
+from typing import Any, Dict, List, Tuple
+
+from src.utils.logging_config import get_logger
+
+from .bazi_calculator import get_bazi_calculator
+from .engine import get_bazi_engine
+from .lunar_cache import get_lunar_cache
+from .models import SolarTime
+
+logger = get_logger(__name__)
+
+# 单次调用最多处理的条目数
+MAX_BATCH_ITEMS = 1000
+
+# 条目数达到该值时才使用进程池（无论指定多少进程），每个进程启动和导入约需数百毫秒
+PROCESS_POOL_MIN_ITEMS = 500
+
+# 进程池最多使用的进程数
+MAX_POOL_WORKERS = 4
+
+BAZI_COLUMNS = [
+    "输入",
+    "性别",
+    "公历",
+    "农历",
+    "八字",
+    "日主",
+    "生肖",
+    "日柱纳音",
+    "强弱",
+    "用神",
+    "五行最旺",
+    "五行最弱",
+]
+
+CALENDAR_COLUMNS = [
+    "输入",
+    "公历",
+    "农历",
+    "干支",
+    "冲煞",
+    "宜",
+    "忌",
+    "节气",
+    "节日",
+]
+
+BATCH_COLUMNS = {"bazi": BAZI_COLUMNS, "calendar": CALENDAR_COLUMNS}
+
+# (输入序号, 原始输入, 公历时间, 性别)
+BatchItem = Tuple[int, str, SolarTime, int]
+
+
+def split_datetimes(text: str) -> List[str]:
+    """
+    拆分多个时间，支持换行、分号、逗号分隔或JSON数组.
+    """
+    text = (text or "").strip()
+    if not text:
+        return []
+    if text.startswith("["):
+        return [str(item).strip() for item in json.loads(text) if str(item).strip()]
+    return [part.strip() for part in re.split(r"[\n;；,，]+", text) if part.strip()]
+
+
+def expand_date_range(start_date: str, end_date: str, hour: int = 12) -> List[str]:
+    """
+    展开日期范围（含首尾），每天取同一时刻.
+    """
+    start = date.fromisoformat(start_date.strip())
+    end = date.fromisoformat(end_date.strip())
+    if end < start:
+        raise ValueError("end_date不能早于start_date")
+    days = (end - start).days + 1
+    if days > MAX_BATCH_ITEMS:
+        raise ValueError(f"日期范围共{days}天，超过单次上限{MAX_BATCH_ITEMS}天")
+    return [f"{start + timedelta(days=i)} {hour:02d}:00:00" for i in range(days)]
+
+
+def parse_batch_items(
+    inputs: List[str], gender: int = 1
+) -> Tuple[List[BatchItem], List[Dict[str, Any]]]:
+    """解析输入，每项可用'时间|性别'单独指定性别.
+
+    返回可计算的条目和解析失败的错误列表.
+    """
+    engine = get_bazi_engine()
+    items = []
+    errors = []
+    for index, text in enumerate(inputs):
+        try:
+            value, sep, item_gender = text.partition("|")
+            item_gender = int(item_gender) if sep else gender
+            if item_gender not in (0, 1):
+                raise ValueError(f"性别只能是0或1: {item_gender}")
+            solar_time = engine.parse_solar_time(value.strip())
+            items.append((index, text, solar_time, item_gender))
+        except Exception as e:
+            errors.append({"index": index, "input": text, "message": str(e)})
+    return items, errors
+
+
+def build_bazi_row(text: str, solar_time: SolarTime, gender: int) -> List[Any]:
+    """
+    单个出生时间的八字概要行.
+    """
+    calculator = get_bazi_calculator()
+    engine = calculator.engine
+    lunar_time = engine.solar_to_lunar(solar_time)
+    eight_char = engine.build_eight_char(solar_time)
+    structure = calculator.professional_analyzer.analyze_eight_char_structure(
+        eight_char.to_dict()
+    )
+    balance = structure["wuxing_balance"]
+    return [
+        text,
+        ["女", "男"][gender],
+        engine.format_solar_time(solar_time),
+        str(lunar_time),
+        str(eight_char),
+        eight_char.day.heaven_stem.name,
+        # 生肖以春节为界，不是立春
+        get_lunar_cache().lunar_of(solar_time).getYearShengXiao(),
+        eight_char.day.sound,
+        structure["strength"]["level"],
+        "、".join(structure["useful_god"]["useful_gods"]),
+        balance["strongest"],
+        balance["weakest"],
+    ]
+
+
+def build_calendar_row(text: str, solar_time: SolarTime, gender: int) -> List[Any]:
+    """
+    单日黄历概要行.
+    """
+    calendar = get_bazi_engine().get_chinese_calendar(solar_time)
+    festivals = [f for f in (calendar.lunar_festival, calendar.solar_festival) if f]
+    return [
+        text,
+        calendar.solar_date,
+        calendar.lunar_date,
+        calendar.gan_zhi,
+        calendar.clash,
+        calendar.suitable,
+        calendar.avoid,
+        calendar.solar_term,
+        ", ".join(festivals),
+    ]
+
+
+ROW_BUILDERS = {"bazi": build_bazi_row, "calendar": build_calendar_row}
+
+
+def _solar_key(solar_time: SolarTime) -> Tuple[int, ...]:
+    return (
+        solar_time.year,
+        solar_time.month,
+        solar_time.day,
+        solar_time.hour,
+        solar_time.minute,
+        solar_time.second,
+    )
+
+
+def analyze_items(
+    mode: str, items: List[BatchItem]
+) -> Tuple[List[Tuple[int, List[Any]]], List[Dict[str, Any]]]:
+    """按时间顺序逐项计算，返回 (序号, 行) 列表和错误列表.
+
+    也是进程池的任务入口，必须保持为模块级函数.
+    """
+    build_row = ROW_BUILDERS[mode]
+    rows = []
+    errors = []
+    for index, text, solar_time, gender in sorted(
+        items, key=lambda item: _solar_key(item[2])
+    ):
+        try:
+            rows.append((index, build_row(text, solar_time, gender)))
+        except Exception as e:
+            errors.append({"index": index, "input": text, "message": str(e)})
+    return rows, errors
+
+
+def _pool_workers(item_count: int, workers: int) -> int:
+    """
+    实际使用的进程数，1 表示在当前进程内计算.
+    """
+    # 打包后的程序没有可供子进程重新导入的入口
+    if getattr(sys, "frozen", False) or item_count < PROCESS_POOL_MIN_ITEMS:
+        return 1
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    return max(1, min(workers, MAX_POOL_WORKERS, item_count))
+
+
+def _run_in_pool(
+    mode: str, items: List[BatchItem], workers: int
+) -> Tuple[List[Tuple[int, List[Any]]], List[Dict[str, Any]]]:
+    """
+    按时间排序后切成连续分段，每个进程处理相邻年份.
+    """
+    items = sorted(items, key=lambda item: _solar_key(item[2]))
+    chunk_size = -(-len(items) // workers)
+    chunks = [items[i : i + chunk_size] for i in range(0, len(items), chunk_size)]
+
+    rows = []
+    errors = []
+    with ProcessPoolExecutor(
+        max_workers=len(chunks), mp_context=get_context("spawn")
+    ) as executor:
+        for chunk_rows, chunk_errors in executor.map(
+            analyze_items, [mode] * len(chunks), chunks
+        ):
+            rows.extend(chunk_rows)
+            errors.extend(chunk_errors)
+    return rows, errors
+
+
+def run_batch(
+    mode: str, inputs: List[str], gender: int = 1, workers: int = 0
+) -> Dict[str, Any]:
+    """批量计算并组装表格结果.
+
+    workers 为 0 时按CPU数决定进程数，为 1 时始终在当前进程内计算；
+    条目数不足 PROCESS_POOL_MIN_ITEMS 时总是在当前进程内计算.
+    """
+    if mode not in ROW_BUILDERS:
+        raise ValueError(f"不支持的模式: {mode}，可选 bazi、calendar")
+    if not inputs:
+        raise ValueError("没有需要分析的时间")
+    if len(inputs) > MAX_BATCH_ITEMS:
+        raise ValueError(f"共{len(inputs)}项，超过单次上限{MAX_BATCH_ITEMS}项")
+
+    items, errors = parse_batch_items(inputs, gender)
+    pool_workers = _pool_workers(len(items), workers)
+
+    rows = []
+    if pool_workers > 1:
+        try:
+            rows, item_errors = _run_in_pool(mode, items, pool_workers)
+        except Exception as e:
+            # 进程池不可用时退回当前进程
+            logger.warning(f"进程池批量计算失败，改为单进程计算: {e}")
+            pool_workers = 1
+    if pool_workers <= 1:
+        rows, item_errors = analyze_items(mode, items)
+    errors.extend(item_errors)
+
+    rows.sort(key=lambda row: row[0])
+    errors.sort(key=lambda error: error["index"])
+    return {
+        "mode": mode,
+        "total": len(inputs),
+        "succeeded": len(rows),
+        "workers": pool_workers,
+        "columns": BATCH_COLUMNS[mode],
+        "rows": [row for _, row in rows],
+        "errors": errors,
+    }
+
+
+async def batch_analyze(args: Dict[str, Any]) -> str:
+    """
+    批量分析多个出生时间或一段日期.
+    """
+    try:
+        mode = (args.get("mode") or "bazi").strip()
+        solar_datetimes = args.get("solar_datetimes") or ""
+        start_date = args.get("start_date") or ""
+        end_date = args.get("end_date") or ""
+        hour = args.get("hour", 12)
+        gender = args.get("gender", 1)
+        workers = args.get("workers", 0)
+
+        if solar_datetimes and (start_date or end_date):
+            return json.dumps(
+                {
+                    "success": False,
+                    "message": "solar_datetimes与start_date/end_date只能传其中一种",
+                },
+                ensure_ascii=False,
+            )
+
+        if solar_datetimes:
+            inputs = split_datetimes(solar_datetimes)
+        elif start_date and end_date:
+            inputs = expand_date_range(start_date, end_date, hour)
+        else:
+            return json.dumps(
+                {
+                    "success": False,
+                    "message": "请传入solar_datetimes，或同时传入start_date和end_date",
+                },
+                ensure_ascii=False,
+            )
+
+        result = await asyncio.to_thread(run_batch, mode, inputs, gender, workers)
+
+        return json.dumps({"success": True, "data": result}, ensure_ascii=False)
+
+    except Exception as e:
+        logger.error(f"批量八字分析失败: {e}")
+        return json.dumps(
+            {"success": False, "message": f"批量八字分析失败: {str(e)}"},
+            ensure_ascii=False,
+        )
+
@@ -5,8 +5,22 @@
 from typing import Any, Dict, List, Optional
 
 from .engine import get_bazi_engine
+from .lunar_cache import get_lunar_cache
 from .models import BaziAnalysis, EightChar, LunarTime, SolarTime
 from .professional_analyzer import get_professional_analyzer
+from .professional_data import (
+    GAN,
+    GAN_INDEX,
+    GAN_YINYANG,
+    ZHI,
+    ZHI_CANG_GAN,
+    ZHI_INDEX,
+    analyze_zhi_combinations,
+    get_changsheng_state,
+    get_shensha,
+    get_ten_gods_relation,
+)
+from .solar_index import get_sexagenary_index
 
 
 class BaziCalculator:
@@ -36,7 +50,7 @@ class BaziCalculator:
         """
         计算十神关系.
         """
-        return self.professional_analyzer.get_ten_gods_analysis(day_master, other_stem)
+        return get_ten_gods_relation(day_master, other_stem)
 
     def build_sixty_cycle_object(
         self, sixty_cycle, day_master: Optional[str] = None
@@ -88,8 +102,6 @@ class BaziCalculator:
         """
         计算十二长生.
         """
-        from .professional_data import get_changsheng_state
-
         return get_changsheng_state(stem, branch)
 
     def build_gods_object(
@@ -98,8 +110,6 @@ class BaziCalculator:
         """
         构建神煞对象.
         """
-        from .professional_data import get_shensha
-
         # 获取八字干支
         eight_char.year.heaven_stem.name
         eight_char.month.heaven_stem.name
@@ -218,8 +228,6 @@ class BaziCalculator:
             fortune_zhi = fortune_gz[1]
 
             # 计算地支藏干的十神关系
-            from .professional_data import ZHI_CANG_GAN
-
             zhi_ten_gods = []
             zhi_canggan = []
 
@@ -257,8 +265,6 @@ class BaziCalculator:
         """
         计算大运干支.
         """
-        from .professional_data import GAN, ZHI
-
         # 确定大运方向：阳男阴女顺行，阴男阳女逆行
         if (gender == 1 and year_yin_yang == 1) or (
             gender == 0 and year_yin_yang == -1
@@ -270,8 +276,8 @@ class BaziCalculator:
             direction = -1
 
         # 从月柱开始计算大运
-        month_gan_idx = GAN.index(month_gan)
-        month_zhi_idx = ZHI.index(month_zhi)
+        month_gan_idx = GAN_INDEX[month_gan]
+        month_zhi_idx = ZHI_INDEX[month_zhi]
 
         # 计算当前大运的干支索引
         fortune_gan_idx = (month_gan_idx + step * direction) % 10
@@ -427,17 +433,7 @@ class BaziCalculator:
         """
         try:
             # 使用lunar-python进行真正的农历公历转换
-            from lunar_python import Lunar
-
-            lunar = Lunar.fromYmdHms(
-                lunar_time.year,
-                lunar_time.month,
-                lunar_time.day,
-                lunar_time.hour,
-                lunar_time.minute,
-                lunar_time.second,
-            )
-            solar = lunar.getSolar()
+            solar = get_lunar_cache().lunar_of(lunar_time).getSolar()
 
             return SolarTime(
                 year=solar.getYear(),
@@ -454,18 +450,16 @@ class BaziCalculator:
         """
         计算胎元.
         """
-        from .professional_data import GAN, ZHI
-
         # 胎元 = 月柱天干进一位 + 月柱地支进三位
         month_gan = eight_char.month.heaven_stem.name
         month_zhi = eight_char.month.earth_branch.name
 
         # 天干进一位
-        gan_idx = GAN.index(month_gan)
+        gan_idx = GAN_INDEX[month_gan]
         fetal_gan = GAN[(gan_idx + 1) % 10]
 
         # 地支进三位
-        zhi_idx = ZHI.index(month_zhi)
+        zhi_idx = ZHI_INDEX[month_zhi]
         fetal_zhi = ZHI[(zhi_idx + 3) % 12]
 
         return f"{fetal_gan}{fetal_zhi}"
@@ -474,15 +468,13 @@ class BaziCalculator:
         """
         计算胎息.
         """
-        from .professional_data import GAN, ZHI
-
         # 胎息 = 日柱干支阴阳相配
         day_gan = eight_char.day.heaven_stem.name
         day_zhi = eight_char.day.earth_branch.name
 
         # 取对应阴阳干支
-        gan_idx = GAN.index(day_gan)
-        zhi_idx = ZHI.index(day_zhi)
+        gan_idx = GAN_INDEX[day_gan]
+        zhi_idx = ZHI_INDEX[day_zhi]
 
         # 阴阳转换（奇偶相转）
         breath_gan = GAN[(gan_idx + 1) % 10 if gan_idx % 2 == 0 else (gan_idx - 1) % 10]
@@ -494,14 +486,12 @@ class BaziCalculator:
         """
         计算命宫.
         """
-        from .professional_data import GAN, ZHI
-
         # 命宫计算：寅宫起正月，顺数至本生月，再从卯时起逆数本生时，所得即命宫
         month_zhi = eight_char.month.earth_branch.name
         hour_zhi = eight_char.hour.earth_branch.name
 
-        month_idx = ZHI.index(month_zhi)
-        hour_idx = ZHI.index(hour_zhi)
+        month_idx = ZHI_INDEX[month_zhi]
+        hour_idx = ZHI_INDEX[hour_zhi]
 
         # 寅宫起正月，顺数到本生月
         ming_gong_num = (month_idx - 2) % 12  # 寅=0，卯=1...
@@ -521,14 +511,12 @@ class BaziCalculator:
         """
         计算身宫.
         """
-        from .professional_data import GAN, ZHI
-
         # 身宫计算：从月支顺数到时支
         month_zhi = eight_char.month.earth_branch.name
         hour_zhi = eight_char.hour.earth_branch.name
 
-        month_idx = ZHI.index(month_zhi)
-        hour_idx = ZHI.index(hour_zhi)
+        month_idx = ZHI_INDEX[month_zhi]
+        hour_idx = ZHI_INDEX[hour_zhi]
 
         # 从月支顺数到时支的地支数
         shen_gong_idx = (month_idx + hour_idx) % 12
@@ -543,8 +531,6 @@ class BaziCalculator:
         """
         构建刑冲合会关系.
         """
-        from .professional_data import analyze_zhi_combinations
-
         # 提取四柱地支
         zhi_list = [
             eight_char.year.earth_branch.name,
@@ -567,115 +553,38 @@ class BaziCalculator:
 
     def get_solar_times(self, bazi: str) -> List[str]:
         """
-        根据八字获取可能的公历时间.
+        根据八字获取可能的公历时间（干支索引查找，结果与逐日遍历一致）.
         """
+        self._validate_bazi(bazi)
+        return get_sexagenary_index().find_solar_times(bazi, limit=20)
+
+    def _validate_bazi(self, bazi: str):
         pillars = bazi.split(" ")
         if len(pillars) != 4:
             raise ValueError("八字格式错误")
-
-        year_pillar, month_pillar, day_pillar, hour_pillar = pillars
-
-        # 解析八字柱
-        if (
-            len(year_pillar) != 2
-            or len(month_pillar) != 2
-            or len(day_pillar) != 2
-            or len(hour_pillar) != 2
-        ):
+        if any(len(pillar) != 2 for pillar in pillars):
             raise ValueError("八字格式错误，每柱应为两个字符")
 
-        year_gan, year_zhi = year_pillar[0], year_pillar[1]
-        month_gan, month_zhi = month_pillar[0], month_pillar[1]
-        day_gan, day_zhi = day_pillar[0], day_pillar[1]
-        hour_gan, hour_zhi = hour_pillar[0], hour_pillar[1]
-
-        result_times = []
-
-        # 扩大搜索范围：1900-2100年，并优化搜索策略
-        for year in range(1900, 2100):
-            try:
-                # 尝试匹配年柱
-                if self._match_year_pillar(year, year_gan, year_zhi):
-                    # 遍历月份
-                    for month in range(1, 13):
-                        if self._match_month_pillar(year, month, month_gan, month_zhi):
-                            # 遍历日期，使用更精确的日期范围
-                            import calendar
-
-                            max_day = calendar.monthrange(year, month)[1]
-
-                            for day in range(1, max_day + 1):
-                                try:
-                                    if self._match_day_pillar(
-                                        year, month, day, day_gan, day_zhi
-                                    ):
-                                        # 遍历时辰，使用每个时辰的中心点
-                                        for hour in [
-                                            0,
-                                            2,
-                                            4,
-                                            6,
-                                            8,
-                                            10,
-                                            12,
-                                            14,
-                                            16,
-                                            18,
-                                            20,
-                                            22,
-                                        ]:  # 12个时辰的中心点
-                                            if self._match_hour_pillar(
-                                                hour,
-                                                hour_gan,
-                                                hour_zhi,
-                                                year,
-                                                month,
-                                                day,
-                                            ):
-                                                solar_time = f"{year}-{month:02d}-{day:02d} {hour:02d}:00:00"
-                                                result_times.append(solar_time)
-
-                                                # 适当增加返回数量限制
-                                                if len(result_times) >= 20:
-                                                    return result_times
-                                except ValueError:
-                                    continue  # 无效日期跳过
-            except Exception:
-                continue
-
-        return result_times[:20]  # 返回前20个匹配结果
-
     def _calculate_start_age(
         self, solar_time: SolarTime, eight_char: EightChar, gender: int
     ) -> int:
         """
         计算起运年龄.
         """
-        from lunar_python import Solar
-
-        from .professional_data import GAN_YINYANG
-
         # 获取年柱干支阴阳
         year_gan = eight_char.year.heaven_stem.name
         year_gan_yinyang = GAN_YINYANG.get(year_gan, 1)
 
         try:
-            # 创建出生时间的Solar对象
-            birth_solar = Solar.fromYmdHms(
-                solar_time.year,
-                solar_time.month,
-                solar_time.day,
-                solar_time.hour,
-                solar_time.minute,
-                solar_time.second,
-            )
+            # 出生时间的Lunar/Solar对象
+            lunar = get_lunar_cache().lunar_of(solar_time)
+            birth_solar = lunar.getSolar()
 
             # 起运规则：阳男阴女顺行，阴男阳女逆行
             if (gender == 1 and year_gan_yinyang == 1) or (
                 gender == 0 and year_gan_yinyang == -1
             ):
                 # 顺行：计算出生到下一个节气的天数
-                lunar = birth_solar.getLunar()
                 next_jieqi = lunar.getNextJieQi()
 
                 if next_jieqi:
@@ -691,7 +600,6 @@ class BaziCalculator:
                     start_age = 3  # 默认值
             else:
                 # 逆行：计算上一个节气到出生的天数
-                lunar = birth_solar.getLunar()
                 prev_jieqi = lunar.getPrevJieQi()
 
                 if prev_jieqi:
@@ -896,148 +804,12 @@ class BaziCalculator:
         except Exception:
             return 3  # 默认值
 
-    def _match_year_pillar(self, year: int, gan: str, zhi: str) -> bool:
-        """匹配年柱 - 修复版本，考虑立春节气"""
-        try:
-            from lunar_python import Solar
-
-            # 年柱以立春为界，需要检查立春前后的年柱
-            # 检查年初（立春前）
-            solar_start = Solar.fromYmdHms(year, 1, 1, 0, 0, 0)
-            lunar_start = solar_start.getLunar()
-            bazi_start = lunar_start.getEightChar()
-
-            # 检查年中（立春后）
-            solar_mid = Solar.fromYmdHms(year, 6, 1, 0, 0, 0)
-            lunar_mid = solar_mid.getLunar()
-            bazi_mid = lunar_mid.getEightChar()
-
-            # 检查年末
-            solar_end = Solar.fromYmdHms(year, 12, 31, 23, 59, 59)
-            lunar_end = solar_end.getLunar()
-            bazi_end = lunar_end.getEightChar()
-
-            # 如果年中任何一个时间点的年柱匹配，就认为匹配
-            year_gans = [
-                bazi_start.getYearGan(),
-                bazi_mid.getYearGan(),
-                bazi_end.getYearGan(),
-            ]
-            year_zhis = [
-                bazi_start.getYearZhi(),
-                bazi_mid.getYearZhi(),
-                bazi_end.getYearZhi(),
-            ]
-
-            for i in range(len(year_gans)):
-                if year_gans[i] == gan and year_zhis[i] == zhi:
-                    return True
-
-            return False
-        except Exception:
-            return False
-
-    def _match_month_pillar(self, year: int, month: int, gan: str, zhi: str) -> bool:
-        """匹配月柱 - 修复版本，考虑节气边界"""
-        try:
-            from lunar_python import Solar
-
-            # 月柱以节气为界，检查月中几个时间点
-            # 月初、月中、月末的月柱可能不同，需要都检查
-            test_days = [1, 8, 15, 22, 28]  # 检查多个日期
-
-            month_pillars = set()
-            for day in test_days:
-                try:
-                    # 确保日期有效
-                    import calendar
-
-                    max_day = calendar.monthrange(year, month)[1]
-                    if day > max_day:
-                        day = max_day
-
-                    solar = Solar.fromYmdHms(year, month, day, 12, 0, 0)
-                    lunar = solar.getLunar()
-                    bazi = lunar.getEightChar()
-
-                    month_gan = bazi.getMonthGan()
-                    month_zhi = bazi.getMonthZhi()
-                    month_pillars.add(f"{month_gan}{month_zhi}")
-                except Exception:
-                    continue
-
-            # 如果月中任何一天的月柱匹配，就认为匹配
-            target_pillar = f"{gan}{zhi}"
-            return target_pillar in month_pillars
-
-        except Exception:
-            return False
-
-    def _match_day_pillar(
-        self, year: int, month: int, day: int, gan: str, zhi: str
-    ) -> bool:
-        """
-        匹配日柱.
-        """
-        try:
-            from lunar_python import Solar
-
-            solar = Solar.fromYmdHms(year, month, day, 0, 0, 0)
-            lunar = solar.getLunar()
-            bazi = lunar.getEightChar()
-
-            day_gan = bazi.getDayGan()
-            day_zhi = bazi.getDayZhi()
-
-            return day_gan == gan and day_zhi == zhi
-        except Exception:
-            return False
-
-    def _match_hour_pillar(
-        self,
-        hour: int,
-        gan: str,
-        zhi: str,
-        year: int = None,
-        month: int = None,
-        day: int = None,
-    ) -> bool:
-        """匹配时柱 - 修复版本，使用实际日期"""
-        try:
-            from lunar_python import Solar
-
-            # 使用实际日期或默认日期配合时辰
-            use_year = year if year else 2024
-            use_month = month if month else 1
-            use_day = day if day else 1
-
-            solar = Solar.fromYmdHms(use_year, use_month, use_day, hour, 0, 0)
-            lunar = solar.getLunar()
-            bazi = lunar.getEightChar()
-
-            hour_gan = bazi.getTimeGan()
-            hour_zhi = bazi.getTimeZhi()
-
-            return hour_gan == gan and hour_zhi == zhi
-        except Exception:
-            return False
-
     def _get_zodiac_by_lunar_year(self, solar_time: SolarTime) -> str:
         """
         根据农历年份获取生肖（以春节为界，不是立春）
         """
         try:
-            from lunar_python import Solar
-
-            solar = Solar.fromYmdHms(
-                solar_time.year,
-                solar_time.month,
-                solar_time.day,
-                solar_time.hour,
-                solar_time.minute,
-                solar_time.second,
-            )
-            lunar = solar.getLunar()
+            lunar = get_lunar_cache().lunar_of(solar_time)
 
             # 使用lunar-python直接获取农历生肖（以春节为界）
             return lunar.getYearShengXiao()
@@ -6,8 +6,8 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 import pendulum
-from lunar_python import Lunar, Solar
 
+from .lunar_cache import get_lunar_cache
 from .models import (
     ChineseCalendar,
     EarthBranch,
@@ -19,13 +19,44 @@ from .models import (
 )
 from .professional_data import (
     GAN,
+    GAN_INDEX,
     GAN_WUXING,
     GAN_YINYANG,
     SHENG_XIAO,
     ZHI,
     ZHI_CANG_GAN,
+    ZHI_INDEX,
     ZHI_WUXING,
     ZHI_YINYANG,
+    get_nayin,
+)
+
+# 六旬的旬首
+XUN_STARTS = ["甲子", "甲戌", "甲申", "甲午", "甲辰", "甲寅"]
+
+# 六旬的空亡地支
+KONG_WANG_BRANCHES = [
+    ("戌", "亥"),  # 甲子旬
+    ("申", "酉"),  # 甲戌旬
+    ("午", "未"),  # 甲申旬
+    ("辰", "巳"),  # 甲午旬
+    ("寅", "卯"),  # 甲辰旬
+    ("子", "丑"),  # 甲寅旬
+]
+
+
+def _xun_index(gan_idx: int, zhi_idx: int) -> int:
+    # 六十甲子序号（从1开始）所在的旬
+    jiazi_number = (gan_idx * 6 + zhi_idx * 5) % 60 or 60
+    return (jiazi_number - 1) // 10
+
+
+# 旬、空亡 [天干][地支]
+XUN_TABLE = tuple(
+    tuple(XUN_STARTS[_xun_index(g, z)] for z in range(12)) for g in range(10)
+)
+KONG_WANG_TABLE = tuple(
+    tuple(KONG_WANG_BRANCHES[_xun_index(g, z)] for z in range(12)) for g in range(10)
 )
 
 
@@ -140,15 +171,7 @@ class BaziEngine:
         """
         try:
             # 使用lunar-python进行真正的公历农历转换
-            solar = Solar.fromYmdHms(
-                solar_time.year,
-                solar_time.month,
-                solar_time.day,
-                solar_time.hour,
-                solar_time.minute,
-                solar_time.second,
-            )
-            lunar = solar.getLunar()
+            lunar = get_lunar_cache().lunar_of(solar_time)
 
             # 判断是否为闰月
             is_leap = lunar.isLeap() if hasattr(lunar, "isLeap") else False
@@ -176,29 +199,8 @@ class BaziEngine:
         农历转公历 - 增强闰月处理.
         """
         try:
-            # 处理闰月
-            if lunar_time.is_leap:
-                # 如果是闰月，使用特殊方法创建农历对象
-                lunar = Lunar.fromYmdHms(
-                    lunar_time.year,
-                    -lunar_time.month,  # 闰月用负数表示
-                    lunar_time.day,
-                    lunar_time.hour,
-                    lunar_time.minute,
-                    lunar_time.second,
-                )
-            else:
-                # 普通月份
-                lunar = Lunar.fromYmdHms(
-                    lunar_time.year,
-                    lunar_time.month,
-                    lunar_time.day,
-                    lunar_time.hour,
-                    lunar_time.minute,
-                    lunar_time.second,
-                )
-
-            solar = lunar.getSolar()
+            # 闰月用负数月份表示
+            solar = get_lunar_cache().lunar_of(lunar_time).getSolar()
 
             return SolarTime(
                 year=solar.getYear(),
@@ -217,16 +219,7 @@ class BaziEngine:
         """
         try:
             # 使用lunar-python计算八字
-            solar = Solar.fromYmdHms(
-                solar_time.year,
-                solar_time.month,
-                solar_time.day,
-                solar_time.hour,
-                solar_time.minute,
-                solar_time.second,
-            )
-            lunar = solar.getLunar()
-            bazi = lunar.getEightChar()
+            bazi = get_lunar_cache().lunar_of(solar_time).getEightChar()
 
             # 获取年柱
             year_gan = bazi.getYearGan()
@@ -286,73 +279,25 @@ class BaziEngine:
         """
         获取纳音.
         """
-        from .professional_data import get_nayin
-
         return get_nayin(gan, zhi)
 
     def _get_ten(self, gan: str, zhi: str) -> str:
         """获取旬 - 使用六十甲子旬空算法"""
-        from .professional_data import GAN, ZHI
-
-        try:
-            # 使用标准的六十甲子计算方法
-            gan_idx = GAN.index(gan)
-            zhi_idx = ZHI.index(zhi)
-
-            # 计算在六十甲子中的序号（从1开始）
-            jiazi_number = (gan_idx * 6 + zhi_idx * 5) % 60
-            if jiazi_number == 0:
-                jiazi_number = 60
-
-            # 六旬的旬首
-            xun_starts = ["甲子", "甲戌", "甲申", "甲午", "甲辰", "甲寅"]
-
-            # 确定所在旬（每10个为一旬）
-            xun_index = (jiazi_number - 1) // 10
-
-            if 0 <= xun_index < len(xun_starts):
-                return xun_starts[xun_index]
-            else:
-                # 使用更精确的计算方法
-                return self._calculate_xun_by_position(jiazi_number)
-        except (ValueError, IndexError) as e:
-            print(f"旬计算失败: {gan}{zhi} - {e}")
+        g = GAN_INDEX.get(gan)
+        z = ZHI_INDEX.get(zhi)
+        if g is None or z is None:
+            print(f"旬计算失败: {gan}{zhi}")
             return "甲子"
+        return XUN_TABLE[g][z]
 
     def _get_kong_wang(self, gan: str, zhi: str) -> List[str]:
         """获取空亡 - 使用传统旬空算法"""
-        from .professional_data import GAN, ZHI
-
-        try:
-            gan_idx = GAN.index(gan)
-            zhi_idx = ZHI.index(zhi)
-
-            # 计算在六十甲子中的序号
-            jiazi_number = (gan_idx * 6 + zhi_idx * 5) % 60
-            if jiazi_number == 0:
-                jiazi_number = 60
-
-            # 确定所在旬
-            xun_index = (jiazi_number - 1) // 10
-
-            # 六旬的空亡地支
-            kong_wang_table = [
-                ["戌", "亥"],  # 甲子旬
-                ["申", "酉"],  # 甲戌旬
-                ["午", "未"],  # 甲申旬
-                ["辰", "巳"],  # 甲午旬
-                ["寅", "卯"],  # 甲辰旬
-                ["子", "丑"],  # 甲寅旬
-            ]
-
-            if 0 <= xun_index < len(kong_wang_table):
-                return kong_wang_table[xun_index]
-            else:
-                # 备用计算方法
-                return self._calculate_kong_wang_by_position(jiazi_number)
-        except (ValueError, IndexError) as e:
-            print(f"空亡计算失败: {gan}{zhi} - {e}")
+        g = GAN_INDEX.get(gan)
+        z = ZHI_INDEX.get(zhi)
+        if g is None or z is None:
+            print(f"空亡计算失败: {gan}{zhi}")
             return ["戌", "亥"]  # 默认返回甲子旬空亡
+        return list(KONG_WANG_TABLE[g][z])
 
     def format_solar_time(self, solar_time: SolarTime) -> str:
         """
@@ -378,15 +323,8 @@ class BaziEngine:
             )
 
         try:
-            solar = Solar.fromYmdHms(
-                solar_time.year,
-                solar_time.month,
-                solar_time.day,
-                solar_time.hour,
-                solar_time.minute,
-                solar_time.second,
-            )
-            lunar = solar.getLunar()
+            lunar = get_lunar_cache().lunar_of(solar_time)
+            solar = lunar.getSolar()
 
             # 获取详细信息
             bazi = lunar.getEightChar()
@@ -422,13 +360,9 @@ class BaziEngine:
         """
         根据六十甲子序号计算旬.
         """
-        # 从 professional_data.py 使用 GANZHI_60
-        # 每旬的旬首
-        xun_starts = ["甲子", "甲戌", "甲申", "甲午", "甲辰", "甲寅"]
-
         xun_index = (jiazi_number - 1) // 10
-        if 0 <= xun_index < len(xun_starts):
-            return xun_starts[xun_index]
+        if 0 <= xun_index < len(XUN_STARTS):
+            return XUN_STARTS[xun_index]
         else:
             return "甲子"
 
@@ -436,19 +370,9 @@ class BaziEngine:
         """
         根据六十甲子序号计算空亡.
         """
-        # 六旬的空亡地支
-        kong_wang_table = [
-            ["戌", "亥"],  # 甲子旬
-            ["申", "酉"],  # 甲戌旬
-            ["午", "未"],  # 甲申旬
-            ["辰", "巳"],  # 甲午旬
-            ["寅", "卯"],  # 甲辰旬
-            ["子", "丑"],  # 甲寅旬
-        ]
-
         xun_index = (jiazi_number - 1) // 10
-        if 0 <= xun_index < len(kong_wang_table):
-            return kong_wang_table[xun_index]
+        if 0 <= xun_index < len(KONG_WANG_BRANCHES):
+            return list(KONG_WANG_BRANCHES[xun_index])
         else:
             return ["戌", "亥"]
 
@@ -457,15 +381,8 @@ class BaziEngine:
         获取详细的农历信息.
         """
         try:
-            solar = Solar.fromYmdHms(
-                solar_time.year,
-                solar_time.month,
-                solar_time.day,
-                solar_time.hour,
-                solar_time.minute,
-                solar_time.second,
-            )
-            lunar = solar.getLunar()
+            lunar = get_lunar_cache().lunar_of(solar_time)
+            solar = lunar.getSolar()
 
             # 获取节气信息
             current_jieqi = lunar.getJieQi()
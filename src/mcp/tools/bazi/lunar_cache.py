@@ -0,0 +1,142 @@
+"""
+公历/农历转换缓存.
+
+lunar_python 每次 Solar.getLunar() 都会重新计算所在农历年的节气表（LunarYear 只缓存最近一年），
+一次八字分析会对同一时间转换多次，合婚、批量分析还会在不同年份之间来回切换。
+这里按时间缓存转换得到的 Lunar 对象（其 getSolar()、getEightChar() 也随之复用），
+引擎、计算器共用一个有界 LRU 缓存.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Tuple, Union
+
+from lunar_python import Lunar, Solar
+
+from .models import LunarTime, SolarTime
+
+# 默认缓存条目数，每条约数KB
+LUNAR_CACHE_SIZE = 2048
+
+
+class LunarCache:
+    """
+    Lunar 对象的 LRU 缓存，maxsize 为 0 时不缓存.
+    """
+
+    def __init__(self, maxsize: int = LUNAR_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._cache: "OrderedDict[Tuple, Lunar]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def from_solar(
+        self,
+        year: int,
+        month: int,
+        day: int,
+        hour: int = 0,
+        minute: int = 0,
+        second: int = 0,
+    ) -> Lunar:
+        """
+        公历时间对应的 Lunar 对象.
+        """
+        key = ("solar", year, month, day, hour, minute, second)
+        lunar = self._get(key)
+        if lunar is None:
+            lunar = Solar.fromYmdHms(year, month, day, hour, minute, second).getLunar()
+            self._put(key, lunar)
+        return lunar
+
+    def from_lunar(
+        self,
+        year: int,
+        month: int,
+        day: int,
+        hour: int = 0,
+        minute: int = 0,
+        second: int = 0,
+    ) -> Lunar:
+        """
+        农历时间对应的 Lunar 对象，闰月用负数月份表示.
+        """
+        key = ("lunar", year, month, day, hour, minute, second)
+        lunar = self._get(key)
+        if lunar is None:
+            lunar = Lunar.fromYmdHms(year, month, day, hour, minute, second)
+            self._put(key, lunar)
+        return lunar
+
+    def lunar_of(self, time: Union[SolarTime, LunarTime]) -> Lunar:
+        """
+        按 SolarTime / LunarTime 取 Lunar 对象.
+        """
+        if isinstance(time, LunarTime):
+            month = -time.month if time.is_leap else time.month
+            return self.from_lunar(
+                time.year, month, time.day, time.hour, time.minute, time.second
+            )
+        return self.from_solar(
+            time.year, time.month, time.day, time.hour, time.minute, time.second
+        )
+
+    def _get(self, key: Tuple):
+        if self.maxsize <= 0:
+            self._misses += 1
+            return None
+        with self._lock:
+            lunar = self._cache.get(key)
+            if lunar is None:
+                self._misses += 1
+                return None
+            self._cache.move_to_end(key)
+            self._hits += 1
+            return lunar
+
+    def _put(self, key: Tuple, lunar: Lunar):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._cache[key] = lunar
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self):
+        """
+        清空缓存和统计.
+        """
+        with self._lock:
+            self._cache.clear()
+            self._hits = self._misses = self._evictions = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取命中率统计.
+        """
+        total = self._hits + self._misses
+        return {
+            "size": len(self._cache),
+            "maxsize": self.maxsize,
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "hit_rate": round(self._hits / total, 3) if total else 0.0,
+        }
+
+
+_lunar_cache = None
+
+
+def get_lunar_cache() -> LunarCache:
+    """
+    获取转换缓存单例.
+    """
+    global _lunar_cache
+    if _lunar_cache is None:
+        _lunar_cache = LunarCache()
+    return _lunar_cache
@@ -21,6 +21,7 @@ class BaziManager:
         """
         初始化并注册所有八字命理工具。
         """
+        from .batch_tools import batch_analyze
         from .marriage_tools import (
             analyze_marriage_compatibility,
             analyze_marriage_timing,
@@ -252,6 +253,54 @@ class BaziManager:
             )
         )
 
+        # 批量分析
+        batch_analyze_props = PropertyList(
+            [
+                Property("mode", PropertyType.STRING, default_value="bazi"),
+                Property("solar_datetimes", PropertyType.STRING, default_value=""),
+                Property("start_date", PropertyType.STRING, default_value=""),
+                Property("end_date", PropertyType.STRING, default_value=""),
+                Property(
+                    "hour",
+                    PropertyType.INTEGER,
+                    default_value=12,
+                    min_value=0,
+                    max_value=23,
+                ),
+                Property("gender", PropertyType.INTEGER, default_value=1),
+                Property("workers", PropertyType.INTEGER, default_value=0),
+            ]
+        )
+        add_tool(
+            (
+                "self.bazi.batch_analyze",
+                "一次调用批量分析多个出生时间或一段日期，以表格形式（columns + rows）返回概要结果。"
+                "需要对比多人八字或逐日择日时使用，避免逐个调用单项工具。\n"
+                "使用场景：\n"
+                "1. 对比多位家人的八字、日主、强弱和用神\n"
+                "2. 查看本月/某段时间每天的黄历宜忌，挑选吉日\n"
+                "3. 比较同一天不同时辰出生的八字差异\n"
+                "\n功能特点：\n"
+                "- 支持时间列表或日期范围两种输入\n"
+                "- bazi模式返回八字概要，calendar模式返回每日黄历概要\n"
+                "- 单项出错不影响其他结果，错误单独列出\n"
+                "- 单次最多1000项\n"
+                "\n参数说明：\n"
+                "  mode: 'bazi'（八字概要，默认）或'calendar'（黄历概要）\n"
+                "  solar_datetimes: 多个公历时间，用换行或分号分隔，"
+                "可写成'时间|性别'单独指定性别，如'1990-05-15 14:30|0; 1988-01-02 08:00|1'\n"
+                "  start_date: 日期范围起点，如'2025-06-01'\n"
+                "  end_date: 日期范围终点（含），如'2025-06-30'\n"
+                "  hour: 日期范围内每天使用的时刻（0-23），默认12\n"
+                "  gender: 默认性别，0=女性，1=男性\n"
+                "  workers: 进程数，0=自动（默认），1=不使用多进程；"
+                "少于500项时总是单进程计算\n"
+                "\n注意：solar_datetimes与start_date/end_date只传其中一种",
+                batch_analyze_props,
+                batch_analyze,
+            )
+        )
+
 
 # 全局管理器实例
 _bazi_manager = None
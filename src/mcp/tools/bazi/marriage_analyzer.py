@@ -2,9 +2,26 @@
 八字婚姻分析扩展模块 专门用于婚姻时机、配偶信息等分析.
 """
 
-from typing import Any, Dict, List
-
-from .professional_data import TAOHUA_XING, WUXING, get_ten_gods_relation
+from typing import Any, Dict, List, Optional
+
+from .professional_data import (
+    CHANGSHENG_TWELVE,
+    GAN_WUXING,
+    HUAGAI_XING,
+    TAOHUA_XING,
+    TIANYI_GUIREN,
+    WUXING,
+    WUXING_RELATIONS,
+    YIMA_XING,
+    ZHI_CANG_GAN,
+    ZHI_RELATIONS,
+    ZHI_SAN_HE,
+    ZHI_SAN_HUI,
+    ZHI_WUXING,
+    analyze_zhi_combinations,
+    get_changsheng_state,
+    get_ten_gods_relation,
+)
 
 
 class MarriageAnalyzer:
@@ -24,17 +41,21 @@ class MarriageAnalyzer:
         """
         分析婚姻时机.
         """
+        # 夫妻星分析被多个子项复用，只计算一次
+        star_analysis = self._analyze_marriage_star(eight_char_data, gender)
         result = {
-            "marriage_star_analysis": self._analyze_marriage_star(
-                eight_char_data, gender
+            "marriage_star_analysis": star_analysis,
+            "marriage_age_range": self._predict_marriage_age(
+                eight_char_data, gender, star_analysis
             ),
-            "marriage_age_range": self._predict_marriage_age(eight_char_data, gender),
             "favorable_years": self._get_favorable_marriage_years(
                 eight_char_data, gender
             ),
-            "marriage_obstacles": self._analyze_marriage_obstacles(eight_char_data),
+            "marriage_obstacles": self._analyze_marriage_obstacles(
+                eight_char_data, star_analysis if gender == 1 else None
+            ),
             "spouse_characteristics": self._analyze_spouse_features(
-                eight_char_data, gender
+                eight_char_data, gender, star_analysis
             ),
             "marriage_quality": self._evaluate_marriage_quality(
                 eight_char_data, gender
@@ -48,8 +69,6 @@ class MarriageAnalyzer:
         """
         分析夫妻星.
         """
-        from .professional_data import ZHI_CANG_GAN, get_changsheng_state
-
         gender_key = "male" if gender == 1 else "female"
         target_gods = self.marriage_gods[gender_key]
 
@@ -132,20 +151,14 @@ class MarriageAnalyzer:
         }
 
     def _predict_marriage_age(
-        self, eight_char_data: Dict[str, Any], gender: int
+        self,
+        eight_char_data: Dict[str, Any],
+        gender: int,
+        star_analysis: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         """
         预测结婚年龄段.
         """
-        from .professional_data import (
-            CHANGSHENG_TWELVE,
-            GAN_WUXING,
-            HUAGAI_XING,
-            TIANYI_GUIREN,
-            WUXING_RELATIONS,
-            ZHI_WUXING,
-        )
-
         day_gan = self._extract_gan_from_pillar(eight_char_data.get("day", {}))
         day_zhi = self._extract_zhi_from_pillar(eight_char_data.get("day", {}))
         self._extract_gan_from_pillar(eight_char_data.get("month", {}))
@@ -178,7 +191,11 @@ class MarriageAnalyzer:
             factors["detailed_analysis"].append("日支四库主稳重，感情发展较慢")
 
         # 2. 夫妻星分析
-        marriage_star_analysis = self._analyze_marriage_star(eight_char_data, gender)
+        marriage_star_analysis = star_analysis
+        if marriage_star_analysis is None:
+            marriage_star_analysis = self._analyze_marriage_star(
+                eight_char_data, gender
+            )
         star_strength = marriage_star_analysis.get("star_strength", "弱")
         marriage_star_analysis.get("star_count", 0)
 
@@ -298,8 +315,6 @@ class MarriageAnalyzer:
         """
         获取有利的结婚年份 - 使用完整的地支关系分析.
         """
-        from .professional_data import YIMA_XING, ZHI_RELATIONS, ZHI_SAN_HE, ZHI_SAN_HUI
-
         day_zhi = eight_char_data.get("day", {}).get("earth_branch", {}).get("name", "")
         month_zhi = (
             eight_char_data.get("month", {}).get("earth_branch", {}).get("name", "")
@@ -386,8 +401,6 @@ class MarriageAnalyzer:
         """
         分析配偶宫（日支）对婚姻时机的影响.
         """
-        from .professional_data import WUXING_RELATIONS, ZHI_WUXING
-
         palace_analysis = {"age_adjustment": 0, "analysis": []}
 
         # 日支五行分析
@@ -464,12 +477,14 @@ class MarriageAnalyzer:
         else:
             return "较低"
 
-    def _analyze_marriage_obstacles(self, eight_char_data: Dict[str, Any]) -> List[str]:
+    def _analyze_marriage_obstacles(
+        self,
+        eight_char_data: Dict[str, Any],
+        male_star_analysis: Optional[Dict[str, Any]] = None,
+    ) -> List[str]:
         """
         分析婚姻阻碍.
         """
-        from .professional_data import HUAGAI_XING, analyze_zhi_combinations
-
         obstacles = []
 
         # 提取四柱地支
@@ -525,9 +540,10 @@ class MarriageAnalyzer:
             obstacles.extend(spouse_palace_obstacles)
 
         # 6. 夫妻星受克分析
-        marriage_star_analysis = self._analyze_marriage_star(
-            eight_char_data, 1
-        )  # 先用男性分析
+        marriage_star_analysis = male_star_analysis
+        if marriage_star_analysis is None:
+            # 先用男性分析
+            marriage_star_analysis = self._analyze_marriage_star(eight_char_data, 1)
         if marriage_star_analysis.get("star_count", 0) == 0:
             obstacles.append("八字无明显夫妻星，感情发展困难")
         elif marriage_star_analysis.get("star_strength") in ["弱", "无星"]:
@@ -572,8 +588,6 @@ class MarriageAnalyzer:
         """
         分析五行失衡对婚姻的影响.
         """
-        from .professional_data import GAN_WUXING, ZHI_WUXING
-
         obstacles = []
 
         # 收集所有五行
@@ -617,7 +631,10 @@ class MarriageAnalyzer:
         return obstacles
 
     def _analyze_spouse_features(
-        self, eight_char_data: Dict[str, Any], gender: int
+        self,
+        eight_char_data: Dict[str, Any],
+        gender: int,
+        star_analysis: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, str]:
         """
         分析配偶特征 - 使用五行生克分析.
@@ -638,7 +655,7 @@ class MarriageAnalyzer:
 
         # 夫妻星影响
         star_influence = self._analyze_marriage_star_spouse_influence(
-            eight_char_data, gender
+            eight_char_data, gender, star_analysis
         )
 
         # 综合分析
@@ -747,8 +764,6 @@ class MarriageAnalyzer:
         """
         分析五行对配偶特征的影响.
         """
-        from .professional_data import WUXING_RELATIONS, ZHI_WUXING
-
         day_element = ZHI_WUXING.get(day_zhi, "")
         month_element = ZHI_WUXING.get(month_zhi, "")
 
@@ -778,8 +793,6 @@ class MarriageAnalyzer:
         """
         分析藏干对配偶特征的影响.
         """
-        from .professional_data import GAN_WUXING, ZHI_CANG_GAN
-
         influence = {"appearance": ""}
 
         if day_zhi in ZHI_CANG_GAN:
@@ -805,12 +818,16 @@ class MarriageAnalyzer:
         return influence
 
     def _analyze_marriage_star_spouse_influence(
-        self, eight_char_data: Dict[str, Any], gender: int
+        self,
+        eight_char_data: Dict[str, Any],
+        gender: int,
+        star_analysis: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, str]:
         """
         分析夫妻星对配偶特征的影响.
         """
-        star_analysis = self._analyze_marriage_star(eight_char_data, gender)
+        if star_analysis is None:
+            star_analysis = self._analyze_marriage_star(eight_char_data, gender)
 
         influence = {"personality": "", "career": "", "relationship_mode": ""}
 
@@ -877,8 +894,6 @@ class MarriageAnalyzer:
         """
         评估配偶兼容性.
         """
-        from .professional_data import ZHI_RELATIONS
-
         compatibility_score = 70  # 基础分数
 
         # 检查地支关系
@@ -1071,8 +1086,6 @@ class MarriageAnalyzer:
         """
         获取天干五行.
         """
-        from .professional_data import GAN_WUXING
-
         return GAN_WUXING.get(gan, "")
 
     def _analyze_hidden_marriage_stars(
@@ -1149,8 +1162,6 @@ class MarriageAnalyzer:
         """
         获取季节性力量.
         """
-        from .professional_data import GAN_WUXING, WUXING_RELATIONS
-
         gan_element = GAN_WUXING.get(gan, "")
         month_element = GAN_WUXING.get(month_gan, "")
 
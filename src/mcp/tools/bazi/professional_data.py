@@ -814,6 +814,97 @@ CHANGSHENG_TWELVE = {
     },
 }
 
+# ==================== 整数查表 ====================
+# 由上面的数据表编译而来：天干、地支用序号表示，关系预先展开为 10×10、10×12、12×12
+# 数组，分析时只做数组下标访问
+
+GAN_INDEX = {gan: i for i, gan in enumerate(GAN)}
+ZHI_INDEX = {zhi: i for i, zhi in enumerate(ZHI)}
+
+
+def ganzhi_index(gan: str, zhi: str) -> int:
+    """
+    干支在六十甲子中的序号（甲子为0），非法组合返回 -1.
+    """
+    g = GAN_INDEX.get(gan)
+    z = ZHI_INDEX.get(zhi)
+    if g is None or z is None or g % 2 != z % 2:
+        return -1
+    # 满足 p%10==g 且 p%12==z 的唯一 p
+    return (6 * g - 5 * z) % 60
+
+
+# 十神 [日干][他干]
+TEN_GODS_TABLE = tuple(
+    tuple(TEN_GODS_MAP.get((a, b), "未知") for b in GAN) for a in GAN
+)
+
+# 长生十二宫 [天干][地支]
+CHANGSHENG_TABLE = tuple(
+    tuple(CHANGSHENG_TWELVE.get(gan, {}).get(zhi, "未知") for zhi in ZHI)
+    for gan in GAN
+)
+
+
+def _compile_zhi_relation(relation_type: str):
+    table = []
+    for zhi in ZHI:
+        relation = ZHI_RELATIONS[zhi].get(relation_type)
+        if relation is None:
+            targets = ()
+        elif isinstance(relation, tuple):
+            targets = relation
+        else:
+            targets = (relation,)
+        table.append(tuple(other in targets for other in ZHI))
+    return tuple(table)
+
+
+# 地支关系 {关系类型: [地支][地支] -> bool}
+ZHI_RELATION_TABLES = {
+    relation_type: _compile_zhi_relation(relation_type)
+    for relation_type in ZHI_RELATIONS["子"]
+}
+ZHI_CHONG_TABLE = ZHI_RELATION_TABLES["冲"]
+ZHI_XING_TABLE = ZHI_RELATION_TABLES["刑"]
+ZHI_HAI_TABLE = ZHI_RELATION_TABLES["害"]
+
+# 六合 [地支][地支] -> 五行（无则为空串），与 analyze_zhi_combinations 原有的组合键规则一致
+ZHI_LIUHE_TABLE = tuple(
+    tuple(ZHI_LIU_HE.get("".join(sorted([a, b])), "") for b in ZHI) for a in ZHI
+)
+
+
+def zhi_mask(zhi_list: List[str]) -> int:
+    """
+    地支集合的位掩码.
+    """
+    mask = 0
+    for zhi in zhi_list:
+        z = ZHI_INDEX.get(zhi)
+        if z is not None:
+            mask |= 1 << z
+    return mask
+
+
+# 三合、三会：(地支位掩码, 描述)
+ZHI_SAN_HE_MASKS = tuple(
+    (zhi_mask(list(combo)), f"{combo}合{element}")
+    for combo, element in ZHI_SAN_HE.items()
+)
+ZHI_SAN_HUI_MASKS = tuple(
+    (zhi_mask(list(combo)), f"{combo}会{element}")
+    for combo, element in ZHI_SAN_HUI.items()
+)
+
+SHENSHA_TABLES = {
+    "tianyi": TIANYI_GUIREN,
+    "wenchang": WENCHANG_GUIREN,
+    "yima": YIMA_XING,
+    "taohua": TAOHUA_XING,
+    "huagai": HUAGAI_XING,
+}
+
 # ==================== 实用函数 ====================
 
 
@@ -821,7 +912,11 @@ def get_ten_gods_relation(day_master: str, other_stem: str) -> str:
     """
     获取十神关系.
     """
-    return TEN_GODS_MAP.get((day_master, other_stem), "未知")
+    a = GAN_INDEX.get(day_master)
+    b = GAN_INDEX.get(other_stem)
+    if a is None or b is None:
+        return "未知"
+    return TEN_GODS_TABLE[a][b]
 
 
 def get_nayin(gan: str, zhi: str) -> str:
@@ -835,40 +930,30 @@ def get_zhi_relation(zhi1: str, zhi2: str, relation_type: str) -> bool:
     """
     检查地支关系.
     """
-    if zhi1 not in ZHI_RELATIONS:
-        return False
-
-    relation = ZHI_RELATIONS[zhi1].get(relation_type)
-    if relation is None:
+    table = ZHI_RELATION_TABLES.get(relation_type)
+    a = ZHI_INDEX.get(zhi1)
+    b = ZHI_INDEX.get(zhi2)
+    if table is None or a is None or b is None:
         return False
-
-    if isinstance(relation, tuple):
-        return zhi2 in relation
-    else:
-        return zhi2 == relation
+    return table[a][b]
 
 
 def get_changsheng_state(gan: str, zhi: str) -> str:
     """
     获取长生十二宫状态.
     """
-    return CHANGSHENG_TWELVE.get(gan, {}).get(zhi, "未知")
+    g = GAN_INDEX.get(gan)
+    z = ZHI_INDEX.get(zhi)
+    if g is None or z is None:
+        return "未知"
+    return CHANGSHENG_TABLE[g][z]
 
 
 def get_shensha(item: str, shensha_type: str) -> str:
     """
     获取神煞.
     """
-    shensha_tables = {
-        "tianyi": TIANYI_GUIREN,
-        "wenchang": WENCHANG_GUIREN,
-        "yima": YIMA_XING,
-        "taohua": TAOHUA_XING,
-        "huagai": HUAGAI_XING,
-    }
-
-    table = shensha_tables.get(shensha_type, {})
-    return table.get(item, "")
+    return SHENSHA_TABLES.get(shensha_type, {}).get(item, "")
 
 
 def analyze_zhi_combinations(zhi_list: List[str]) -> Dict[str, List[str]]:
@@ -884,31 +969,40 @@ def analyze_zhi_combinations(zhi_list: List[str]) -> Dict[str, List[str]]:
         "hai": [],
     }
 
+    # 只保留合法地支及其序号，非法值不参与任何组合
+    indexed = [(zhi, ZHI_INDEX[zhi]) for zhi in zhi_list if zhi in ZHI_INDEX]
+    mask = 0
+    for _, z in indexed:
+        mask |= 1 << z
+
     # 检查三合
-    for combo, element in ZHI_SAN_HE.items():
-        if all(zhi in zhi_list for zhi in combo):
-            result["sanhe"].append(f"{combo}合{element}")
+    for combo_mask, desc in ZHI_SAN_HE_MASKS:
+        if mask & combo_mask == combo_mask:
+            result["sanhe"].append(desc)
 
     # 检查六合
-    for i, zhi1 in enumerate(zhi_list):
-        for j, zhi2 in enumerate(zhi_list[i + 1 :], i + 1):
-            combo = "".join(sorted([zhi1, zhi2]))
-            if combo in ZHI_LIU_HE:
-                result["liuhe"].append(f"{zhi1}{zhi2}合{ZHI_LIU_HE[combo]}")
+    for i, (zhi1, a) in enumerate(indexed):
+        liuhe_row = ZHI_LIUHE_TABLE[a]
+        for zhi2, b in indexed[i + 1 :]:
+            if liuhe_row[b]:
+                result["liuhe"].append(f"{zhi1}{zhi2}合{liuhe_row[b]}")
 
     # 检查三会
-    for combo, element in ZHI_SAN_HUI.items():
-        if all(zhi in zhi_list for zhi in combo):
-            result["sanhui"].append(f"{combo}会{element}")
+    for combo_mask, desc in ZHI_SAN_HUI_MASKS:
+        if mask & combo_mask == combo_mask:
+            result["sanhui"].append(desc)
 
     # 检查相冲、相刑、相害
-    for i, zhi1 in enumerate(zhi_list):
-        for zhi2 in zhi_list[i + 1 :]:
-            if get_zhi_relation(zhi1, zhi2, "冲"):
+    for i, (zhi1, a) in enumerate(indexed):
+        chong_row = ZHI_CHONG_TABLE[a]
+        xing_row = ZHI_XING_TABLE[a]
+        hai_row = ZHI_HAI_TABLE[a]
+        for zhi2, b in indexed[i + 1 :]:
+            if chong_row[b]:
                 result["chong"].append(f"{zhi1}冲{zhi2}")
-            if get_zhi_relation(zhi1, zhi2, "刑"):
+            if xing_row[b]:
                 result["xing"].append(f"{zhi1}刑{zhi2}")
-            if get_zhi_relation(zhi1, zhi2, "害"):
+            if hai_row[b]:
                 result["hai"].append(f"{zhi1}害{zhi2}")
 
     return result
@@ -0,0 +1,138 @@
+"""
+八字反查公历时间的干支索引.
+
+年柱、月柱、日柱、时柱都按六十甲子循环推算，不调用 lunar_python：
+- 年柱以立春为界，立春总在2月3~5日，公历年 Y 内同时出现 Y-1 年和 Y 年的年柱；
+- 月柱以“节”为界，每个公历月恰有一个节且落在2~14日之间，月初为上一个月柱、月中以后为本月柱，
+  月柱序列按月连续循环；
+- 日柱以0点换日，按公历日序数对60取模；
+- 时柱由日干按五鼠遁推出，每个时辰取偶数整点。
+匹配规则与 BaziCalculator 的逐年逐日遍历（年初/年中/年末、月内1/8/15/22/28日采样）一致，
+反查变为索引求交，结果顺序与遍历相同。
+"""
+
+import calendar
+from datetime import date
+from typing import Dict, List, Optional, Set, Tuple
+
+from .professional_data import ganzhi_index
+
+START_YEAR = 1900
+END_YEAR = 2100  # 不含
+
+# 1900-02-15 的月柱戊寅在六十甲子中的序号
+_MONTH_PILLAR_1900_FEB = 14
+# 公历日序数到日柱序号的偏移（1900-01-01 为甲戌）
+_DAY_PILLAR_OFFSET = 14
+
+
+def pillar_index(gan: str, zhi: str) -> Optional[int]:
+    """
+    干支在六十甲子中的序号，非法组合返回 None.
+    """
+    index = ganzhi_index(gan, zhi)
+    return index if index >= 0 else None
+
+
+def year_pillar(year: int) -> int:
+    """
+    立春后的年柱序号.
+    """
+    return (year - 4) % 60
+
+
+def month_pillar(year: int, month: int) -> int:
+    """
+    公历月中（节之后）的月柱序号.
+    """
+    return (_MONTH_PILLAR_1900_FEB + (year - START_YEAR) * 12 + (month - 2)) % 60
+
+
+def day_pillar(day: date) -> int:
+    return (day.toordinal() + _DAY_PILLAR_OFFSET) % 60
+
+
+def hour_pillar(day_pillar_index: int, hour: int) -> int:
+    """
+    指定日柱当天整点的时柱序号.
+    """
+    zhi = ((hour + 1) // 2) % 12
+    gan = (day_pillar_index % 5 * 2 + zhi) % 10
+    return (6 * gan - 5 * zhi) % 60
+
+
+class SexagenaryIndex:
+    """
+    年柱 -> 年份、月柱 -> (年, 月) 的倒排索引.
+    """
+
+    def __init__(self, start_year: int = START_YEAR, end_year: int = END_YEAR):
+        self.start_year = start_year
+        self.end_year = end_year
+        self._years: Dict[int, List[int]] = {}
+        self._months: Dict[int, List[Tuple[int, int]]] = {}
+
+        for year in range(start_year, end_year):
+            # 年初（立春前）为上一年的年柱，年中、年末为本年年柱
+            for pillar in {year_pillar(year - 1), year_pillar(year)}:
+                self._years.setdefault(pillar, []).append(year)
+            for month in range(1, 13):
+                current = month_pillar(year, month)
+                for pillar in {(current - 1) % 60, current}:
+                    self._months.setdefault(pillar, []).append((year, month))
+
+    def years_for(self, pillar: int) -> List[int]:
+        return self._years.get(pillar, [])
+
+    def months_for(self, pillar: int) -> List[Tuple[int, int]]:
+        return self._months.get(pillar, [])
+
+    def find_solar_times(self, bazi: str, limit: int = 20) -> List[str]:
+        """根据八字查找公历时间.
+
+        Args:
+            bazi: 四柱，空格分隔，例如 "甲子 丙寅 戊辰 壬子"
+            limit: 返回数量上限
+
+        Returns:
+            按时间先后排列的 "YYYY-MM-DD HH:00:00" 列表
+        """
+        pillars = [
+            pillar_index(p[0], p[1]) if len(p) == 2 else None for p in bazi.split(" ")
+        ]
+        if len(pillars) != 4 or None in pillars:
+            return []
+        year_p, month_p, day_p, hour_p = pillars
+
+        # 一个时柱只对应一个偶数整点，且时干由日干决定
+        hour = (hour_p % 12) * 2
+        if hour_pillar(day_p, hour) != hour_p:
+            return []
+
+        years: Set[int] = set(self.years_for(year_p))
+        results = []
+        for year, month in self.months_for(month_p):
+            if year not in years:
+                continue
+            first = date(year, month, 1)
+            max_day = calendar.monthrange(year, month)[1]
+            day = 1 + (day_p - day_pillar(first)) % 60
+            while day <= max_day:
+                results.append(f"{year}-{month:02d}-{day:02d} {hour:02d}:00:00")
+                if len(results) >= limit:
+                    return results
+                day += 60
+        return results
+
+
+_index: Optional[SexagenaryIndex] = None
+
+
+def get_sexagenary_index() -> SexagenaryIndex:
+    """
+    获取干支索引单例（构建耗时约数毫秒）.
+    """
+    global _index
+    if _index is None:
+        _index = SexagenaryIndex()
+    return _index
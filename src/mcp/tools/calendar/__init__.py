@@ -3,7 +3,11 @@
 提供完整的日程管理功能，包括事件创建、查询、更新、删除等操作。
 """
 
-from .database import CalendarDatabase, get_calendar_database
+from .database import (
+    CalendarDatabase,
+    close_calendar_database,
+    get_calendar_database,
+)
 from .manager import CalendarManager, get_calendar_manager
 from .models import CalendarEvent
 from .reminder_service import CalendarReminderService, get_reminder_service
@@ -23,6 +27,7 @@ __all__ = [
     "CalendarEvent",
     "CalendarDatabase",
     "get_calendar_database",
+    "close_calendar_database",
     "CalendarReminderService",
     "get_reminder_service",
     "create_event",
@@ -4,8 +4,9 @@
 
 import os
 import sqlite3
+import threading
 from contextlib import contextmanager
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 
 from src.utils.logging_config import get_logger
@@ -27,14 +28,35 @@ def _get_database_file_path() -> str:
 # 数据库文件路径 - 使用函数获取确保可写
 DATABASE_FILE = _get_database_file_path()
 
+# 连接级PRAGMA：WAL下读写互不阻塞，NORMAL同步在WAL下仍可保证一致性
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -8000",
+    "PRAGMA busy_timeout = 5000",
+)
+
+# 事件表索引：时间范围查询、分类筛选、冲突检查、提醒扫描
+EVENT_INDEXES = {
+    "idx_events_start_time": "events(start_time)",
+    "idx_events_end_start": "events(end_time, start_time)",
+    "idx_events_category_start": "events(category, start_time)",
+    "idx_events_reminder": "events(reminder_sent, reminder_time)",
+}
+
 
 class CalendarDatabase:
     """
     日程管理数据库操作类.
     """
 
-    def __init__(self):
-        self.db_file = DATABASE_FILE
+    def __init__(self, db_file: Optional[str] = None):
+        self.db_file = db_file or DATABASE_FILE
+        # 每个线程复用一个长连接，避免每次操作都重新打开数据库
+        self._local = threading.local()
+        self._connections: Dict[threading.Thread, sqlite3.Connection] = {}
+        self._connections_lock = threading.Lock()
         self._ensure_database()
 
     def _ensure_database(self):
@@ -87,24 +109,64 @@ class CalendarDatabase:
 
             logger.info("数据库初始化完成")
 
+    def _connect(self) -> sqlite3.Connection:
+        """
+        当前线程的长连接，首次使用时创建并设置PRAGMA.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_file, timeout=5.0, check_same_thread=False)
+            conn.row_factory = sqlite3.Row  # 使结果可以按列名访问
+            for pragma in CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            self._local.conn = conn
+            self._local.depth = 0
+            with self._connections_lock:
+                self._close_stale_connections()
+                self._connections[threading.current_thread()] = conn
+        return conn
+
+    def _close_stale_connections(self):
+        """
+        关闭已退出线程留下的连接，需持有 _connections_lock.
+        """
+        for thread in [t for t in self._connections if not t.is_alive()]:
+            try:
+                self._connections.pop(thread).close()
+            except Exception as e:
+                logger.warning(f"关闭数据库连接失败: {e}")
+
     @contextmanager
     def _get_connection(self):
         """
         获取数据库连接的上下文管理器.
         """
-        conn = None
+        conn = self._connect()
+        self._local.depth += 1
         try:
-            conn = sqlite3.connect(self.db_file)
-            conn.row_factory = sqlite3.Row  # 使结果可以按列名访问
             yield conn
         except Exception as e:
-            if conn:
-                conn.rollback()
+            conn.rollback()
             logger.error(f"数据库操作失败: {e}")
             raise
         finally:
-            if conn:
+            self._local.depth -= 1
+            # 与原先关闭连接的行为一致：最外层退出时丢弃未提交的修改
+            if self._local.depth == 0 and conn.in_transaction:
+                conn.rollback()
+
+    def close(self):
+        """
+        关闭所有线程的连接.
+        """
+        with self._connections_lock:
+            connections, self._connections = self._connections, {}
+        for conn in connections.values():
+            try:
                 conn.close()
+            except Exception as e:
+                logger.warning(f"关闭数据库连接失败: {e}")
+        self._local = threading.local()
 
     def add_event(self, event_data: Dict[str, Any]) -> bool:
         """
@@ -442,20 +504,22 @@ class CalendarDatabase:
         """
         检查时间冲突.
         """
+        # 子查询只读 (end_time, start_time) 覆盖索引，命中的少数事件再回表取标题
         cursor = conn.execute(
             """
             SELECT title FROM events
-            WHERE id != ? AND (
-                (start_time < ? AND end_time > ?) OR
-                (start_time < ? AND end_time > ?)
-            )
+            WHERE rowid IN (
+                SELECT rowid FROM events
+                WHERE (start_time < ? AND end_time > ?) OR
+                      (start_time < ? AND end_time > ?)
+            ) AND id != ?
         """,
             (
-                event_data["id"],
                 event_data["end_time"],
                 event_data["start_time"],
                 event_data["start_time"],
                 event_data["end_time"],
+                event_data["id"],
             ),
         )
 
@@ -489,14 +553,14 @@ class CalendarDatabase:
                 )
                 category_stats = dict(cursor.fetchall())
 
-                # 今天的事件数
-                today = datetime.now().strftime("%Y-%m-%d")
+                # 今天的事件数（按日期前缀范围查询，可以使用start_time索引）
+                today = datetime.now().date()
                 cursor = conn.execute(
                     """
                     SELECT COUNT(*) FROM events
-                    WHERE date(start_time) = ?
+                    WHERE start_time >= ? AND start_time < ?
                 """,
-                    (today,),
+                    (today.isoformat(), (today + timedelta(days=1)).isoformat()),
                 )
                 today_events = cursor.fetchone()[0]
 
@@ -597,8 +661,6 @@ class CalendarDatabase:
             for event in events_to_update:
                 event_id, start_time, reminder_minutes = event
                 try:
-                    from datetime import timedelta
-
                     start_dt = datetime.fromisoformat(start_time)
                     reminder_dt = start_dt - timedelta(minutes=reminder_minutes)
 
@@ -612,8 +674,28 @@ class CalendarDatabase:
             if events_to_update:
                 logger.info(f"已为{len(events_to_update)}个现有事件设置提醒时间")
 
+            # 添加缺失的索引
+            cursor = conn.execute(
+                "SELECT name FROM sqlite_master "
+                "WHERE type = 'index' AND tbl_name = 'events'"
+            )
+            existing_indexes = {row[0] for row in cursor.fetchall()}
+            missing_indexes = [
+                name for name in EVENT_INDEXES if name not in existing_indexes
+            ]
+            for name in missing_indexes:
+                conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS {name} ON {EVENT_INDEXES[name]}"
+                )
+
             conn.commit()
 
+            if missing_indexes:
+                # 更新查询规划器的统计信息
+                conn.execute("ANALYZE events")
+                conn.commit()
+                logger.info(f"已创建索引: {', '.join(missing_indexes)}")
+
         except Exception as e:
             logger.error(f"数据库升级失败: {e}", exc_info=True)
 
@@ -630,3 +712,11 @@ def get_calendar_database() -> CalendarDatabase:
     if _calendar_db is None:
         _calendar_db = CalendarDatabase()
     return _calendar_db
+
+
+def close_calendar_database():
+    """
+    关闭数据库单例的所有连接（应用退出时调用），未创建时不做任何事.
+    """
+    if _calendar_db is not None:
+        _calendar_db.close()
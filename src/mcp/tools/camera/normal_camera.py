@@ -6,6 +6,7 @@ import cv2
 import requests
 
 from src.utils.config_manager import ConfigManager
+from src.utils.http_client import get_http_client
 from src.utils.logging_config import get_logger
 
 from .base_camera import BaseCamera
@@ -143,8 +144,8 @@ class NormalCamera(BaseCamera):
 
         try:
             # 发送请求
-            response = requests.post(
-                self.explain_url, headers=headers, files=files, timeout=10
+            response = get_http_client().request_sync(
+                "POST", self.explain_url, headers=headers, files=files, timeout=10
             )
 
             # 检查响应状态
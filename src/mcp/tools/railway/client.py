@@ -3,17 +3,21 @@
 提供访问12306官方API的功能.
 """
 
+import asyncio
 import re
+import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from urllib.parse import urlencode
 
-import aiohttp
 from dateutil import tz
 
+from src.utils.http_client import get_http_client
 from src.utils.logging_config import get_logger
+from src.utils.resource_finder import get_user_cache_dir
 
 from .models import SeatPrice, StationInfo, TrainTicket, TransferTicket
+from .station_cache import CACHE_FILENAME, StationCache, StationSnapshot
 
 logger = get_logger(__name__)
 
@@ -23,6 +27,12 @@ class Railway12306Client:
     12306客户端.
     """
 
+    # Cookie复用时长（秒）
+    COOKIE_TTL = 600
+    # 查询结果缓存时长（秒）与条目上限
+    RESPONSE_CACHE_TTL = 60
+    RESPONSE_CACHE_SIZE = 128
+
     def __init__(self):
         self.api_base = "https://kyfw.12306.cn"
         self.web_url = "https://www.12306.cn/index/"
@@ -37,6 +47,37 @@ class Railway12306Client:
         self._name_stations: Dict[str, StationInfo] = {}  # name -> StationInfo
         self._lcquery_path: Optional[str] = None
 
+        # 车站表磁盘缓存
+        self._station_cache = StationCache(get_user_cache_dir() / CACHE_FILENAME)
+        self._station_snapshot: Optional[StationSnapshot] = None
+        self._station_refresh_task: Optional[asyncio.Task] = None
+
+        # 12306会话：Cookie在有效期内复用，错误页面或过期时刷新
+        self._cookies: Dict[str, str] = {}
+        self._cookie_expires = 0.0
+        self._cookie_lock = asyncio.Lock()
+        self._headers = {
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+            "Accept": "application/json, text/javascript, */*; q=0.01",
+            "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
+            "Accept-Encoding": "gzip, deflate, br",
+            "Connection": "keep-alive",
+            "Sec-Fetch-Dest": "empty",
+            "Sec-Fetch-Mode": "cors",
+            "Sec-Fetch-Site": "same-origin",
+            "X-Requested-With": "XMLHttpRequest",
+        }
+
+        # 查询结果短期缓存（按完整请求URL，含出发/到达/日期等参数）与并发请求合并
+        self._response_cache: Dict[str, Tuple[float, dict]] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._stats = {
+            "cache_hits": 0,
+            "cache_misses": 0,
+            "coalesced": 0,
+            "cookie_refreshes": 0,
+        }
+
         # 座位类型映射
         self.seat_types = {
             "9": {"name": "商务座", "short": "swz"},
@@ -110,46 +151,102 @@ class Railway12306Client:
             return False
 
     async def _load_stations(self):
+        """加载车站数据.
+
+        优先使用磁盘缓存并在后台重新验证；无缓存时同步下载，下载失败才使用默认车站数据。
         """
-        加载车站数据.
-        """
-        try:
-            # 获取车站JS文件
-            async with aiohttp.ClientSession() as session:
-                async with session.get(self.web_url) as response:
-                    html = await response.text()
+        start = time.perf_counter()
+        snapshot = await asyncio.to_thread(self._station_cache.load)
+        if snapshot and snapshot.stations:
+            self._apply_stations(snapshot.stations)
+            self._station_snapshot = snapshot
+            logger.info(
+                f"从缓存加载了{len(self._stations)}个车站，"
+                f"耗时 {(time.perf_counter() - start) * 1000:.1f}ms"
+            )
+            self._station_refresh_task = asyncio.create_task(
+                self._refresh_stations(), name="12306车站数据更新"
+            )
+            return
 
-                # 查找车站JS文件路径
-                match = re.search(r"\.(.*station_name.*?\.js)", html)
-                if not match:
-                    raise Exception("未找到车站数据文件")
+        try:
+            await self._refresh_stations()
+        except Exception as e:
+            logger.error(f"加载车站数据失败: {e}")
 
-                js_path = match.group(0)
-                js_url = f"{self.web_url.rstrip('/')}/{js_path.lstrip('.')}"
+        if not self._stations:
+            # 使用默认车站数据
+            self._load_default_stations()
 
-                # 获取车站数据
-                async with session.get(js_url) as response:
-                    js_content = await response.text()
+    async def _refresh_stations(self):
+        """
+        下载车站数据；与缓存来源相同时按 ETag/Last-Modified 条件请求.
+        """
+        try:
+            # 获取车站JS文件
+            http = get_http_client()
+            html = (await http.get(self.web_url)).text()
+
+            # 查找车站JS文件路径
+            match = re.search(r"\.(.*station_name.*?\.js)", html)
+            if not match:
+                raise Exception("未找到车站数据文件")
+
+            js_path = match.group(0)
+            js_url = f"{self.web_url.rstrip('/')}/{js_path.lstrip('.')}"
+
+            headers = {}
+            cached = self._station_snapshot
+            if cached and cached.js_url == js_url:
+                if cached.etag:
+                    headers["If-None-Match"] = cached.etag
+                if cached.last_modified:
+                    headers["If-Modified-Since"] = cached.last_modified
+
+            # 获取车站数据
+            response = await http.get(js_url, headers=headers)
+            if response.status == 304 and cached:
+                logger.info("车站数据未变化，继续使用缓存")
+                cached.fetched_at = time.time()
+                await asyncio.to_thread(self._station_cache.save, cached)
+                return
+            response.raise_for_status()
+            js_content = response.text()
+
+            # 解析车站数据
+            station_data = (
+                js_content.replace("var station_names =", "").strip().rstrip(";")
+            )
+            station_data = station_data.strip("\"'")
 
-                # 解析车站数据
-                station_data = (
-                    js_content.replace("var station_names =", "").strip().rstrip(";")
-                )
-                station_data = station_data.strip("\"'")
+            stations = self._parse_stations_data(station_data)
+            if not stations:
+                raise Exception("车站数据为空")
+            self._apply_stations(stations)
+            logger.info(f"加载了{len(self._stations)}个车站")
 
-                self._parse_stations_data(station_data)
+            snapshot = StationSnapshot(
+                stations=stations,
+                js_url=js_url,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
+            self._station_snapshot = snapshot
+            await asyncio.to_thread(self._station_cache.save, snapshot)
 
         except Exception as e:
-            logger.error(f"加载车站数据失败: {e}")
-            # 使用默认车站数据
-            self._load_default_stations()
+            if not self._station_snapshot:
+                raise
+            # 已有缓存数据（例如离线），继续使用
+            logger.warning(f"更新车站数据失败，继续使用缓存: {e}")
 
-    def _parse_stations_data(self, raw_data: str):
+    def _parse_stations_data(self, raw_data: str) -> List[StationInfo]:
         """
         解析车站数据.
         """
         try:
             data_array = raw_data.split("|")
+            stations = []
 
             # 每10个元素为一个车站
             for i in range(0, len(data_array), 10):
@@ -160,48 +257,66 @@ class Railway12306Client:
                 if len(group) < 10 or not group[2]:  # station_code不能为空
                     continue
 
-                station = StationInfo(
-                    station_id=group[0],
-                    station_name=group[1],
-                    station_code=group[2],
-                    station_pinyin=group[3],
-                    station_short=group[4],
-                    city=group[7],
-                    code=group[6],
+                stations.append(
+                    StationInfo(
+                        station_id=group[0],
+                        station_name=group[1],
+                        station_code=group[2],
+                        station_pinyin=group[3],
+                        station_short=group[4],
+                        city=group[7],
+                        code=group[6],
+                    )
                 )
 
-                # 按编码索引
-                self._stations[station.station_code] = station
-
-                # 按城市索引
-                if station.city not in self._city_stations:
-                    self._city_stations[station.city] = []
-                self._city_stations[station.city].append(station)
-
-                # 按名称索引
-                self._name_stations[station.station_name] = station
-
-            # 生成城市代表站编码（与城市同名的站）
-            for city, stations in self._city_stations.items():
-                for station in stations:
-                    if station.station_name == city:
-                        self._city_codes[city] = station
-                        break
-
-            # 添加缺失的车站
-            self._add_missing_stations()
-
-            logger.info(f"加载了{len(self._stations)}个车站")
+            return stations
 
         except Exception as e:
             logger.error(f"解析车站数据失败: {e}")
             raise
 
-    def _add_missing_stations(self):
+    def _apply_stations(self, stations: List[StationInfo]):
+        """
+        由车站列表构建各索引，构建完成后整体替换.
+        """
+        by_code: Dict[str, StationInfo] = {}
+        city_stations: Dict[str, List[StationInfo]] = {}
+        name_stations: Dict[str, StationInfo] = {}
+        city_codes: Dict[str, StationInfo] = {}
+
+        for station in stations:
+            # 按编码索引
+            by_code[station.station_code] = station
+            # 按城市索引
+            city_stations.setdefault(station.city, []).append(station)
+            # 按名称索引
+            name_stations[station.station_name] = station
+
+        # 生成城市代表站编码（与城市同名的站）
+        for city, city_list in city_stations.items():
+            for station in city_list:
+                if station.station_name == city:
+                    city_codes[city] = station
+                    break
+
+        # 添加缺失的车站
+        for station in self._missing_stations():
+            if station.station_code not in by_code:
+                by_code[station.station_code] = station
+                city_stations.setdefault(station.city, []).append(station)
+                name_stations[station.station_name] = station
+
+        self._stations = by_code
+        self._city_stations = city_stations
+        self._name_stations = name_stations
+        self._city_codes = city_codes
+
+    @staticmethod
+    def _missing_stations() -> List[StationInfo]:
         """
-        添加缺失的车站.
+        车站表中缺失的车站.
         """
-        missing_stations = [
+        return [
             StationInfo(
                 station_id="@cdd",
                 station_name="成都东",
@@ -222,16 +337,6 @@ class Railway12306Client:
             ),
         ]
 
-        for station in missing_stations:
-            if station.station_code not in self._stations:
-                self._stations[station.station_code] = station
-
-                if station.city not in self._city_stations:
-                    self._city_stations[station.city] = []
-                self._city_stations[station.city].append(station)
-
-                self._name_stations[station.station_name] = station
-
     def _load_default_stations(self):
         """
         加载默认车站数据（备用）.
@@ -273,77 +378,143 @@ class Railway12306Client:
         获取中转查询路径.
         """
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(self.lcquery_init_url) as response:
-                    html = await response.text()
+            response = await get_http_client().get(self.lcquery_init_url)
+            html = response.text()
 
-                match = re.search(r"var lc_search_url = '(.+?)'", html)
-                if match:
-                    self._lcquery_path = match.group(1)
-                    logger.debug(f"获取中转查询路径: {self._lcquery_path}")
-                else:
-                    logger.warning("未找到中转查询路径")
+            match = re.search(r"var lc_search_url = '(.+?)'", html)
+            if match:
+                self._lcquery_path = match.group(1)
+                logger.debug(f"获取中转查询路径: {self._lcquery_path}")
+            else:
+                logger.warning("未找到中转查询路径")
 
         except Exception as e:
             logger.error(f"获取中转查询路径失败: {e}")
 
+    def _cookie_header(self) -> Optional[str]:
+        if not self._cookies:
+            return None
+        return "; ".join(f"{k}={v}" for k, v in self._cookies.items())
+
+    def _store_cookies(self, cookies):
+        for key, morsel in cookies.items():
+            self._cookies[key] = morsel.value
+
+    def _invalidate_cookies(self):
+        self._cookies.clear()
+        self._cookie_expires = 0.0
+
     async def _get_cookie(self) -> Optional[str]:
         """
-        获取Cookie.
+        获取Cookie（会话有效期内复用，过期或失效后才重新获取）.
         """
-        try:
-            url = f"{self.api_base}/otn/"
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url) as response:
-                    cookies = response.cookies
-                    if cookies:
-                        cookie_str = "; ".join(
-                            [f"{k}={v.value}" for k, v in cookies.items()]
-                        )
-                        return cookie_str
-            return None
-
-        except Exception as e:
-            logger.error(f"获取Cookie失败: {e}")
-            return None
+        if self._cookies and time.monotonic() < self._cookie_expires:
+            return self._cookie_header()
+
+        async with self._cookie_lock:
+            if self._cookies and time.monotonic() < self._cookie_expires:
+                return self._cookie_header()
+            try:
+                url = f"{self.api_base}/otn/"
+                response = await get_http_client().get(url)
+                self._cookies.clear()
+                self._store_cookies(response.cookies)
+                self._cookie_expires = time.monotonic() + self.COOKIE_TTL
+                self._stats["cookie_refreshes"] += 1
+                return self._cookie_header()
+
+            except Exception as e:
+                logger.error(f"获取Cookie失败: {e}")
+                return None
 
     async def _make_request(self, url: str, params: dict = None) -> Optional[dict]:
+        """发起请求.
+
+        相同请求在缓存有效期内直接返回缓存结果，并发的相同请求合并为一次上游请求。
         """
-        发起请求.
+        if params:
+            url = f"{url}?{urlencode(params)}"
+
+        now = time.monotonic()
+        cached = self._response_cache.get(url)
+        if cached and cached[0] > now:
+            self._stats["cache_hits"] += 1
+            return cached[1]
+
+        task = self._inflight.get(url)
+        if task is not None:
+            self._stats["coalesced"] += 1
+        else:
+            self._stats["cache_misses"] += 1
+            # 上游请求在独立任务中执行，任一调用方被取消都不影响其他等待者
+            task = asyncio.create_task(self._fetch_and_cache(url))
+            self._inflight[url] = task
+            task.add_done_callback(lambda t: self._finish_inflight(url, t))
+        return await asyncio.shield(task)
+
+    async def _fetch_and_cache(self, url: str) -> Optional[dict]:
+        data = await self._fetch(url)
+        if data is not None and data.get("status") is not False:
+            self._cache_response(url, data)
+        return data
+
+    def _finish_inflight(self, url: str, task: asyncio.Task):
+        if self._inflight.get(url) is task:
+            del self._inflight[url]
+        # 所有等待者都已取消时避免 "exception was never retrieved" 警告
+        if not task.cancelled():
+            task.exception()
+
+    def _cache_response(self, url: str, data: dict):
+        now = time.monotonic()
+        if len(self._response_cache) >= self.RESPONSE_CACHE_SIZE:
+            # 先清理过期项，仍然超限时丢弃最早写入的
+            for key in [k for k, v in self._response_cache.items() if v[0] <= now]:
+                del self._response_cache[key]
+            while len(self._response_cache) >= self.RESPONSE_CACHE_SIZE:
+                self._response_cache.pop(next(iter(self._response_cache)))
+        self._response_cache[url] = (now + self.RESPONSE_CACHE_TTL, data)
+
+    async def _fetch(self, url: str) -> Optional[dict]:
         """
-        try:
-            cookie = await self._get_cookie()
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-                "Accept": "application/json, text/javascript, */*; q=0.01",
-                "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
-                "Accept-Encoding": "gzip, deflate, br",
-                "Connection": "keep-alive",
-                "Sec-Fetch-Dest": "empty",
-                "Sec-Fetch-Mode": "cors",
-                "Sec-Fetch-Site": "same-origin",
-                "X-Requested-With": "XMLHttpRequest",
-            }
-            if cookie:
-                headers["Cookie"] = cookie
+        使用会话Cookie请求，返回错误页面时刷新Cookie重试一次.
+        """
+        for attempt in range(2):
+            try:
+                cookie = await self._get_cookie()
+                headers = dict(self._headers)
+                if cookie:
+                    headers["Cookie"] = cookie
+
+                response = await get_http_client().get(url, headers=headers)
+                self._store_cookies(response.cookies)
+
+                # 检查是否是错误页面（通常是会话失效）
+                if response.content_type == "text/html":
+                    text = response.text(errors="replace")
+                    if "error.html" in response.url.path or "error" in text.lower():
+                        logger.warning(f"12306返回错误页面: {response.url}")
+                        self._invalidate_cookies()
+                        continue
 
-            async with aiohttp.ClientSession() as session:
-                if params:
-                    url = f"{url}?{urlencode(params)}"
+                return response.json()
 
-                async with session.get(url, headers=headers) as response:
-                    # 检查是否是错误页面
-                    if response.content_type == "text/html":
-                        text = await response.text()
-                        if "error.html" in response.url.path or "error" in text.lower():
-                            logger.error(f"12306返回错误页面: {response.url}")
-                            return None
+            except Exception as e:
+                logger.error(f"请求失败: {e}")
+                if attempt == 0 and isinstance(e, ValueError):
+                    # 非JSON响应，同样视为会话失效
+                    self._invalidate_cookies()
+                    continue
+                return None
 
-                    return await response.json()
+        logger.error(f"12306请求失败: {url}")
+        return None
 
-        except Exception as e:
-            logger.error(f"请求失败: {e}")
-            return None
+    def get_stats(self) -> Dict[str, int]:
+        """
+        获取请求缓存统计.
+        """
+        return {**self._stats, "cached_responses": len(self._response_cache)}
 
     def get_current_date(self) -> str:
         """
@@ -0,0 +1,86 @@
+"""12306车站数据磁盘缓存.
+
+缓存解析后的车站表及其来源信息（station_name.js 地址、ETag、Last-Modified），
+启动时直接加载，后台按 ETag/If-Modified-Since 重新验证.
+"""
+
+import pickle
+import time
+from dataclasses import astuple, dataclass, field
+from pathlib import Path
+from typing import List, Optional
+
+from src.utils.logging_config import get_logger
+
+from .models import StationInfo
+
+logger = get_logger(__name__)
+
+# 缓存格式版本，StationInfo 字段或存储结构变化时递增
+CACHE_VERSION = 1
+CACHE_FILENAME = "railway_stations.pickle"
+
+
+@dataclass
+class StationSnapshot:
+    """
+    车站表快照.
+    """
+
+    stations: List[StationInfo]
+    js_url: str = ""
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    fetched_at: float = field(default_factory=time.time)
+
+
+class StationCache:
+    """
+    车站表的版本化pickle缓存.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def load(self) -> Optional[StationSnapshot]:
+        try:
+            with open(self.path, "rb") as f:
+                data = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"读取车站缓存失败，将重新下载: {e}")
+            return None
+
+        if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+            return None
+        try:
+            return StationSnapshot(
+                stations=[StationInfo(*row) for row in data["stations"]],
+                js_url=data["js_url"],
+                etag=data["etag"],
+                last_modified=data["last_modified"],
+                fetched_at=data["fetched_at"],
+            )
+        except (KeyError, TypeError) as e:
+            logger.warning(f"车站缓存格式无效: {e}")
+            return None
+
+    def save(self, snapshot: StationSnapshot):
+        data = {
+            "version": CACHE_VERSION,
+            # 以元组保存，体积小且加载快
+            "stations": [astuple(station) for station in snapshot.stations],
+            "js_url": snapshot.js_url,
+            "etag": snapshot.etag,
+            "last_modified": snapshot.last_modified,
+            "fetched_at": snapshot.fetched_at,
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "wb") as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            tmp_path.replace(self.path)
+        except OSError as e:
+            logger.warning(f"保存车站缓存失败: {e}")
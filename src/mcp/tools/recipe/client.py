@@ -3,10 +3,9 @@
 """
 
 import math
-from typing import List, Optional
-
-import aiohttp
+from typing import List
 
+from src.utils.http_client import get_http_client
 from src.utils.logging_config import get_logger
 
 from .models import PaginatedResult, Recipe
@@ -21,26 +20,24 @@ class RecipeClient:
 
     def __init__(self, recipes_url: str = "https://weilei.site/all_recipes.json"):
         self.recipes_url = recipes_url
-        self.session: Optional[aiohttp.ClientSession] = None
+        self.http = None
+        self.timeout = 30
+        self.headers = {
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+        }
 
     async def __aenter__(self):
         """
-        异步上下文管理器入口.
+        异步上下文管理器入口（连接池由共享HTTP客户端管理）.
         """
-        self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=30),
-            headers={
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-            },
-        )
+        self.http = get_http_client()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """
         异步上下文管理器退出.
         """
-        if self.session:
-            await self.session.close()
+        self.http = None
 
     async def fetch_recipes(self) -> List[Recipe]:
         """从远程API获取所有菜谱数据.
@@ -49,31 +46,33 @@ class RecipeClient:
             菜谱列表
         """
         try:
-            if not self.session:
+            if not self.http:
                 raise RuntimeError("Client session not initialized")
 
             logger.info(f"正在从 {self.recipes_url} 获取菜谱数据...")
 
-            async with self.session.get(self.recipes_url) as response:
-                if response.status != 200:
-                    raise Exception(f"HTTP错误: {response.status}")
-
-                data = await response.json()
-
-                # 转换为Recipe对象
-                recipes = []
-                for recipe_data in data:
-                    try:
-                        recipe = Recipe.from_dict(recipe_data)
-                        recipes.append(recipe)
-                    except Exception as e:
-                        logger.warning(
-                            f"解析菜谱失败: {recipe_data.get('name', 'Unknown')}, 错误: {e}"
-                        )
-                        continue
-
-                logger.info(f"成功获取 {len(recipes)} 个菜谱")
-                return recipes
+            response = await self.http.get(
+                self.recipes_url, headers=self.headers, timeout=self.timeout
+            )
+            if response.status != 200:
+                raise Exception(f"HTTP错误: {response.status}")
+
+            data = response.json()
+
+            # 转换为Recipe对象
+            recipes = []
+            for recipe_data in data:
+                try:
+                    recipe = Recipe.from_dict(recipe_data)
+                    recipes.append(recipe)
+                except Exception as e:
+                    logger.warning(
+                        f"解析菜谱失败: {recipe_data.get('name', 'Unknown')}, 错误: {e}"
+                    )
+                    continue
+
+            logger.info(f"成功获取 {len(recipes)} 个菜谱")
+            return recipes
 
         except Exception as e:
             logger.error(f"获取菜谱数据失败: {e}")
@@ -3,12 +3,12 @@
 """
 
 import re
-from typing import List, Optional
+from typing import List
 from urllib.parse import urlencode
 
-import aiohttp
 from bs4 import BeautifulSoup
 
+from src.utils.http_client import get_http_client
 from src.utils.logging_config import get_logger
 
 from .models import SearchQuery, SearchResult
@@ -22,7 +22,7 @@ class SearchClient:
     """
 
     def __init__(self):
-        self.session: Optional[aiohttp.ClientSession] = None
+        self.http = None
         self.user_agent = (
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
             "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
@@ -41,26 +41,20 @@ class SearchClient:
             "Upgrade-Insecure-Requests": "1",
             "Cookie": "SRCHHPGUSR=SRCHLANG=zh-Hans; _EDGE_S=ui=zh-cn; _EDGE_V=1",
         }
-        self.timeout = aiohttp.ClientTimeout(total=15)
+        self.timeout = 15
 
     async def __aenter__(self):
         """
-        异步上下文管理器入口.
+        异步上下文管理器入口（连接池由共享HTTP客户端管理）.
         """
-        if self.session is None:
-            self.session = aiohttp.ClientSession(
-                timeout=self.timeout,
-                headers=self.base_headers,
-                connector=aiohttp.TCPConnector(limit=10, limit_per_host=5),
-            )
+        self.http = get_http_client()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """
         异步上下文管理器出口.
         """
-        if self.session:
-            await self.session.close()
+        self.http = None
 
     async def search_bing(self, query: SearchQuery) -> List[SearchResult]:
         """执行必应搜索.
@@ -72,7 +66,7 @@ class SearchClient:
             搜索结果列表
         """
         try:
-            if not self.session:
+            if not self.http:
                 raise RuntimeError(
                     "SearchClient not initialized. Use 'async with' statement."
                 )
@@ -89,10 +83,12 @@ class SearchClient:
             logger.info(f"正在搜索: {search_url}")
 
             # 发送请求
-            async with self.session.get(search_url) as response:
-                response.raise_for_status()
-                html = await response.text()
-                logger.info(f"搜索响应状态: {response.status}")
+            response = await self.http.get(
+                search_url, headers=self.base_headers, timeout=self.timeout
+            )
+            response.raise_for_status()
+            html = response.text(errors="replace")
+            logger.info(f"搜索响应状态: {response.status}")
 
             # 解析搜索结果
             results = await self._parse_search_results(html, query)
@@ -216,7 +212,7 @@ class SearchClient:
             网页文本内容
         """
         try:
-            if not self.session:
+            if not self.http:
                 raise RuntimeError(
                     "SearchClient not initialized. Use 'async with' statement."
                 )
@@ -227,32 +223,32 @@ class SearchClient:
             headers = self.base_headers.copy()
             headers["Referer"] = "https://cn.bing.com/"
 
-            async with self.session.get(url, headers=headers) as response:
-                # 检查响应状态
-                response.raise_for_status()
+            response = await self.http.get(url, headers=headers, timeout=self.timeout)
+            # 检查响应状态
+            response.raise_for_status()
 
-                # 获取内容类型
-                content_type = response.headers.get("content-type", "").lower()
-                if "text/html" not in content_type:
-                    return f"不支持的内容类型: {content_type}"
+            # 获取内容类型
+            content_type = response.headers.get("content-type", "").lower()
+            if "text/html" not in content_type:
+                return f"不支持的内容类型: {content_type}"
 
-                # 读取内容
-                content = await response.read()
+            # 读取内容
+            content = response.body
 
-                # 尝试检测编码
-                encoding = "utf-8"
-                charset_match = re.search(r"charset=([^;]+)", content_type)
-                if charset_match:
-                    encoding = charset_match.group(1).strip()
+            # 尝试检测编码
+            encoding = "utf-8"
+            charset_match = re.search(r"charset=([^;]+)", content_type)
+            if charset_match:
+                encoding = charset_match.group(1).strip()
 
-                try:
-                    html = content.decode(encoding)
-                except UnicodeDecodeError:
-                    logger.warning(f"使用 {encoding} 解码失败，回退到 utf-8")
-                    html = content.decode("utf-8", errors="ignore")
+            try:
+                html = content.decode(encoding)
+            except UnicodeDecodeError:
+                logger.warning(f"使用 {encoding} 解码失败，回退到 utf-8")
+                html = content.decode("utf-8", errors="ignore")
 
-                # 解析网页内容
-                return await self._extract_webpage_content(html, url, max_length)
+            # 解析网页内容
+            return await self._extract_webpage_content(html, url, max_length)
 
         except Exception as e:
             logger.error(f"获取网页内容失败: {e}")
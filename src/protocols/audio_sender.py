@@ -0,0 +1,135 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class AudioSender:
+    """
+    音频发送器
+    每个音频通道一个常驻发送协程，从有界队列中按序取出编码帧发送，
+    取代“每帧一个后台任务 + 信号量”的方式，保证发送顺序。
+    """
+
+    def __init__(
+        self,
+        send_func: Callable[[bytes], Awaitable[Any]],
+        max_queue_size: int = 64,
+        coalesce_ms: int = 0,
+    ):
+        """
+        Args:
+            send_func: 实际发送单帧的协程函数
+            max_queue_size: 队列上限，满时丢弃最旧的帧
+            coalesce_ms: 合并窗口，收到首帧后等待该时长再一次性发送积压的帧，0 表示不等待
+        """
+        self._send_func = send_func
+        self._max_queue_size = max(1, max_queue_size)
+        self._coalesce_sec = max(0.0, coalesce_ms / 1000.0)
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+        # 运行指标
+        self.sent_count = 0
+        self.dropped_count = 0
+        self.failed_count = 0
+        self.max_backlog = 0
+
+    def start(self):
+        """
+        启动发送协程（需在事件循环中调用）.
+        """
+        if self.is_running():
+            return
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self._max_queue_size)
+        self._task = self._loop.create_task(self._run(), name="音频发送")
+
+    async def stop(self):
+        """
+        停止发送协程并丢弃积压的帧.
+        """
+        task = self._task
+        self._task = None
+        self._queue = None
+        if task and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            except Exception as e:
+                logger.warning(f"音频发送协程退出异常: {e}")
+
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def submit_threadsafe(self, data: bytes):
+        """
+        从音频驱动线程提交一帧，仅一次线程切换.
+        """
+        loop = self._loop
+        if loop is None or loop.is_closed() or self._queue is None:
+            return
+        try:
+            loop.call_soon_threadsafe(self.submit, data)
+        except RuntimeError:
+            # 事件循环已关闭
+            pass
+
+    def submit(self, data: bytes):
+        """
+        在事件循环中提交一帧，队列满时丢弃最旧的帧.
+        """
+        queue = self._queue
+        if queue is None:
+            return
+        if queue.full():
+            try:
+                queue.get_nowait()
+                self.dropped_count += 1
+            except asyncio.QueueEmpty:
+                pass
+        queue.put_nowait(data)
+        backlog = queue.qsize()
+        if backlog > self.max_backlog:
+            self.max_backlog = backlog
+
+    async def _run(self):
+        queue = self._queue
+        while True:
+            data = await queue.get()
+            if self._coalesce_sec:
+                await asyncio.sleep(self._coalesce_sec)
+
+            await self._send(data)
+            # 一次唤醒内发送完所有积压的帧
+            while not queue.empty():
+                await self._send(queue.get_nowait())
+
+    async def _send(self, data: bytes):
+        try:
+            await self._send_func(data)
+            self.sent_count += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.failed_count += 1
+            logger.warning(f"发送音频数据失败: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取发送统计信息.
+        """
+        return {
+            "running": self.is_running(),
+            "backlog": self._queue.qsize() if self._queue else 0,
+            "max_backlog": self.max_backlog,
+            "sent": self.sent_count,
+            "dropped": self.dropped_count,
+            "failed": self.failed_count,
+        }
@@ -1,8 +1,8 @@
 import asyncio
 import json
-import socket
 import threading
 import time
+from typing import Dict, Optional, Set, Tuple
 
 import paho.mqtt.client as mqtt
 from cryptography.hazmat.backends import default_backend
@@ -10,22 +10,44 @@ from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 
 from src.constants.constants import AudioConfig
 from src.protocols.protocol import Protocol
+from src.protocols.udp_packet_codec import UdpPacketCodec
+from src.protocols.udp_reorder_buffer import UdpReorderBuffer
 from src.utils.config_manager import ConfigManager
+from src.utils.latency_histogram import LatencyHistogram
 from src.utils.logging_config import get_logger
 
 # 配置日志
 logger = get_logger(__name__)
 
 
+class _UdpAudioProtocol(asyncio.DatagramProtocol):
+    """
+    UDP音频通道的数据报协议，收包直接在事件循环中交给 MqttProtocol 处理.
+    """
+
+    def __init__(self, owner: "MqttProtocol"):
+        self._owner = owner
+
+    def datagram_received(self, data, addr):
+        self._owner._on_udp_datagram(data)
+
+    def error_received(self, exc):
+        logger.warning(f"UDP通道错误: {exc}")
+
+    def connection_lost(self, exc):
+        if exc:
+            logger.warning(f"UDP通道异常关闭: {exc}")
+        else:
+            logger.info("UDP通道已关闭")
+
+
 class MqttProtocol(Protocol):
     def __init__(self, loop):
         super().__init__()
         self.loop = loop
         self.config = ConfigManager.get_instance()
         self.mqtt_client = None
-        self.udp_socket = None
-        self.udp_thread = None
-        self.udp_running = False
+        self.udp_transport = None
         self.connected = False
 
         # 连接状态监控
@@ -53,6 +75,37 @@ class MqttProtocol(Protocol):
         self.aes_nonce = None
         self.local_sequence = 0
         self.remote_sequence = 0
+        self._packet_codec = None  # 会话级UDP包加解密器
+
+        # 接收端乱序重排与丢包统计
+        self._reorder_buffer = UdpReorderBuffer()
+        self._reorder_flush_handle = None
+        self._udp_packet_count = 0
+
+        # 异步发布：有界发送队列 + 发布协程，发布完成由 on_publish 回调驱动
+        self._publish_queue_size = int(
+            self.config.get_config("MQTT_OPTIONS.PUBLISH_QUEUE_MAXSIZE", 64)
+        )
+        self._max_inflight_publishes = int(
+            self.config.get_config("MQTT_OPTIONS.MAX_INFLIGHT_PUBLISHES", 16)
+        )
+        # MCP回复合并窗口，0 表示不等待
+        self._mcp_batch_window = (
+            int(self.config.get_config("MQTT_OPTIONS.MCP_BATCH_WINDOW_MS", 0)) / 1000
+        )
+        self._publish_timeout = 10.0
+        self._publish_queue: Optional[asyncio.Queue] = None
+        self._publisher_task = None
+        self._inflight_semaphore: Optional[asyncio.Semaphore] = None
+        # mid -> (future, 发布时间, 占用的许可所属信号量)，MQTT网络线程与事件循环共享，需加锁
+        self._pending_publishes: Dict[
+            int, Tuple[asyncio.Future, float, asyncio.Semaphore]
+        ] = {}
+        self._published_mids: Set[int] = set()  # on_publish 先于 mid 登记时暂存
+        self._abandoned_mids: Set[int] = set()  # 等待超时已放弃的 mid，忽略其迟到的回调
+        self._publish_lock = threading.Lock()
+        self._publish_latency = LatencyHistogram()
+        self._publish_failures = 0
 
         # 事件
         self.server_hello_event = asyncio.Event()
@@ -142,6 +195,10 @@ class MqttProtocol(Protocol):
             except Exception as e:
                 logger.warning(f"断开MQTT客户端连接时出错: {e}")
 
+        # 旧连接上的在途消息不会再有 on_publish 回调，结束它们并在连接后重建
+        # 发送队列、在途许可和 mid 映射（新客户端的 mid 从1重新开始）
+        await self._stop_publisher()
+
         # 解析endpoint，提取主机和端口
         try:
             host, port = self._parse_endpoint(self.endpoint)
@@ -227,9 +284,13 @@ class MqttProtocol(Protocol):
                         lambda: self._on_connection_state_changed(False, reason)
                     )
 
-                # 停止UDP接收线程
+                # 关闭UDP通道
                 self._stop_udp_receiver()
 
+                # 异常断开时在途消息不会再完成，立即以失败结束，避免占用许可
+                if rc != 0:
+                    asyncio.run_coroutine_threadsafe(self._stop_publisher(), self.loop)
+
                 # 只有在异常断开且启用自动重连时才尝试重连
                 if (
                     rc != 0
@@ -270,6 +331,18 @@ class MqttProtocol(Protocol):
             MQTT消息发布回调.
             """
             self._last_activity_time = time.time()  # 更新活动时间
+            if client is not self.mqtt_client:
+                return  # 已替换的旧客户端
+            with self._publish_lock:
+                if mid in self._abandoned_mids:
+                    self._abandoned_mids.discard(mid)
+                    return
+                entry = self._pending_publishes.pop(mid, None)
+                if entry is None:
+                    # publish() 尚未返回 mid 时回调已触发，交由发布方处理
+                    self._published_mids.add(mid)
+                    return
+            self.loop.call_soon_threadsafe(self._complete_publish, *entry)
 
         def on_subscribe_callback(client, userdata, mid, granted_qos):
             """
@@ -303,6 +376,9 @@ class MqttProtocol(Protocol):
             # 启动连接监控
             self._start_connection_monitor()
 
+            # 启动发布协程
+            self._start_publisher()
+
             # 发送hello消息
             hello_message = {
                 "type": "hello",
@@ -332,23 +408,17 @@ class MqttProtocol(Protocol):
                     await self._on_network_error("等待响应超时")
                 return False
 
-            # 创建UDP套接字
+            # 创建UDP通道（事件循环上的数据报端点，无需接收线程）
             try:
-                if self.udp_socket:
-                    self.udp_socket.close()
-
-                self.udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-                self.udp_socket.settimeout(0.5)
+                self._close_udp_transport()
 
-                # 启动UDP接收线程
-                if self.udp_thread and self.udp_thread.is_alive():
-                    self.udp_running = False
-                    self.udp_thread.join(1.0)
-
-                self.udp_running = True
-                self.udp_thread = threading.Thread(target=self._udp_receive_thread)
-                self.udp_thread.daemon = True
-                self.udp_thread.start()
+                self.udp_transport, _ = await self.loop.create_datagram_endpoint(
+                    lambda: _UdpAudioProtocol(self),
+                    remote_addr=(self.udp_server, self.udp_port),
+                )
+                logger.info(
+                    f"UDP通道已建立，监听来自 {self.udp_server}:{self.udp_port} 的数据"
+                )
 
                 self.connected = True
                 self._reconnect_attempts = 0  # 重置重连计数
@@ -407,10 +477,12 @@ class MqttProtocol(Protocol):
                 self.udp_port = udp.get("port")
                 self.aes_key = udp.get("key")
                 self.aes_nonce = udp.get("nonce")
+                self._packet_codec = UdpPacketCodec(self.aes_key, self.aes_nonce)
 
                 # 重置序列号
                 self.local_sequence = 0
                 self.remote_sequence = 0
+                self._reorder_buffer.reset()
 
                 logger.info(
                     f"收到服务器hello响应，UDP服务器: {self.udp_server}:{self.udp_port}"
@@ -443,119 +515,292 @@ class MqttProtocol(Protocol):
         except Exception as e:
             logger.error(f"处理MQTT消息时出错: {e}")
 
-    def _udp_receive_thread(self):
-        """UDP接收线程.
+    def _on_udp_datagram(self, data: bytes):
+        """
+        处理收到的UDP音频包（在事件循环中调用）.
+        """
+        self._udp_packet_count += 1
+        try:
+            # 验证数据包
+            if len(data) < 16:  # 至少需要16字节的nonce
+                logger.error(f"无效的音频数据包大小: {len(data)}")
+                return
+
+            # nonce末4字节为序列号，使用会话级加解密器进行AES-CTR解密
+            sequence = UdpPacketCodec.sequence_of(data)
+            decrypted = self._packet_codec.decode(data)
 
-        参考 audio_player.py 的实现方式
+            # 调试信息
+            if self._udp_packet_count % 100 == 0:
+                logger.debug(
+                    f"已解密音频数据包 #{self._udp_packet_count}, 大小: {len(decrypted)} 字节"
+                )
+
+            # 按序列号重排，丢失的包以空数据占位交给解码端补偿
+            self.remote_sequence = sequence
+            self._dispatch_incoming_audio(
+                self._reorder_buffer.push(sequence, decrypted)
+            )
+            self._schedule_reorder_flush()
+
+        except Exception as e:
+            logger.error(f"处理音频数据包错误: {e}")
+
+    def _schedule_reorder_flush(self):
         """
-        logger.info(
-            f"UDP接收线程已启动，监听来自 {self.udp_server}:{self.udp_port} 的数据"
+        有缺失包在等待时安排一次超时检查，放弃等待后输出后续已到达的包.
+        """
+        if self._reorder_flush_handle or not self._reorder_buffer.has_pending():
+            return
+        self._reorder_flush_handle = self.loop.call_later(
+            self._reorder_buffer.max_delay, self._flush_reorder_buffer
         )
 
-        self.udp_running = True
-        debug_counter = 0
-
-        while self.udp_running:
-            try:
-                data, addr = self.udp_socket.recvfrom(4096)
-                debug_counter += 1
+    def _flush_reorder_buffer(self):
+        self._reorder_flush_handle = None
+        self._dispatch_incoming_audio(self._reorder_buffer.flush_expired())
+        self._schedule_reorder_flush()
 
-                try:
-                    # 验证数据包
-                    if len(data) < 16:  # 至少需要16字节的nonce
-                        logger.error(f"无效的音频数据包大小: {len(data)}")
-                        continue
-
-                    # 分离nonce和加密数据
-                    received_nonce = data[:16]
-                    encrypted_audio = data[16:]
-
-                    # 使用AES-CTR解密
-                    decrypted = self.aes_ctr_decrypt(
-                        bytes.fromhex(self.aes_key), received_nonce, encrypted_audio
-                    )
+    def _dispatch_incoming_audio(self, packets):
+        """
+        将按序排列的音频数据交给上层回调.
+        """
+        if not packets or not self._on_incoming_audio:
+            return
 
-                    # 调试信息
-                    if debug_counter % 100 == 0:
-                        logger.debug(
-                            f"已解密音频数据包 #{debug_counter}, 大小: {len(decrypted)} 字节"
-                        )
+        if asyncio.iscoroutinefunction(self._on_incoming_audio):
+            for audio_data in packets:
+                asyncio.create_task(self._on_incoming_audio(audio_data))
+        else:
+            for audio_data in packets:
+                self._on_incoming_audio(audio_data)
 
-                    # 处理解密后的音频数据
-                    if self._on_incoming_audio:
+    async def send_text(self, message, wait_for_publish: bool = True):
+        """发送文本消息.
 
-                        def process_audio(audio_data=decrypted):
-                            if asyncio.iscoroutinefunction(self._on_incoming_audio):
-                                coro = self._on_incoming_audio(audio_data)
-                                if coro is not None:
-                                    asyncio.create_task(coro)
-                            else:
-                                self._on_incoming_audio(audio_data)
+        消息进入有界发送队列（队列满时等待，形成背压），由发布协程交给MQTT客户端，
+        不会阻塞事件循环。
 
-                        self.loop.call_soon_threadsafe(process_audio)
+        Args:
+            message: 消息文本
+            wait_for_publish: 是否等待消息发布完成
+        """
+        if not self.mqtt_client:
+            logger.error("MQTT客户端未初始化")
+            return False
 
-                except Exception as e:
-                    logger.error(f"处理音频数据包错误: {e}")
-                    continue
+        future = await self._enqueue_publish(message)
+        if not wait_for_publish:
+            future.add_done_callback(self._on_background_publish_done)
+            return True
 
-            except socket.timeout:
-                # 超时是正常的，继续循环
-                pass
-            except Exception as e:
-                logger.error(f"UDP接收线程错误: {e}")
-                if not self.udp_running:
-                    break
-                time.sleep(0.1)  # 避免在错误情况下过度消耗CPU
+        try:
+            published = await asyncio.wait_for(
+                asyncio.shield(future), timeout=self._publish_timeout
+            )
+        except asyncio.TimeoutError:
+            published = False
+            logger.error("发送MQTT消息超时")
+            self._abandon_publish(future)
 
-        logger.info("UDP接收线程已停止")
+        if not published:
+            if self._on_network_error:
+                await self._on_network_error("发送MQTT消息失败")
+            return False
+        return True
 
-    async def send_text(self, message):
+    async def send_mcp_message(self, payload):
         """
-        发送文本消息.
+        发送MCP消息，不等待发布完成，可按合并窗口批量发布.
         """
         if not self.mqtt_client:
             logger.error("MQTT客户端未初始化")
-            return False
+            return
+        future = await self._enqueue_publish(
+            self._build_mcp_message(payload), batchable=True
+        )
+        future.add_done_callback(self._on_background_publish_done)
 
+    async def _enqueue_publish(self, message, batchable: bool = False):
+        """
+        放入发送队列，返回发布完成的 future（结果为是否成功）.
+        """
+        self._start_publisher()
+        queue = self._publish_queue
+        future = self.loop.create_future()
+        await queue.put((message, future, batchable))
+        if queue is not self._publish_queue and not future.done():
+            # 等待入队期间发布协程已停止（断线），该消息不会再被发送
+            future.set_result(False)
+        return future
+
+    def _start_publisher(self):
+        if self._publisher_task and not self._publisher_task.done():
+            return
+        self._publish_queue = asyncio.Queue(maxsize=self._publish_queue_size)
+        self._inflight_semaphore = asyncio.Semaphore(self._max_inflight_publishes)
+        self._publisher_task = asyncio.create_task(
+            self._publisher_loop(self._publish_queue, self._inflight_semaphore),
+            name="MQTT发布",
+        )
+
+    async def _stop_publisher(self):
+        """
+        停止发布协程，未完成的消息均以失败结束.
+        """
+        # 在任何 await 之前取走全部状态：等待期间可能有新消息重新启动发布协程，
+        # 之后只清理本次取走的旧状态，不影响新的队列和信号量
+        task = self._publisher_task
+        queue = self._publish_queue
+        self._publisher_task = None
+        self._publish_queue = None
+        self._inflight_semaphore = None
+        with self._publish_lock:
+            pending = list(self._pending_publishes.values())
+            self._pending_publishes.clear()
+            self._published_mids.clear()
+            self._abandoned_mids.clear()
+
+        if task and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+        for future, _, _ in pending:
+            if not future.done():
+                future.set_result(False)
+
+        while queue is not None and not queue.empty():
+            _, future, _ = queue.get_nowait()
+            if not future.done():
+                future.set_result(False)
+
+    async def _publisher_loop(
+        self, queue: asyncio.Queue, semaphore: asyncio.Semaphore
+    ):
+        while True:
+            item = await queue.get()
+            if item[2] and self._mcp_batch_window:
+                # 等待合并窗口，让连续的MCP回复在一次唤醒内发出
+                await asyncio.sleep(self._mcp_batch_window)
+
+            batch = [item]
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+
+            for index, (message, future, _) in enumerate(batch):
+                if future.done():
+                    continue  # 等待超时已放弃，不再发送
+                try:
+                    # 在途消息数达到上限时等待，形成背压
+                    await semaphore.acquire()
+                except asyncio.CancelledError:
+                    for _, pending, _ in batch[index:]:
+                        if not pending.done():
+                            pending.set_result(False)
+                    raise
+                if future.done():
+                    # 等待许可期间已超时放弃
+                    semaphore.release()
+                    continue
+                self._publish_now(message, future, semaphore)
+
+    def _publish_now(
+        self, message, future: asyncio.Future, semaphore: asyncio.Semaphore
+    ):
+        started = time.monotonic()
+        client = self.mqtt_client
         try:
-            result = self.mqtt_client.publish(self.publish_topic, message)
-            result.wait_for_publish()
-            return True
+            if client is None:
+                raise RuntimeError("MQTT客户端未初始化")
+            info = client.publish(self.publish_topic, message)
+            if info.rc != mqtt.MQTT_ERR_SUCCESS:
+                raise RuntimeError(mqtt.error_string(info.rc))
         except Exception as e:
             logger.error(f"发送MQTT消息失败: {e}")
-            if self._on_network_error:
-                await self._on_network_error(f"发送MQTT消息失败: {e}")
-            return False
+            self._publish_failures += 1
+            semaphore.release()
+            if not future.done():
+                future.set_result(False)
+            return
+
+        with self._publish_lock:
+            if info.mid in self._published_mids:
+                self._published_mids.discard(info.mid)
+                published = True
+            else:
+                self._pending_publishes[info.mid] = (future, started, semaphore)
+                published = False
+        if published:
+            self._complete_publish(future, started, semaphore)
+
+    def _release_inflight(self, semaphore: asyncio.Semaphore):
+        """
+        归还在途许可，重连后旧信号量的迟到归还直接忽略，避免抬高新信号量的上限.
+        """
+        if semaphore is self._inflight_semaphore:
+            semaphore.release()
+
+    def _complete_publish(
+        self, future: asyncio.Future, started: float, semaphore: asyncio.Semaphore
+    ):
+        self._publish_latency.record((time.monotonic() - started) * 1000)
+        self._release_inflight(semaphore)
+        if not future.done():
+            future.set_result(True)
+
+    def _abandon_publish(self, future: asyncio.Future):
+        """
+        放弃等待超时的消息：移除在途记录并归还许可，避免许可泄漏.
+        """
+        with self._publish_lock:
+            mid = next(
+                (m for m, (f, _, _) in self._pending_publishes.items() if f is future),
+                None,
+            )
+            if mid is not None:
+                _, _, semaphore = self._pending_publishes.pop(mid)
+                self._abandoned_mids.add(mid)
+        if mid is not None:
+            self._release_inflight(semaphore)
+        if not future.done():
+            future.set_result(False)
+
+    def _on_background_publish_done(self, future: asyncio.Future):
+        if not future.cancelled() and not future.result():
+            logger.error("后台发送MQTT消息失败")
+
+    def get_publish_stats(self) -> dict:
+        """
+        获取发布统计（队列积压、在途消息、失败次数、发布延迟直方图）.
+        """
+        with self._publish_lock:
+            inflight = len(self._pending_publishes)
+        return {
+            "queued": self._publish_queue.qsize() if self._publish_queue else 0,
+            "inflight": inflight,
+            "failures": self._publish_failures,
+            "latency": self._publish_latency.snapshot(),
+        }
 
     async def send_audio(self, audio_data):
         """发送音频数据.
 
         参考 audio_sender.py 的实现方式
         """
-        if not self.udp_socket or not self.udp_server or not self.udp_port:
+        if not self.udp_transport or not self._packet_codec:
             logger.error("UDP通道未初始化")
             return False
 
         try:
-            # 生成新的nonce (类似于 audio_sender.py 中的实现)
-            # 格式: 0x01 (1字节) + 0x00 (3字节) + 长度 (2字节) + 原始nonce (8字节) + 序列号 (8字节)
+            # 生成新的nonce并加密，nonce与密文直接写入复用的包缓冲区
             self.local_sequence = (self.local_sequence + 1) & 0xFFFFFFFF
-            new_nonce = (
-                self.aes_nonce[:4]  # 固定前缀
-                + format(len(audio_data), "04x")  # 数据长度
-                + self.aes_nonce[8:24]  # 原始nonce
-                + format(self.local_sequence, "08x")  # 序列号
-            )
-
-            encrypt_encoded_data = self.aes_ctr_encrypt(
-                bytes.fromhex(self.aes_key), bytes.fromhex(new_nonce), bytes(audio_data)
-            )
-
-            # 拼接nonce和密文
-            packet = bytes.fromhex(new_nonce) + encrypt_encoded_data
+            packet = self._packet_codec.encode(audio_data, self.local_sequence)
 
-            # 发送数据包
-            self.udp_socket.sendto(packet, (self.udp_server, self.udp_port))
+            # 发送数据包（非阻塞，传输层无法立即发送时会自行拷贝缓冲）
+            self.udp_transport.sendto(packet)
 
             # 每发送10个包打印一次日志
             if self.local_sequence % 10 == 0:
@@ -564,7 +809,6 @@ class MqttProtocol(Protocol):
                     f"{self.udp_server}:{self.udp_port}"
                 )
 
-            self.local_sequence += 1
             return True
         except Exception as e:
             logger.error(f"发送音频数据失败: {e}")
@@ -616,7 +860,7 @@ class MqttProtocol(Protocol):
             return False
 
         # 检查UDP连接状态
-        return self.udp_socket is not None and self.udp_running
+        return self.udp_transport is not None and not self.udp_transport.is_closing()
 
     def aes_ctr_encrypt(self, key, nonce, plaintext):
         """AES-CTR模式加密函数
@@ -654,20 +898,11 @@ class MqttProtocol(Protocol):
         处理goodbye消息.
         """
         try:
-            # 停止UDP接收线程
-            if self.udp_thread and self.udp_thread.is_alive():
-                self.udp_running = False
-                self.udp_thread.join(1.0)
-                self.udp_thread = None
-            logger.info("UDP接收线程已停止")
-
-            # 关闭UDP套接字
-            if self.udp_socket:
-                try:
-                    self.udp_socket.close()
-                except Exception as e:
-                    logger.error(f"关闭UDP套接字失败: {e}")
-                self.udp_socket = None
+            # 关闭UDP通道（立即生效，无需等待接收超时）
+            self._close_udp_transport()
+
+            # 停止发布协程
+            await self._stop_publisher()
 
             # 停止MQTT客户端
             if self.mqtt_client:
@@ -688,6 +923,7 @@ class MqttProtocol(Protocol):
             self.udp_port = 0
             self.aes_key = None
             self.aes_nonce = None
+            self._packet_codec = None
 
             # 调用音频通道关闭回调
             if self._on_audio_channel_closed:
@@ -696,35 +932,45 @@ class MqttProtocol(Protocol):
         except Exception as e:
             logger.error(f"处理goodbye消息时出错: {e}")
 
-    def _stop_udp_receiver(self):
+    def _close_udp_transport(self):
         """
-        停止UDP接收线程和关闭UDP套接字.
+        关闭UDP通道（需在事件循环线程中调用）.
         """
-        # 关闭UDP接收线程
-        if (
-            hasattr(self, "udp_thread")
-            and self.udp_thread
-            and self.udp_thread.is_alive()
-        ):
-            self.udp_running = False
-            try:
-                self.udp_thread.join(1.0)
-            except RuntimeError:
-                pass  # 处理线程已经终止的情况
+        if getattr(self, "_reorder_flush_handle", None):
+            self._reorder_flush_handle.cancel()
+            self._reorder_flush_handle = None
 
-        # 关闭UDP套接字
-        if hasattr(self, "udp_socket") and self.udp_socket:
+        transport = getattr(self, "udp_transport", None)
+        self.udp_transport = None
+        if transport:
             try:
-                self.udp_socket.close()
+                transport.close()
             except Exception as e:
-                logger.error(f"关闭UDP套接字失败: {e}")
+                logger.error(f"关闭UDP通道失败: {e}")
+
+    def _stop_udp_receiver(self):
+        """
+        关闭UDP通道，可从任意线程调用（如MQTT网络线程的断开回调）.
+        """
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+
+        if running_loop is self.loop:
+            self._close_udp_transport()
+        elif not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self._close_udp_transport)
 
     def __del__(self):
         """
         析构函数，清理资源.
         """
         # 停止UDP接收相关资源
-        self._stop_udp_receiver()
+        try:
+            self._stop_udp_receiver()
+        except Exception:
+            pass
 
         # 关闭MQTT客户端
         if hasattr(self, "mqtt_client") and self.mqtt_client:
@@ -904,6 +1150,10 @@ class MqttProtocol(Protocol):
                 f"{self.udp_server}:{self.udp_port}" if self.udp_server else None
             ),
             "session_id": self.session_id,
+            "audio_receive": self._reorder_buffer.get_stats(),
+            # 实际补偿的帧数以解码端为准（单个空洞补偿帧数有上限）
+            "audio_decode": self._get_audio_stats(),
+            "publish": self.get_publish_stats(),
         }
 
     async def _cleanup_connection(self):
@@ -920,9 +1170,12 @@ class MqttProtocol(Protocol):
             except asyncio.CancelledError:
                 pass
 
-        # 停止UDP接收线程
+        # 关闭UDP通道
         self._stop_udp_receiver()
 
+        # 停止发布协程
+        await self._stop_publisher()
+
         # 停止MQTT客户端
         if self.mqtt_client:
             try:
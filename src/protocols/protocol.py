@@ -1,6 +1,7 @@
 import json
 
 from src.constants.constants import AbortReason, ListeningMode
+from src.utils import json_utils
 from src.utils.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -18,6 +19,8 @@ class Protocol:
         # 新增连接状态变化回调
         self._on_connection_state_changed = None
         self._on_reconnecting = None
+        # 播放端统计提供者（丢包补偿帧数等），由应用层注册
+        self._audio_stats_provider = None
 
     def on_incoming_json(self, callback):
         """
@@ -65,6 +68,26 @@ class Protocol:
         """
         self._on_reconnecting = callback
 
+    def set_audio_stats_provider(self, provider):
+        """设置播放端统计提供者，用于在连接信息中汇报丢包补偿情况.
+
+        Args:
+            provider: 无参可调用对象，返回统计字典
+        """
+        self._audio_stats_provider = provider
+
+    def _get_audio_stats(self) -> dict:
+        """
+        获取播放端统计，未注册或获取失败时返回空字典.
+        """
+        if not self._audio_stats_provider:
+            return {}
+        try:
+            return self._audio_stats_provider() or {}
+        except Exception as e:
+            logger.debug(f"获取播放端统计失败: {e}")
+            return {}
+
     async def send_text(self, message):
         """
         发送文本消息的抽象方法，需要在子类中实现.
@@ -199,19 +222,23 @@ class Protocol:
         }
         await self.send_text(json.dumps(message))
 
+    def _build_mcp_message(self, payload) -> str:
+        """构建MCP消息文本.
+
+        payload 为字符串时视为已序列化的JSON-RPC消息，直接嵌入外层消息，不再解析和重新序列化。
+        """
+        if not isinstance(payload, str):
+            payload = json_utils.dumps(payload)
+        return (
+            '{"session_id":'
+            + json_utils.dumps(self.session_id)
+            + ',"type":"mcp","payload":'
+            + payload
+            + "}"
+        )
+
     async def send_mcp_message(self, payload):
         """
         发送MCP消息.
         """
-        if isinstance(payload, str):
-            payload_data = json.loads(payload)
-        else:
-            payload_data = payload
-
-        message = {
-            "session_id": self.session_id,
-            "type": "mcp",
-            "payload": payload_data,
-        }
-
-        await self.send_text(json.dumps(message))
+        await self.send_text(self._build_mcp_message(payload))
@@ -0,0 +1,93 @@
+import struct
+
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
+NONCE_SIZE = 16
+_BLOCK_SIZE = 16
+# UDP包上限，update_into 要求输出缓冲区多留 block_size - 1 字节
+_MAX_PACKET_SIZE = 4096
+
+
+class UdpPacketCodec:
+    """
+    UDP音频包加解密器（AES-CTR），每个会话根据服务端hello中的key/nonce创建一次
+    - 密钥只解码一次，AES算法对象复用
+    - 发送nonce基于预分配的bytearray模板原地写入长度和序列号
+    - 加解密使用 update_into 写入复用的缓冲区
+
+    nonce格式: 0x01 (1字节) + 0x00 (1字节) + 长度 (2字节) + 原始nonce (8字节) + 序列号 (4字节)
+    """
+
+    def __init__(self, key_hex: str, nonce_hex: str):
+        self._key = bytes.fromhex(key_hex)
+        self._algorithm = algorithms.AES(self._key)
+        self._backend = default_backend()
+
+        nonce = bytes.fromhex(nonce_hex)
+        if len(nonce) != NONCE_SIZE:
+            raise ValueError(f"nonce长度错误: {len(nonce)}, 期望: {NONCE_SIZE}")
+
+        # 发送缓冲区：[nonce模板 | 密文]，nonce模板直接位于包头
+        self._send_buffer = bytearray(NONCE_SIZE + _MAX_PACKET_SIZE + _BLOCK_SIZE - 1)
+        self._send_buffer[:NONCE_SIZE] = nonce
+        self._send_view = memoryview(self._send_buffer)
+        self._send_nonce = self._send_view[:NONCE_SIZE]
+        self._send_payload = self._send_view[NONCE_SIZE:]
+
+        # 接收缓冲区
+        self._recv_buffer = bytearray(_MAX_PACKET_SIZE + _BLOCK_SIZE - 1)
+        self._recv_view = memoryview(self._recv_buffer)
+
+    def encode(self, payload, sequence: int) -> memoryview:
+        """加密音频数据并生成完整的UDP包.
+
+        Args:
+            payload: 原始音频数据（bytes-like，不会被拷贝）
+            sequence: 本地发送序列号
+
+        Returns:
+            指向内部缓冲区的视图，在下一次调用 encode 前有效
+        """
+        length = len(payload)
+        if length > _MAX_PACKET_SIZE:
+            raise ValueError(f"音频数据过大: {length}")
+
+        struct.pack_into(">H", self._send_buffer, 2, length)
+        struct.pack_into(">I", self._send_buffer, 12, sequence & 0xFFFFFFFF)
+
+        encryptor = Cipher(
+            self._algorithm,
+            modes.CTR(self._send_nonce),
+            backend=self._backend,
+        ).encryptor()
+        written = encryptor.update_into(payload, self._send_payload)
+        return self._send_view[: NONCE_SIZE + written]
+
+    def decode(self, packet) -> bytes:
+        """解密收到的UDP包.
+
+        Args:
+            packet: 完整数据包（nonce + 密文）
+
+        Returns:
+            解密后的音频数据
+        """
+        if len(packet) < NONCE_SIZE:
+            raise ValueError(f"无效的音频数据包大小: {len(packet)}")
+
+        view = memoryview(packet)
+        decryptor = Cipher(
+            self._algorithm,
+            modes.CTR(view[:NONCE_SIZE]),
+            backend=self._backend,
+        ).decryptor()
+        written = decryptor.update_into(view[NONCE_SIZE:], self._recv_view)
+        return bytes(self._recv_view[:written])
+
+    @staticmethod
+    def sequence_of(packet) -> int:
+        """
+        从包头nonce中读取序列号.
+        """
+        return struct.unpack_from(">I", packet, 12)[0]
@@ -0,0 +1,144 @@
+import time
+from typing import Any, Dict, List, Optional
+
+# 丢包标记：交给解码端做FEC/PLC补偿
+LOST_PACKET = b""
+
+_SEQ_MASK = 0xFFFFFFFF
+_SEQ_HALF = 0x80000000
+
+
+class UdpReorderBuffer:
+    """
+    UDP音频包序列号重排缓冲区
+    按nonce中的序列号在一个小窗口内重排乱序包，窗口耗尽或等待超时后将缺失的包判定为丢失，
+    并以 LOST_PACKET 占位输出，保证下游拿到的是连续的帧序列。
+    """
+
+    def __init__(self, window: int = 4, max_delay: float = 0.06, max_gap: int = 50):
+        """
+        Args:
+            window: 最多缓存的乱序包数，超过后放弃等待缺失的包
+            max_delay: 缺失包的最长等待时间（秒）
+            max_gap: 序列号跳变超过该值视为流重置，不再补偿
+        """
+        self._window = max(1, window)
+        self._max_delay = max_delay
+        self._max_gap = max_gap
+
+        self._expected: Optional[int] = None
+        self._pending: Dict[int, bytes] = {}
+        self._gap_since: Optional[float] = None
+
+        # 统计信息
+        self.received = 0
+        self.lost = 0
+        self.late = 0
+        self.reordered = 0
+        self.duplicate = 0
+
+    def reset(self):
+        """
+        新会话开始时重置序列号状态（保留统计）.
+        """
+        self._expected = None
+        self._pending.clear()
+        self._gap_since = None
+
+    @property
+    def max_delay(self) -> float:
+        return self._max_delay
+
+    def has_pending(self) -> bool:
+        return bool(self._pending)
+
+    def push(self, sequence: int, payload: bytes) -> List[bytes]:
+        """放入一个数据包，返回可按序输出的数据（丢失的包以 LOST_PACKET 占位）.
+
+        Args:
+            sequence: 数据包序列号（32位，可回绕）
+            payload: 解密后的音频数据
+        """
+        self.received += 1
+        sequence &= _SEQ_MASK
+
+        if self._expected is None:
+            self._expected = sequence
+
+        offset = (sequence - self._expected) & _SEQ_MASK
+        if offset >= _SEQ_HALF:
+            # 早于已输出位置：迟到包直接丢弃
+            self.late += 1
+            return []
+        if sequence in self._pending:
+            self.duplicate += 1
+            return []
+
+        output: List[bytes] = []
+        if offset > self._max_gap:
+            # 序列号大幅跳变（服务端重置等），输出缓存后从新位置开始，不做补偿
+            output.extend(self._pending[seq] for seq in sorted(self._pending))
+            self._pending.clear()
+            self._expected = sequence
+            offset = 0
+
+        if offset == 0 and self._pending:
+            # 填补了之前的空洞：说明该包是乱序到达的
+            self.reordered += 1
+
+        self._pending[sequence] = payload
+        self._drain(output)
+
+        if self._pending:
+            if self._gap_since is None:
+                self._gap_since = time.monotonic()
+            if len(self._pending) >= self._window:
+                self._skip_gap(output)
+        return output
+
+    def flush_expired(self, now: Optional[float] = None) -> List[bytes]:
+        """
+        缺失包等待超时后放弃等待，输出后续已到达的包.
+        """
+        output: List[bytes] = []
+        if not self._pending or self._gap_since is None:
+            return output
+        now = time.monotonic() if now is None else now
+        if now - self._gap_since >= self._max_delay:
+            self._skip_gap(output)
+        return output
+
+    def _drain(self, output: List[bytes]):
+        while self._expected in self._pending:
+            output.append(self._pending.pop(self._expected))
+            self._expected = (self._expected + 1) & _SEQ_MASK
+        if not self._pending:
+            self._gap_since = None
+
+    def _skip_gap(self, output: List[bytes]):
+        """
+        将当前空洞判定为丢失，输出占位后继续按序输出.
+        """
+        next_seq = min(
+            self._pending, key=lambda seq: (seq - self._expected) & _SEQ_MASK
+        )
+        missing = (next_seq - self._expected) & _SEQ_MASK
+        self.lost += missing
+        output.extend([LOST_PACKET] * missing)
+        self._expected = next_seq
+        self._gap_since = None
+        self._drain(output)
+        if self._pending:
+            self._gap_since = time.monotonic()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取接收统计信息.
+        """
+        return {
+            "received": self.received,
+            "lost": self.lost,
+            "late": self.late,
+            "reordered": self.reordered,
+            "duplicate": self.duplicate,
+        }
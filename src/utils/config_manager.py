@@ -58,8 +58,29 @@ class ConfigManager:
                 "description": "显示/隐藏窗口",
             },
         },
+        "AUDIO_OPTIONS": {
+            "PLAYBACK_TARGET_DEPTH": 3,
+        },
+        "MCP_OPTIONS": {
+            "MAX_CONCURRENT_TOOL_CALLS": 4,
+            "TOOL_CALL_TIMEOUT": 60,
+            "TOOL_TIMEOUTS": {},
+            "LAZY_TOOL_LOADING": True,
+        },
+        "HTTP_CLIENT": {
+            "TIMEOUT": 15,
+            "CONNECT_TIMEOUT": 5,
+            "RETRIES": 2,
+            "MAX_TOTAL_TIME": 30,
+            "MAX_CONNECTIONS": 32,
+            "MAX_CONNECTIONS_PER_HOST": 8,
+            "KEEPALIVE_TIMEOUT": 60,
+            "DNS_CACHE_TTL": 300,
+        },
         "AEC_OPTIONS": {
             "ENABLED": False,
+            "MODE": "auto",
+            "STREAM_DELAY_MS": 0,
             "BUFFER_MAX_LENGTH": 200,
             "FRAME_DELAY": 3,
             "FILTER_LENGTH_RATIO": 0.4,
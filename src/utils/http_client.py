@@ -0,0 +1,384 @@
+"""
+进程级HTTP客户端服务.
+
+所有工具包和OTA共用连接池：每个事件循环一个 aiohttp.ClientSession，按主机限制并保持长连接，
+缓存DNS解析结果，统一超时与重试策略，并统计连接复用情况。同步调用方（在线程中运行的工具）
+使用共享的 requests.Session。
+"""
+
+import asyncio
+import json
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from http.cookiejar import DefaultCookiePolicy
+from http.cookies import SimpleCookie
+from typing import Any, Dict, Optional
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+from yarl import URL
+
+from src.utils.config_manager import ConfigManager
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# 幂等请求遇到这些状态码时重试
+RETRY_STATUSES = {502, 503, 504}
+RETRY_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+class HttpStatusError(Exception):
+    """
+    HTTP状态码错误.
+    """
+
+    def __init__(self, status: int, url: str):
+        super().__init__(f"HTTP错误: {status} ({url})")
+        self.status = status
+        self.url = url
+
+
+class _RetryableStatus(Exception):
+    def __init__(self, status: int):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+
+
+@dataclass
+class HttpResponse:
+    """
+    已读取完整响应体的HTTP响应.
+    """
+
+    status: int
+    url: URL
+    headers: Any
+    cookies: SimpleCookie
+    content_type: str
+    charset: Optional[str]
+    body: bytes
+
+    def text(self, encoding: Optional[str] = None, errors: str = "strict") -> str:
+        return self.body.decode(encoding or self.charset or "utf-8", errors)
+
+    def json(self) -> Any:
+        # 严格解码，编码不符时抛出 UnicodeDecodeError（ValueError），而不是悄悄替换字符
+        return json.loads(self.text())
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise HttpStatusError(self.status, str(self.url))
+
+
+class HttpClient:
+    """
+    共享HTTP客户端.
+    """
+
+    _instance = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls):
+        """
+        获取单例实例.
+        """
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        config = ConfigManager.get_instance()
+        self._timeout = config.get_config("HTTP_CLIENT.TIMEOUT", 15)
+        self._connect_timeout = config.get_config("HTTP_CLIENT.CONNECT_TIMEOUT", 5)
+        self._retries = max(0, config.get_config("HTTP_CLIENT.RETRIES", 2))
+        # 含重试在内的单次调用总耗时上限，避免多次超时叠加到接近工具调用超时
+        self._max_total_time = config.get_config("HTTP_CLIENT.MAX_TOTAL_TIME", 30)
+        self._max_connections = config.get_config("HTTP_CLIENT.MAX_CONNECTIONS", 32)
+        self._max_per_host = config.get_config(
+            "HTTP_CLIENT.MAX_CONNECTIONS_PER_HOST", 8
+        )
+        self._keepalive_timeout = config.get_config(
+            "HTTP_CLIENT.KEEPALIVE_TIMEOUT", 60
+        )
+        self._dns_cache_ttl = config.get_config("HTTP_CLIENT.DNS_CACHE_TTL", 300)
+
+        # aiohttp会话与事件循环绑定，每个循环一个
+        self._sessions: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+        self._sync_session: Optional[requests.Session] = None
+        self._sync_lock = threading.Lock()
+
+        self._stats = {
+            "requests": 0,
+            "connections_created": 0,
+            "connections_reused": 0,
+            "dns_cache_hits": 0,
+            "dns_cache_misses": 0,
+            "retries": 0,
+            "errors": 0,
+        }
+        self._host_requests: Dict[str, int] = {}
+
+    # ------------------------------------------------------------------
+    # 会话管理
+    # ------------------------------------------------------------------
+
+    def get_session(self) -> aiohttp.ClientSession:
+        """
+        获取当前事件循环的共享会话（需要直接使用aiohttp接口时）.
+        """
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            session = self._create_session()
+            self._sessions[loop] = session
+        return session
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit=self._max_connections,
+            limit_per_host=self._max_per_host,
+            keepalive_timeout=self._keepalive_timeout,
+            use_dns_cache=True,
+            ttl_dns_cache=self._dns_cache_ttl,
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=self._make_timeout(None),
+            # 各工具互不共享Cookie，需要Cookie的调用方自行管理
+            cookie_jar=aiohttp.DummyCookieJar(),
+            trace_configs=[self._create_trace_config()],
+        )
+
+    def _make_timeout(self, total: Optional[float]) -> aiohttp.ClientTimeout:
+        total = total if total is not None else self._timeout
+        return aiohttp.ClientTimeout(
+            total=total, connect=min(self._connect_timeout, total)
+        )
+
+    def _create_trace_config(self) -> aiohttp.TraceConfig:
+        trace = aiohttp.TraceConfig()
+
+        async def on_connection_create_end(session, context, params):
+            self._stats["connections_created"] += 1
+
+        async def on_connection_reuseconn(session, context, params):
+            self._stats["connections_reused"] += 1
+
+        async def on_dns_cache_hit(session, context, params):
+            self._stats["dns_cache_hits"] += 1
+
+        async def on_dns_cache_miss(session, context, params):
+            self._stats["dns_cache_misses"] += 1
+
+        trace.on_connection_create_end.append(on_connection_create_end)
+        trace.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace.on_dns_cache_hit.append(on_dns_cache_hit)
+        trace.on_dns_cache_miss.append(on_dns_cache_miss)
+        return trace
+
+    # ------------------------------------------------------------------
+    # 异步请求
+    # ------------------------------------------------------------------
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        timeout: Optional[float] = None,
+        retries: Optional[int] = None,
+        **kwargs,
+    ) -> HttpResponse:
+        """发送请求并读取完整响应体.
+
+        Args:
+            method: 请求方法
+            url: 请求地址
+            timeout: 单次尝试的总超时（秒），默认使用配置
+            retries: 连接错误、超时或502/503/504时的重试次数，默认仅幂等请求按配置重试；
+                所有尝试的总耗时不超过 max(timeout, MAX_TOTAL_TIME)
+            **kwargs: 透传给 aiohttp 的参数（params、headers、json、data等）
+
+        Returns:
+            HttpResponse
+        """
+        method = method.upper()
+        if retries is None:
+            retries = self._retries if method in RETRY_METHODS else 0
+        attempt_timeout = timeout if timeout is not None else self._timeout
+        deadline = time.monotonic() + max(attempt_timeout, self._max_total_time)
+        host = URL(url).host or ""
+
+        attempt = 0
+        while True:
+            # 每次尝试的超时不超过剩余的总时间
+            remaining = deadline - time.monotonic()
+            client_timeout = self._make_timeout(min(attempt_timeout, remaining))
+            self._stats["requests"] += 1
+            self._host_requests[host] = self._host_requests.get(host, 0) + 1
+            try:
+                session = self.get_session()
+                async with session.request(
+                    method, url, timeout=client_timeout, **kwargs
+                ) as response:
+                    body = await response.read()
+                    if response.status in RETRY_STATUSES and attempt < retries:
+                        raise _RetryableStatus(response.status)
+                    return HttpResponse(
+                        status=response.status,
+                        url=response.url,
+                        headers=response.headers,
+                        cookies=response.cookies,
+                        content_type=response.content_type,
+                        charset=response.charset,
+                        body=body,
+                    )
+            except (
+                aiohttp.ClientConnectionError,
+                asyncio.TimeoutError,
+                _RetryableStatus,
+            ) as e:
+                delay = 0.2 * (2**attempt)
+                # 剩余时间不够再等待一次退避并发出请求时不再重试
+                if attempt >= retries or deadline - time.monotonic() <= delay + 0.5:
+                    self._stats["errors"] += 1
+                    raise
+                attempt += 1
+                self._stats["retries"] += 1
+                logger.debug(f"请求 {method} {url} 失败({e!r})，{delay:.1f}s后第{attempt}次重试")
+                await asyncio.sleep(delay)
+            except Exception:
+                self._stats["errors"] += 1
+                raise
+
+    async def get(self, url: str, **kwargs) -> HttpResponse:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> HttpResponse:
+        return await self.request("POST", url, **kwargs)
+
+    async def get_json(self, url: str, **kwargs) -> Any:
+        """
+        GET请求并解析JSON响应体.
+        """
+        response = await self.request("GET", url, **kwargs)
+        return response.json()
+
+    # ------------------------------------------------------------------
+    # 同步请求（供在线程中运行的工具使用）
+    # ------------------------------------------------------------------
+
+    def _get_sync_session(self) -> requests.Session:
+        with self._sync_lock:
+            if self._sync_session is None:
+                session = requests.Session()
+                # 与异步会话一致：各工具互不共享Cookie，拒绝保存任何响应Cookie
+                session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+                adapter = HTTPAdapter(
+                    pool_connections=self._max_connections,
+                    pool_maxsize=self._max_per_host,
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._sync_session = session
+            return self._sync_session
+
+    def request_sync(
+        self, method: str, url: str, *, timeout: Optional[float] = None, **kwargs
+    ) -> requests.Response:
+        """
+        同步发送请求（不重试），复用共享连接池.
+        """
+        session = self._get_sync_session()
+        adapter = session.get_adapter(url)
+        connections_before = self._count_sync_connections(adapter)
+
+        host = URL(url).host or ""
+        self._stats["requests"] += 1
+        self._host_requests[host] = self._host_requests.get(host, 0) + 1
+        try:
+            response = session.request(
+                method,
+                url,
+                timeout=(
+                    self._connect_timeout,
+                    timeout if timeout is not None else self._timeout,
+                ),
+                **kwargs,
+            )
+        except requests.RequestException:
+            self._stats["errors"] += 1
+            raise
+
+        if self._count_sync_connections(adapter) > connections_before:
+            self._stats["connections_created"] += 1
+        else:
+            self._stats["connections_reused"] += 1
+        return response
+
+    @staticmethod
+    def _count_sync_connections(adapter: HTTPAdapter) -> int:
+        """
+        连接池累计新建的连接数.
+        """
+        pools = adapter.poolmanager.pools
+        total = 0
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                total += pool.num_connections
+        return total
+
+    # ------------------------------------------------------------------
+    # 统计与关闭
+    # ------------------------------------------------------------------
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取连接复用统计.
+        """
+        stats = dict(self._stats)
+        connections = stats["connections_created"] + stats["connections_reused"]
+        stats["reuse_ratio"] = (
+            round(stats["connections_reused"] / connections, 3) if connections else 0.0
+        )
+        stats["hosts"] = dict(self._host_requests)
+        stats["sessions"] = len(self._sessions)
+        return stats
+
+    async def close(self):
+        """
+        关闭当前事件循环的会话和同步会话.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        session = self._sessions.pop(loop, None) if loop else None
+        if session and not session.closed:
+            await session.close()
+
+        with self._sync_lock:
+            if self._sync_session is not None:
+                self._sync_session.close()
+                self._sync_session = None
+
+        stats = self.get_stats()
+        logger.info(
+            f"HTTP客户端已关闭，请求 {stats['requests']} 次，新建连接 "
+            f"{stats['connections_created']} 个，复用 {stats['connections_reused']} 次"
+        )
+
+
+def get_http_client() -> HttpClient:
+    """
+    获取共享HTTP客户端.
+    """
+    return HttpClient.get_instance()
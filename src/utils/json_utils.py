@@ -0,0 +1,47 @@
+"""
+JSON序列化工具.
+
+安装了 orjson 时使用 orjson，否则回退到标准库 json。输出为紧凑格式、不转义非ASCII字符，
+两种后端结果都可被任意JSON解析器读取。
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+
+def dumps(obj: Any) -> str:
+    """
+    序列化为紧凑的JSON字符串.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj).decode("utf-8")
+        except TypeError:
+            # orjson 不支持的类型（如超出64位的整数、非字符串键），交给标准库处理
+            pass
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def loads(data: Any) -> Any:
+    """
+    解析JSON字符串或字节.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def preview(text: str, limit: int = 2000) -> str:
+    """
+    截断过长的JSON文本用于日志.
+    """
+    if len(text) <= limit:
+        return text
+    return f"{text[:limit]}...(共{len(text)}字符)"
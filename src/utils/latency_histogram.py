@@ -0,0 +1,58 @@
+import bisect
+from typing import Any, Dict, Sequence
+
+DEFAULT_BUCKETS_MS = (5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+
+class LatencyHistogram:
+    """
+    固定分桶的延迟直方图（毫秒），用于运行时统计，记录开销为一次二分查找.
+    """
+
+    def __init__(self, buckets_ms: Sequence[float] = DEFAULT_BUCKETS_MS):
+        self._bounds = tuple(sorted(buckets_ms))
+        # 最后一个桶收集超过最大边界的样本
+        self._counts = [0] * (len(self._bounds) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, latency_ms: float):
+        self._counts[bisect.bisect_left(self._bounds, latency_ms)] += 1
+        self.count += 1
+        self.total_ms += latency_ms
+        if latency_ms > self.max_ms:
+            self.max_ms = latency_ms
+
+    def percentile(self, pct: float) -> float:
+        """
+        按分桶上界估算百分位数（毫秒）.
+        """
+        if not self.count:
+            return 0.0
+        target = self.count * pct / 100.0
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= target:
+                return self._bounds[index] if index < len(self._bounds) else self.max_ms
+        return self.max_ms
+
+    def reset(self):
+        self._counts = [0] * (len(self._bounds) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        labels = [f"<={bound}ms" for bound in self._bounds]
+        labels.append(f">{self._bounds[-1]}ms")
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_ms / self.count, 2) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 2),
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "buckets": dict(zip(labels, self._counts)),
+        }